@@ -0,0 +1,88 @@
+"""Compare memory and matching speed of UserFilters and CompiledFilters.
+
+python -m benchmarks.compiled_filters 100000
+"""
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from benchmarks.hot_paths import ESTATE
+from publisher.components.compiled_filters import CompiledEstate, CompiledFilters
+from publisher.components.types import UserFilters
+from publisher.settings import app_settings
+
+REPEATS = 5
+
+
+def get_users_filters(users_amount: int, seed: int = 42) -> list[UserFilters]:
+    """Return random enabled filters, every filter is set for a part of users."""
+    rnd = random.Random(seed)
+    users_filters = []
+    for user_id in range(1, users_amount + 1):
+        min_price = rnd.choice([None, rnd.randrange(1_000_000, 8_000_000, 100_000)])
+        users_filters.append(UserFilters(
+            user_id=user_id,
+            enabled=True,
+            skip_duplicates=rnd.random() < 0.5,
+            category=rnd.choice([None, 'sale', 'lease']),
+            property_type=rnd.choice([None, 'flat', 'house']),
+            min_price=min_price,
+            max_price=rnd.choice([None, (min_price or 0) + rnd.randrange(1_000_000, 10_000_000, 100_000)]),
+            layouts=set(rnd.sample(app_settings.ENABLED_LAYOUTS, rnd.randint(0, 4))) or None,
+            min_usable_area=rnd.choice([None, rnd.randrange(20, 90, 5)]),
+            districts=set(rnd.sample(app_settings.ENABLED_DISTRICTS, rnd.randint(0, 5))) or None,
+        ))
+    return users_filters
+
+
+def main(users_amount: int) -> None:
+    """Build both forms for the users, print memory and one estate matching time."""
+    users_filters, dataclass_memory = _measure_memory(lambda: get_users_filters(users_amount))
+    compiled_filters, compiled_memory = _measure_memory(
+        lambda: [CompiledFilters(user_filters) for user_filters in users_filters],
+    )
+
+    dataclass_time = _measure_time(lambda: [
+        user_filters.user_id
+        for user_filters in users_filters
+        if user_filters.is_compatible(ESTATE)
+    ])
+    compiled_time = _measure_time(lambda: _match_compiled(compiled_filters))
+
+    print(f'users: {users_amount}')
+    print(f'UserFilters: {dataclass_memory / 1024:,.0f} KiB ({dataclass_memory / users_amount:.0f} B/user)')
+    print(f'CompiledFilters: {compiled_memory / 1024:,.0f} KiB ({compiled_memory / users_amount:.0f} B/user)')
+    print(f'match one estate: is_compatible {dataclass_time * 1000:.2f}ms, compiled {compiled_time * 1000:.2f}ms')
+    print(f'speedup x{dataclass_time / compiled_time:.2f}, memory x{dataclass_memory / compiled_memory:.2f} less')
+
+
+def _match_compiled(compiled_filters: list[CompiledFilters]) -> list[int]:
+    estate = CompiledEstate(ESTATE)
+    return [
+        user_filters.user_id
+        for user_filters in compiled_filters
+        if user_filters.is_compatible(estate)
+    ]
+
+
+def _measure_memory(build: Callable[[], Any]) -> tuple[Any, int]:
+    tracemalloc.start()
+    built = build()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return built, allocated
+
+
+def _measure_time(func: Callable[[], Any]) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        started_at = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started_at)
+    return min(timings)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,63 @@
+"""Compare decoding of estates API responses: resp.json() with Estate(**item) and the schema decoder.
+
+python -m benchmarks.estates_decoding
+"""
+import json
+import time
+from dataclasses import asdict
+from typing import Any, Callable
+
+from benchmarks.hot_paths import ESTATE
+from publisher.components.api_client import estates_decoder
+from publisher.components.types import Estate
+
+PAYLOAD_SIZES = (100, 500, 1000)  # fetched by the bot preview (FETCH_ADS_LIMIT) and the channel publisher
+REPEATS = 7
+
+
+def get_body(estates_amount: int) -> bytes:
+    """Return the API response body."""
+    raw_estate = asdict(ESTATE)
+    return json.dumps({
+        'estates': [
+            {**raw_estate, 'id': ESTATE.id + estate_num}
+            for estate_num in range(estates_amount)
+        ],
+    }).encode()
+
+
+def decode_dataclass_kwargs(body: bytes) -> list[Estate]:
+    """Previous path: aiohttp resp.json() decodes the text and parses it, then every dict becomes Estate."""
+    return [
+        Estate(**raw_estate)
+        for raw_estate in json.loads(body.decode('utf-8'))['estates']
+    ]
+
+
+def main() -> None:
+    """Print decoding time of both paths per payload size."""
+    for estates_amount in PAYLOAD_SIZES:
+        body = get_body(estates_amount)
+        assert decode_dataclass_kwargs(body) == estates_decoder.decode(body, 'estates')
+
+        kwargs_time = _measure_time(lambda: decode_dataclass_kwargs(body))
+        decoder_time = _measure_time(lambda: estates_decoder.decode(body, 'estates'))
+        print(
+            f'{estates_amount:>5} estates, {len(body) / 1024:,.0f} KiB: '
+            f'Estate(**item) {kwargs_time * 1000:.2f}ms, '
+            f'decoder {decoder_time * 1000:.2f}ms, '
+            f'x{kwargs_time / decoder_time:.2f}',
+        )
+
+
+def _measure_time(func: Callable[[], Any]) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        started_at = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started_at)
+    return min(timings)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Compare peak memory of the buffered fetch and the streamed estates with the channel rendering.
+
+The response body is encoded before the measure and served locally:
+python -m benchmarks.estates_streaming 1000
+"""
+import asyncio
+import json
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict
+
+from aiohttp import web
+
+from publisher.channel_publisher import _render_ads_for_post
+from publisher.components import api_client
+from publisher.simulation.synthetic import get_estates
+
+
+async def main(estates_amount: int) -> None:
+    """Serve estates, fetch and render them both ways, print peak memory and time."""
+    estates_body = json.dumps({
+        'estates': [asdict(estate) for estate in get_estates(estates_amount, random.Random(1))],
+    }).encode()
+
+    async def _estates_handler(request: web.Request) -> web.Response:
+        return web.Response(body=estates_body, content_type='application/json')
+
+    app = web.Application()
+    app.router.add_get('/v2/estates', _estates_handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', 0).start()
+    host, port = runner.addresses[0][:2]
+    api_client.BASIC_URL = f'http://{host}:{port}/v2/estates'
+    await api_client.fetch_estates(limit=1)  # warm up the connection
+
+    tracemalloc.start()
+    started_at = time.perf_counter()
+    estates = await api_client.fetch_estates(limit=estates_amount)
+    buffered = [_render_ads_for_post(estate) for estate in estates]
+    buffered_time = time.perf_counter() - started_at
+    _, buffered_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del estates  # noqa: WPS420
+
+    tracemalloc.start()
+    started_at = time.perf_counter()
+    streamed = [_render_ads_for_post(estate) async for estate in api_client.iter_estates(estates_amount)]
+    streamed_time = time.perf_counter() - started_at
+    _, streamed_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert buffered == streamed
+    print(f'estates: {len(streamed)}, body {len(estates_body) / 1024:,.0f} KiB')
+    print(f'fetch_estates: peak {buffered_peak / 1024:,.0f} KiB, {buffered_time * 1000:.1f}ms')
+    print(f'iter_estates: peak {streamed_peak / 1024:,.0f} KiB, {streamed_time * 1000:.1f}ms')
+
+    await api_client.close_session()
+    await runner.cleanup()
+
+
+if __name__ == '__main__':
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000))
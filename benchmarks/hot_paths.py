@@ -0,0 +1,136 @@
+"""Microbenchmarks of matching and rendering hot paths.
+
+Compare with the saved baseline (run on the same machine before the change):
+python -m benchmarks.hot_paths
+python -m benchmarks.hot_paths --save
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Coroutine
+
+from publisher.components import presenter, storage
+from publisher.components.types import Estate, UserFilters
+
+BASELINE_PATH = Path(__file__).with_name('hot_paths_baseline.json')
+REPEATS = 7
+
+ESTATE = Estate(
+    id=4_200_000,
+    category='sale',
+    source_name='sreality',
+    source_uid='3561064',
+    title=r'Prodej bytu 2+kk, 54 m² - [Praha 7] *Holešovice* _novostavba_ `garáž`',
+    layout='two_kk',
+    address='U průhonu, Praha 7 - Holešovice',
+    price=8_999_000,
+    usable_area=54,
+    district_number=7,
+    district_name='Holešovice',
+    energy_rating='B',
+    image_url='https://d18-a.sdn.cz/d_18/c_img_QO_Jv/fxaBAZW.jpeg',
+    page_url='https://www.sreality.cz/detail/prodej/byt/2+kk/praha-holesovice-u-pruhonu/3561064',
+    updated_at='Tue, 05 Nov 2024 07:57:50 GMT',
+)
+USER_FILTERS = UserFilters(
+    user_id=100500,
+    lang='ru',
+    enabled=True,
+    skip_duplicates=True,
+    category='sale',
+    property_type='flat',
+    min_price=5_000_000,
+    max_price=10_000_000,
+    layouts={'one_kk', 'two_kk', 'two_one'},
+    min_usable_area=40,
+    districts={1, 2, 7},
+)
+SAVED_USER_SETTINGS = {
+    'lang': 'ru',
+    'enabled': '1',
+    'skip_duplicates': '1',
+    'category': 'sale',
+    'property_type': 'flat',
+    'min_price': '5000000',
+    'max_price': '10000000',
+    'layouts': 'one_kk:two_kk:two_one',
+    'min_usable_area': '40',
+    'districts': '1:2:7',
+}
+
+
+def get_benchmarks() -> dict[str, Callable[[], Any]]:
+    """Return benchmark name to the measured call."""
+    return {
+        'is_compatible': lambda: USER_FILTERS.is_compatible(ESTATE),
+        'decode_user_settings': lambda: storage._decode_user_settings(100500, SAVED_USER_SETTINGS),  # noqa: WPS437
+        'get_estate_description': lambda: presenter._get_estate_description(ESTATE, 'ru'),  # noqa: WPS437
+        'get_estate_description_short': lambda: presenter.get_estate_description_short(ESTATE, 'ru'),
+        'get_filters_representation': lambda: _run_coroutine(presenter.get_filters_representation(USER_FILTERS)),
+    }
+
+
+def measure(func: Callable[[], Any], min_time: float = 0.2) -> dict[str, float]:
+    """Return ops per second of the best repeat and allocated bytes per call."""
+    func()
+    number = 1
+    while _run(func, number) < min_time:
+        number *= 2
+
+    ops = number / min(_run(func, number) for _ in range(REPEATS))
+
+    tracemalloc.start()
+    func()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'ops': round(ops), 'peak_bytes': peak_memory}
+
+
+def main() -> None:
+    """Run benchmarks, print them with the baseline ratio."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--save', action='store_true', help='save results as the new baseline')
+    args = parser.parse_args()
+
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    results = {}
+    for name, func in get_benchmarks().items():
+        results[name] = measure(func)
+        print(_get_report_line(name, results[name], baseline.get(name)))
+
+    if args.save:
+        BASELINE_PATH.write_text(json.dumps(results, indent=2, sort_keys=True) + '\n')
+        print(f'baseline saved to {BASELINE_PATH}')
+
+
+def _run(func: Callable[[], Any], number: int) -> float:
+    gc.disable()
+    started_at = time.perf_counter()
+    for _ in range(number):
+        func()
+    elapsed = time.perf_counter() - started_at
+    gc.enable()
+    return elapsed
+
+
+def _run_coroutine(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run the coroutine without an event loop, it must not wait for IO."""
+    try:
+        coro.send(None)
+    except StopIteration as result:
+        return result.value
+    raise RuntimeError('benchmarked coroutine is waiting for IO')
+
+
+def _get_report_line(name: str, result: dict[str, float], baseline: dict[str, float] | None) -> str:
+    line = f'{name:<30} {result["ops"]:>12,.0f} ops/s {result["peak_bytes"]:>8,.0f} B/call'
+    if baseline:
+        line += f'   x{result["ops"] / baseline["ops"]:.2f} speed, {result["peak_bytes"] - baseline["peak_bytes"]:+,.0f} B'
+    return line
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Compare redis memory of legacy posted ads keys and monthly bitmaps.
+
+Refuses to run on a non-empty database, the scratch database is flushed after the run:
+REDIS_DSN=redis://localhost:6379/15 python -m benchmarks.posted_ads_memory 200000
+"""
+import sys
+import time
+
+from publisher.components import storage
+
+
+def main(ads_amount: int) -> None:
+    """Fill legacy keys, migrate them to bitmaps and print memory usage."""
+    db_pool = storage.db_pool
+    if db_pool.dbsize():
+        sys.exit('set REDIS_DSN to an empty scratch database')
+    first_id = 1_000_000
+    ads_ids = list(range(first_id, first_id + ads_amount))
+
+    baseline = _get_used_memory()
+    pipe = db_pool.pipeline(transaction=False)
+    for one_id in ads_ids:
+        pipe.set(f'{storage.POSTED_ADS_KEY}:{one_id}', 1, ex=storage.TTL_POSTED_ADS)
+    pipe.execute()
+    legacy_memory = _get_used_memory() - baseline
+
+    started_at = time.perf_counter()
+    storage.migrate_posted_ads()
+    migration_time = time.perf_counter() - started_at
+    bitmap_memory = _get_used_memory() - baseline
+
+    started_at = time.perf_counter()
+    storage.filter_not_posted(ads_ids[-200:])
+    lookup_time = time.perf_counter() - started_at
+
+    print(f'ads: {ads_amount}')
+    print(f'legacy keys: {legacy_memory / 1024:.1f} KiB ({legacy_memory / ads_amount:.1f} B/ads)')
+    print(f'bitmaps: {bitmap_memory / 1024:.1f} KiB ({bitmap_memory / ads_amount:.2f} B/ads)')
+    print(f'migration: {migration_time:.2f}s, filter 200 ids: {lookup_time * 1000:.2f}ms')
+
+    db_pool.flushdb()
+
+
+def _get_used_memory() -> int:
+    return int(storage.db_pool.info('memory')['used_memory'])
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
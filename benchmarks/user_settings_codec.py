@@ -0,0 +1,91 @@
+"""Compare legacy user settings hashes and packed values: decode speed and redis memory.
+
+Refuses to run on a non-empty database, the scratch database is flushed after the run:
+REDIS_DSN=redis://localhost:6379/15 python -m benchmarks.user_settings_codec 100000
+"""
+import sys
+import time
+from dataclasses import asdict
+from itertools import batched
+from typing import Any, Callable
+
+from benchmarks.compiled_filters import get_users_filters
+from publisher.components import storage, user_settings_codec
+from publisher.components.types import UserFilters
+
+BATCH_SIZE = 1000
+
+
+def main(users_amount: int) -> None:
+    """Fill legacy hashes, migrate them to packed values and print speed and memory usage."""
+    db_pool = storage.db_pool
+    if db_pool.dbsize():
+        sys.exit('set REDIS_DSN to an empty scratch database')
+    users_filters = get_users_filters(users_amount)
+    legacy_hashes = [_get_legacy_hash(user_filters) for user_filters in users_filters]
+    packed_values = [user_settings_codec.encode(user_filters) for user_filters in users_filters]
+
+    legacy_decode = _get_ops(lambda: [
+        storage._decode_user_settings(user_filters.user_id, legacy_hash)
+        for user_filters, legacy_hash in zip(users_filters, legacy_hashes)
+    ], users_amount)
+    packed_decode = _get_ops(lambda: [
+        user_settings_codec.decode(user_filters.user_id, packed)
+        for user_filters, packed in zip(users_filters, packed_values)
+    ], users_amount)
+    packed_encode = _get_ops(lambda: [user_settings_codec.encode(user_filters) for user_filters in users_filters], users_amount)
+
+    baseline = _get_used_memory()
+    pipe = db_pool.pipeline(transaction=False)
+    for user_filters, legacy_hash in zip(users_filters, legacy_hashes):
+        pipe.hset(f'{storage.USER_SETTINGS_KEY}:{user_filters.user_id}', mapping=legacy_hash)
+    pipe.execute()
+    legacy_memory = _get_used_memory() - baseline
+    user_ids = [user_filters.user_id for user_filters in users_filters]
+    legacy_fetch = _fetch_all(user_ids)
+    packed_memory = _get_used_memory() - baseline
+    packed_fetch = _fetch_all(user_ids)
+
+    print(f'users: {users_amount}')
+    print(f'decode legacy: {legacy_decode:,.0f} ops/s, packed: {packed_decode:,.0f} ops/s')
+    print(f'encode packed: {packed_encode:,.0f} ops/s')
+    print(f'legacy hashes: {legacy_memory / 1024:.1f} KiB ({legacy_memory / users_amount:.1f} B/user)')
+    print(f'packed values: {packed_memory / 1024:.1f} KiB ({packed_memory / users_amount:.1f} B/user)')
+    print(f'get_users_settings with migration: {legacy_fetch:.2f}s, packed: {packed_fetch:.2f}s')
+
+    db_pool.flushdb()
+
+
+def _get_legacy_hash(user_filters: UserFilters) -> dict[str, str]:
+    """Return the hash as saved by the legacy update_user_settings."""
+    legacy_hash = {}
+    for filter_name, filter_value in asdict(user_filters).items():
+        if filter_name == 'user_id' or filter_value is None:
+            continue
+        if isinstance(filter_value, bool):
+            filter_value = int(filter_value)
+        if isinstance(filter_value, set):
+            filter_value = ':'.join([str(filter_value_item) for filter_value_item in filter_value])
+        legacy_hash[filter_name] = str(filter_value)
+    return legacy_hash
+
+
+def _get_ops(func: Callable[[], Any], ops_amount: int) -> float:
+    started_at = time.perf_counter()
+    func()
+    return ops_amount / (time.perf_counter() - started_at)
+
+
+def _fetch_all(user_ids: list[int]) -> float:
+    started_at = time.perf_counter()
+    for user_ids_batch in batched(user_ids, BATCH_SIZE):
+        storage.get_users_settings(user_ids_batch)
+    return time.perf_counter() - started_at
+
+
+def _get_used_memory() -> int:
+    return int(storage.db_pool.info('memory')['used_memory'])
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
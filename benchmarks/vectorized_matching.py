@@ -0,0 +1,64 @@
+"""Compare matching of one estate by is_compatible, SubscriptionsIndex and VectorizedIndex.
+
+Needs numpy installed, users amounts are 10k, 100k and 1M by default:
+python -m benchmarks.vectorized_matching
+python -m benchmarks.vectorized_matching 50000
+"""
+import sys
+import time
+from typing import Any, Callable
+
+from benchmarks.compiled_filters import get_users_filters
+from benchmarks.hot_paths import ESTATE
+from publisher.components.matching import SubscriptionsIndex
+from publisher.components.vectorized_matching import VectorizedIndex
+
+REPEATS = 5
+
+
+def main(users_amounts: list[int]) -> None:
+    """Build both indexes for every users amount, print build and one estate matching time."""
+    for users_amount in users_amounts:
+        users_filters = get_users_filters(users_amount)
+        subs_index, index_build_time = _measure_build(lambda: SubscriptionsIndex(users_filters))
+        vectorized_index, vectorized_build_time = _measure_build(lambda: VectorizedIndex(users_filters))
+
+        expected = {
+            user_filters.user_id
+            for user_filters in users_filters
+            if user_filters.is_compatible(ESTATE)
+        }
+        assert subs_index.get_candidates(ESTATE) == expected
+        assert vectorized_index.get_candidates(ESTATE) == expected
+
+        is_compatible_time = _measure_time(lambda: [
+            user_filters.user_id
+            for user_filters in users_filters
+            if user_filters.is_compatible(ESTATE)
+        ])
+        index_time = _measure_time(lambda: subs_index.get_candidates(ESTATE))
+        vectorized_time = _measure_time(lambda: vectorized_index.get_candidates(ESTATE))
+
+        print(f'users: {users_amount:,}, matched: {len(expected):,}')
+        print(f'  is_compatible:      match {is_compatible_time * 1000:9.2f}ms')
+        print(f'  SubscriptionsIndex: match {index_time * 1000:9.2f}ms, build {index_build_time:.2f}s')
+        print(f'  VectorizedIndex:    match {vectorized_time * 1000:9.2f}ms, build {vectorized_build_time:.2f}s')
+
+
+def _measure_build(build: Callable[[], Any]) -> tuple[Any, float]:
+    started_at = time.perf_counter()
+    built = build()
+    return built, time.perf_counter() - started_at
+
+
+def _measure_time(func: Callable[[], Any]) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        started_at = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started_at)
+    return min(timings)
+
+
+if __name__ == '__main__':
+    main([int(users_amount) for users_amount in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
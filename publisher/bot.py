@@ -9,8 +9,8 @@ from aiogram.types import Message
 from aiogram.utils.deep_linking import create_start_link
 
 from publisher import handlers
-from publisher.components import presenter, storage, translation
-from publisher.components.notifications import send_logs_notification
+from publisher.components import api_client, presenter, storage, telegram, translation
+from publisher.components.notifications import close_notifier, send_logs_notification
 from publisher.settings import app_settings
 
 logger = logging.getLogger(__file__)
@@ -18,6 +18,9 @@ logger = logging.getLogger(__file__)
 bot_instance = Bot(app_settings.BOT_TOKEN)
 dp = Dispatcher(storage=RedisStorage.from_url(app_settings.REDIS_DSN))
 handlers.init(dp)
+dp.shutdown.register(api_client.close_session)
+dp.shutdown.register(close_notifier)
+dp.shutdown.register(telegram.close_bot)
 
 
 @dp.message(CommandStart(deep_link=True, ignore_case=True))
@@ -49,7 +52,7 @@ async def start(message: Message, command: CommandObject) -> None:
         await message.answer(  # type: ignore
             text=translation.get_i8n_text('payment.accepted', lang).format(sub.expired_at.isoformat()),
         )
-        await send_logs_notification('trial applied "{0}" {1}'.format(
+        send_logs_notification('trial applied "{0}" {1}'.format(
             promo,
             message.chat.id,
         ))
@@ -1,21 +1,26 @@
 """Get estates and publish them to specified telegram channels."""
 import asyncio
 import logging
+import time
 from itertools import batched
+from operator import itemgetter
 
-from aiogram import Bot, exceptions
+from aiogram import exceptions
 from aiogram.utils import markdown
 
-from publisher.components import api_client, presenter
+from publisher.components import api_client, metrics, presenter, telegram
 from publisher.components.types import Estate
 from publisher.settings import app_settings
 
 logger = logging.getLogger(__file__)
 
+RenderedAds = tuple[tuple[int, bool], str]  # sort key and the estate line
+
 
 async def publish() -> None:
     """Fetch ads by API and post them to channels."""
     logger.info('publisher start')
+    await metrics.serve()
     channels = {
         'sale': app_settings.PUBLISH_CHANNEL_SALE_ID,
         'lease': app_settings.PUBLISH_CHANNEL_LEASE_ID,
@@ -23,49 +28,73 @@ async def publish() -> None:
     for category, destination in channels.items():
         counters: int = await _publish(category, destination)
         logger.info(f'publisher end {category=} {counters=}')
+    await api_client.close_session()
+    await telegram.close_bot()
+    await metrics.close_server()
 
 
 async def _publish(category: str, destination: int) -> int:
-    ads_for_publish = await api_client.fetch_estates(
+    """Render estates as they are streamed from the API, the estates themselves are not kept.
+
+    Nothing is posted if the stream fails, a part of the estates is never posted.
+    """
+    rendered_ads: list[RenderedAds] = []
+    render_seconds: float = 0
+    started_at = time.perf_counter()
+    ads_stream = api_client.iter_estates(
         limit=app_settings.CHANNEL_ADS_LIMIT,
         category=category,
         without_duplicates=True,
         sliding_window_hours=app_settings.CHANNEL_ADS_SLIDING_WINDOW_HOURS,
     )
-    logger.info('got {0} ads'.format(len(ads_for_publish)))
-    if not ads_for_publish:
+    try:
+        async for ads_item in ads_stream:
+            render_started_at = time.perf_counter()
+            rendered_ads.append(_render_ads_for_post(ads_item))
+            render_seconds += time.perf_counter() - render_started_at
+    except Exception as fetch_exc:
+        logger.warning('skip posting of {0} ads, the fetch failed: {1}'.format(len(rendered_ads), fetch_exc))
+        return 0
+    finally:
+        metrics.fetch_seconds.observe(time.perf_counter() - started_at - render_seconds, category=category)
+
+    logger.info('got {0} ads'.format(len(rendered_ads)))
+    if not rendered_ads:
         return 0
 
-    precompiled_ads: list[str] = _prepare_ads_for_post(ads_for_publish)
+    metrics.render_seconds.observe(render_seconds, kind='channel')
     await _post_ads_to_channel(
-        ads=precompiled_ads,
+        ads=_sort_rendered_ads(rendered_ads),
         destination=destination,
     )
-    return len(ads_for_publish)
+    return len(rendered_ads)
+
+
+def _render_ads_for_post(ads_item: Estate) -> RenderedAds:
+    sort_key = (-ads_item.price, ads_item.is_duplicate)
+    return sort_key, presenter.get_estate_description_short(ads_item, lang='en')
 
 
-def _prepare_ads_for_post(ads: list[Estate]) -> list[str]:
-    sorted_ads = sorted(ads, key=lambda ads_item: (-ads_item.price, ads_item.is_duplicate))
-    return [
-        presenter.get_estate_description_short(ads_item, lang='en')
-        for ads_item in sorted_ads
-    ]
+def _sort_rendered_ads(rendered_ads: list[RenderedAds]) -> list[str]:
+    rendered_ads.sort(key=itemgetter(0))
+    return [ads_text for _, ads_text in rendered_ads]
 
 
 async def _post_ads_to_channel(ads: list[str], destination: int) -> int:
     count = 0
-    async with Bot(app_settings.BOT_TOKEN) as bot_instance:
-        for batch in batched(ads, n=app_settings.TELEGRAM_MAX_ROWS_PER_MESSAGE):
-            try:
+    bot_instance = telegram.bot_provider.get()
+    for batch in batched(ads, n=app_settings.TELEGRAM_MAX_ROWS_PER_MESSAGE):
+        try:
+            with metrics.track_send():
                 await bot_instance.send_message(
                     chat_id=destination,
                     text=markdown.text(*batch, sep='\n'),
                     parse_mode='Markdown',
                     disable_web_page_preview=True,
                 )
-                count += 1
-            except (exceptions.TelegramBadRequest, exceptions.TelegramForbiddenError) as exc:
-                logger.warning('sent to channel error: {0}'.format(exc))
+            count += 1
+        except (exceptions.TelegramBadRequest, exceptions.TelegramForbiddenError) as exc:
+            logger.warning('sent to channel error: {0}'.format(exc))
     return count
 
 
@@ -1,8 +1,12 @@
 """Estates API client."""
+import asyncio
 import logging
+from collections.abc import AsyncGenerator
 
 import aiohttp
 
+from publisher.components import tracing
+from publisher.components.decoder import Decoder
 from publisher.components.types import District, Estate
 from publisher.settings import app_settings
 
@@ -11,6 +15,50 @@ DISTRICTS_URL = f'{app_settings.API_URL}/v2/districts'
 
 logger = logging.getLogger(__file__)
 
+estates_decoder = Decoder(Estate)
+districts_decoder = Decoder(District)
+
+
+class SessionProvider:
+    """Long-lived HTTP session, created lazily for the running event loop."""
+
+    def __init__(self) -> None:
+        """Set up empty provider."""
+        self._session: aiohttp.ClientSession | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def get(self) -> aiohttp.ClientSession:
+        """Return the shared session, create new one for a new event loop."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._loop = loop
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(app_settings.TIMEOUT),
+                connector=aiohttp.TCPConnector(
+                    limit=app_settings.API_CONNECTIONS_LIMIT,
+                    limit_per_host=app_settings.API_CONNECTIONS_LIMIT,
+                    ttl_dns_cache=app_settings.API_DNS_CACHE_SECONDS,
+                    keepalive_timeout=app_settings.API_KEEPALIVE_SECONDS,
+                ),
+                headers={'auth-token': app_settings.API_TOKEN},
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the shared session."""
+        if self._session is not None and self._loop is asyncio.get_running_loop():
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+
+session_provider = SessionProvider()
+
+
+async def close_session() -> None:
+    """Close API client session, call it on the process shutdown."""
+    await session_provider.close()
+
 
 async def fetch_estates(
     limit: int,
@@ -19,6 +67,89 @@ async def fetch_estates(
     sliding_window_hours: int | None = None,
 ) -> list[Estate]:
     """Fetch estates by API."""
+    request_params = _get_estates_params(limit, category, without_duplicates, sliding_window_hours)
+    try:
+        with tracing.span('api_client.fetch_estates', **request_params) as fetch_attributes:
+            async with session_provider.get().get(url=BASIC_URL, params=request_params) as resp:
+                estates = estates_decoder.decode(await resp.read(), 'estates')
+            fetch_attributes['estates'] = len(estates)
+
+    except Exception as fetch_exc:
+        logger.warning('fetch exception {0}'.format(fetch_exc))
+        return []
+
+    return estates
+
+
+async def iter_estates(
+    limit: int,
+    category: str | None = None,
+    without_duplicates: bool = False,
+    sliding_window_hours: int | None = None,
+) -> AsyncGenerator[Estate, None]:
+    """Fetch estates by API, yield them as soon as they are parsed from the response stream.
+
+    A fetch error is logged and raised, estates yielded before it are not the complete response.
+    Close the iterator by contextlib.aclosing to release the connection on an early exit.
+    """
+    request_params = _get_estates_params(limit, category, without_duplicates, sliding_window_hours)
+    estates_count = 0
+    try:
+        async with session_provider.get().get(url=BASIC_URL, params=request_params) as resp:
+            chunks = resp.content.iter_chunked(app_settings.API_STREAM_CHUNK_BYTES)
+            async for estate in estates_decoder.iter_decode(chunks, 'estates'):
+                estates_count += 1
+                yield estate
+
+    except Exception as fetch_exc:
+        logger.warning('fetch exception {0} after {1} estates'.format(fetch_exc, estates_count))
+        raise
+
+
+async def fetch_estates_since(
+    high_water_mark: int | None,
+    category: str,
+    limit: int,
+    max_limit: int,
+) -> list[Estate]:
+    """Fetch latest estates, grow the page until its oldest estate is already seen (high-water mark).
+
+    The API returns the latest estates first and has no cursor, so the page limit is doubled.
+    Only the last estate of the page is checked, an old ad re-bumped to the top does not stop the catch-up.
+    """
+    while True:
+        estates = await fetch_estates(limit=limit, category=category)
+        if high_water_mark is None or len(estates) < limit:
+            return estates
+        if estates[-1].id <= high_water_mark:
+            return estates
+        if limit >= max_limit:
+            logger.warning('{0} {1} estates are newer than {2}, older ones are skipped at the catch-up limit'.format(
+                len(estates), category, high_water_mark,
+            ))
+            return estates
+
+        logger.info('{0} {1} estates are newer than {2}, fetch more'.format(len(estates), category, high_water_mark))
+        limit = min(limit * 2, max_limit)
+
+
+async def fetch_districts() -> list[District]:
+    """Fetch districts by API."""
+    try:
+        async with session_provider.get().get(url=DISTRICTS_URL) as resp:
+            return districts_decoder.decode(await resp.read(), 'districts')
+
+    except Exception as fetch_exc:
+        logger.warning('fetch districts exception {0}'.format(fetch_exc))
+        return []
+
+
+def _get_estates_params(
+    limit: int,
+    category: str | None,
+    without_duplicates: bool,
+    sliding_window_hours: int | None,
+) -> dict[str, int | str]:
     request_params: dict[str, int | str] = {
         'limit': limit,
     }
@@ -28,39 +159,4 @@ async def fetch_estates(
         request_params['without_duplicates'] = 1
     if sliding_window_hours is not None:
         request_params['sliding_window_hours'] = sliding_window_hours
-
-    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(app_settings.TIMEOUT)) as session:
-        try:
-            async with session.get(
-                url=BASIC_URL,
-                params=request_params,
-                headers={'auth-token': app_settings.API_TOKEN},
-            ) as resp:
-                raw_ads_list = (await resp.json())['estates']
-
-        except Exception as fetch_exc:
-            logger.warning('fetch exception {0}'.format(fetch_exc))
-            return []
-    return [
-        Estate(**estate)
-        for estate in raw_ads_list
-    ]
-
-
-async def fetch_districts() -> list[District]:
-    """Fetch districts by API."""
-    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(app_settings.TIMEOUT)) as session:
-        try:
-            async with session.get(
-                url=DISTRICTS_URL,
-                headers={'auth-token': app_settings.API_TOKEN},
-            ) as resp:
-                raw_districts = (await resp.json())['districts']
-
-        except Exception as fetch_exc:
-            logger.warning('fetch districts exception {0}'.format(fetch_exc))
-            return []
-    return [
-        District(**district)
-        for district in raw_districts
-    ]
+    return request_params
@@ -0,0 +1,187 @@
+"""Compiled user filters: integer bit codes and bitmasks instead of strings and sets.
+
+Filter values are interned to process wide bit ids, ENABLED_LAYOUTS and ENABLED_DISTRICTS get the lowest ones.
+An estate compiled once is matched against compiled filters by a few integer ANDs and comparisons.
+"""
+from typing import Generic, Hashable, Iterable, TypeVar
+
+from publisher.components.types import Estate, UserFilters
+from publisher.components.user_settings_codec import DIGEST_FLAG, ENABLED_FLAG, SKIP_DUPLICATES_FLAG
+from publisher.settings import app_settings
+
+FilterValue = TypeVar('FilterValue', bound=Hashable)
+
+
+class InternTable(Generic[FilterValue]):
+    """Registry of filter values and their small integer ids."""
+
+    __slots__ = ('_ids', '_interned')
+
+    def __init__(self, seed: Iterable[FilterValue] = ()) -> None:
+        """Set up the table, seed values get the ids by their order."""
+        self._ids: dict[FilterValue, int] = {}
+        self._interned: list[FilterValue] = []
+        for seed_value in seed:
+            self.get_id(seed_value)
+
+    def get_id(self, filter_value: FilterValue) -> int:
+        """Return the value id, intern a new value."""
+        value_id = self._ids.get(filter_value)
+        if value_id is None:
+            value_id = len(self._interned)
+            self._ids[filter_value] = value_id
+            self._interned.append(filter_value)
+        return value_id
+
+    def get_code(self, filter_value: FilterValue | None) -> int:
+        """Return the one value bitmask, zero is any value."""
+        if not filter_value:
+            return 0
+        return 1 << self.get_id(filter_value)
+
+    def get_mask(self, filter_values: Iterable[FilterValue] | None) -> int:
+        """Return the bitmask of filter values, zero is any value."""
+        mask = 0
+        for filter_value in filter_values or ():
+            mask |= 1 << self.get_id(filter_value)
+        return mask
+
+    def decode(self, mask: int) -> set[FilterValue] | None:
+        """Return filter values by the bitmask."""
+        if not mask:
+            return None
+        return {
+            filter_value
+            for value_id, filter_value in enumerate(self._interned)
+            if mask >> value_id & 1
+        }
+
+    def find_bit(self, estate_value: FilterValue | None) -> int:
+        """Return the estate value bit, never interns, unknown value matches no filter."""
+        value_id = self._ids.get(estate_value)  # type: ignore
+        return 0 if value_id is None else 1 << value_id
+
+
+categories: InternTable[str] = InternTable(('sale', 'lease'))
+property_types: InternTable[str] = InternTable(('flat', 'house', 'commercial'))
+layouts: InternTable[str] = InternTable(app_settings.ENABLED_LAYOUTS)
+districts: InternTable[int] = InternTable(app_settings.ENABLED_DISTRICTS)
+district_names: InternTable[str] = InternTable()
+
+
+class CompiledEstate:  # noqa: WPS230
+    """Estate fields matched by filters, values are the one bit codes."""
+
+    __slots__ = (
+        'category',
+        'property_type',
+        'price',
+        'usable_area',
+        'district_bit',
+        'district_name_bit',
+        'layout_bit',
+        'is_duplicate',
+    )
+
+    def __init__(self, estate: Estate) -> None:
+        """Compile the estate."""
+        self.category = categories.find_bit(estate.category)
+        self.property_type = property_types.find_bit(estate.property_type)
+        self.price = estate.price
+        self.usable_area = estate.usable_area
+        self.district_bit = districts.find_bit(estate.district_number)
+        self.district_name_bit = district_names.find_bit(estate.district_name)
+        self.layout_bit = layouts.find_bit(estate.layout)
+        self.is_duplicate = estate.is_duplicate
+
+
+class CompiledFilters:  # noqa: WPS230
+    """User filters as bitmasks, zero is no filter.
+
+    Category and property type are one bit codes, layouts and districts are masks of the accepted values.
+    """
+
+    __slots__ = (
+        'user_id',
+        'lang',
+        'flags',
+        'category',
+        'property_type',
+        'min_price',
+        'max_price',
+        'min_usable_area',
+        'layouts',
+        'districts',
+        'district_names',
+    )
+
+    def __init__(self, user_filters: UserFilters) -> None:
+        """Compile the user filters."""
+        self.user_id = user_filters.user_id
+        self.lang = user_filters.lang
+        self.flags = ENABLED_FLAG if user_filters.enabled else 0
+        if user_filters.skip_duplicates:
+            self.flags |= SKIP_DUPLICATES_FLAG
+        if user_filters.digest:
+            self.flags |= DIGEST_FLAG
+        self.category = categories.get_code(user_filters.category)
+        self.property_type = property_types.get_code(user_filters.property_type)
+        self.min_price = user_filters.min_price or 0
+        self.max_price = user_filters.max_price or 0
+        self.min_usable_area = user_filters.min_usable_area or 0
+        self.layouts = layouts.get_mask(user_filters.layouts)
+        self.districts = districts.get_mask(user_filters.districts)
+        self.district_names = district_names.get_mask(user_filters.district_names)
+
+    def is_compatible(self, estate: CompiledEstate) -> bool:  # noqa: WPS212, WPS231
+        """Is estate item passed by filters, same as UserFilters.is_compatible."""
+        if estate.is_duplicate and self.flags & SKIP_DUPLICATES_FLAG:
+            return False
+
+        if self.category and not self.category & estate.category:
+            return False
+
+        if self.property_type and not self.property_type & estate.property_type:
+            return False
+
+        if self.min_price and estate.price < self.min_price:
+            return False
+
+        if self.max_price and estate.price > self.max_price:
+            return False
+
+        if self.min_usable_area and estate.usable_area < self.min_usable_area:
+            return False
+
+        if self.districts and not self.districts & estate.district_bit:
+            return False
+
+        if self.district_names and not self.district_names & estate.district_name_bit:
+            return False
+
+        if self.layouts and not self.layouts & estate.layout_bit:
+            return False
+
+        return True
+
+    def to_user_filters(self) -> UserFilters:
+        """Return the dataclass form, empty sets and zero bounds become None."""
+        return UserFilters(
+            user_id=self.user_id,
+            lang=self.lang,
+            enabled=bool(self.flags & ENABLED_FLAG),
+            skip_duplicates=bool(self.flags & SKIP_DUPLICATES_FLAG),
+            digest=bool(self.flags & DIGEST_FLAG),
+            category=_get_one(categories.decode(self.category)),
+            property_type=_get_one(property_types.decode(self.property_type)),
+            min_price=self.min_price or None,
+            max_price=self.max_price or None,
+            layouts=layouts.decode(self.layouts),
+            min_usable_area=self.min_usable_area or None,
+            districts=districts.decode(self.districts),
+            district_names=district_names.decode(self.district_names),
+        )
+
+
+def _get_one(filter_values: set[str] | None) -> str | None:
+    return filter_values.pop() if filter_values else None
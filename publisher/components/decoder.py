@@ -0,0 +1,137 @@
+"""Schema driven decoding of API response bytes straight into dataclasses.
+
+The schema is built once by the dataclass fields: accepted JSON types and the default of every field.
+Items are created by positional arguments of the dataclass __init__, unknown keys are ignored.
+A response array can be decoded from the stream of body chunks, item by item.
+"""
+import codecs
+import dataclasses
+import json
+import logging
+import operator
+import re
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+from typing import Any, Generic, TypeVar, get_args, get_type_hints
+
+logger = logging.getLogger(__file__)
+
+ITEMS_SEPARATOR = re.compile(r'[\s,]*')
+
+DataclassType = TypeVar('DataclassType')
+
+
+class DecodeError(ValueError):
+    """Item does not match the schema."""
+
+
+class Decoder(Generic[DataclassType]):
+    """Decoder of JSON arrays into dataclass items."""
+
+    def __init__(self, item_type: type[DataclassType]) -> None:
+        """Build the schema by the dataclass fields."""
+        type_hints = get_type_hints(item_type)
+        self._item_type = item_type
+        self._schema = tuple(
+            (item_field.name, _get_json_types(type_hints[item_field.name]), item_field.default)
+            for item_field in dataclasses.fields(item_type)  # type: ignore
+        )
+        field_names = [field_name for field_name, _, _ in self._schema]
+        self._get_values = operator.itemgetter(*field_names)
+        self._valid_signatures: set[tuple[type, ...]] = set()  # value types of already validated items
+
+    def decode(self, body: bytes, key: str) -> list[DataclassType]:
+        """Return items of the response array, an item of wrong types is skipped."""
+        return list(self._decode_valid(json.loads(body)[key]))
+
+    async def iter_decode(self, chunks: AsyncIterable[bytes], key: str) -> AsyncIterator[DataclassType]:
+        """Yield items of the response array as soon as they are parsed, an item of wrong types is skipped."""
+        parser = ArrayParser(key)
+        async for chunk in chunks:
+            for decoded_item in self._decode_valid(parser.feed(chunk)):
+                yield decoded_item
+
+        if not parser.is_finished:
+            raise DecodeError('{0} array is not finished, the response is truncated'.format(key))
+
+    def decode_item(self, raw_item: Any) -> DataclassType:
+        """Return the item, validate types on the way.
+
+        An item with all fields and value types seen before is validated by one signature lookup.
+        """
+        try:
+            field_values = self._get_values(raw_item)
+        except (KeyError, TypeError):
+            return self._item_type(*self._validate(raw_item))
+
+        if tuple(map(type, field_values)) not in self._valid_signatures:
+            field_values = self._validate(raw_item)
+            self._valid_signatures.add(tuple(map(type, field_values)))
+        return self._item_type(*field_values)
+
+    def _decode_valid(self, raw_items: Iterable[Any]) -> Iterator[DataclassType]:
+        for raw_item in raw_items:
+            try:
+                yield self.decode_item(raw_item)
+            except DecodeError as exc:
+                logger.warning('skip {0}: {1}'.format(self._item_type.__name__, exc))
+
+    def _validate(self, raw_item: Any) -> list[Any]:
+        if not isinstance(raw_item, dict):
+            raise DecodeError('expected object, got {0!r}'.format(raw_item))
+
+        field_values = []
+        for field_name, json_types, default in self._schema:
+            field_value = raw_item.get(field_name, default)
+            if not isinstance(field_value, json_types):
+                raise DecodeError('{0} expected {1}, got {2!r}'.format(field_name, json_types, field_value))
+            field_values.append(field_value)
+        return field_values
+
+
+class ArrayParser:
+    """Incremental parser of the array of objects by the key of a JSON object.
+
+    The array is found by its key, the first match in the body is used.
+    """
+
+    def __init__(self, key: str) -> None:
+        """Set up the parser waiting for the array start."""
+        self._array_start = re.compile(r'"{0}"\s*:\s*\['.format(re.escape(key)))
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._is_started = False
+        self.is_finished = False
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        """Return array items completed by the chunk."""
+        self._buffer += self._text_decoder.decode(chunk)
+        if not self._is_started:
+            array_start = self._array_start.search(self._buffer)
+            if array_start is None:
+                return []
+            self._buffer = self._buffer[array_start.end():]
+            self._is_started = True
+        return self._parse_items()
+
+    def _parse_items(self) -> list[Any]:
+        raw_items = []
+        position = 0
+        while not self.is_finished:
+            item_start = ITEMS_SEPARATOR.match(self._buffer, position).end()  # type: ignore
+            self.is_finished = self._buffer.startswith(']', item_start)
+            try:
+                raw_item, position = self._json_decoder.raw_decode(self._buffer, item_start)
+            except json.JSONDecodeError:
+                break  # the array end or the item is not complete yet
+            raw_items.append(raw_item)
+
+        self._buffer = self._buffer[position:]
+        return raw_items
+
+
+def _get_json_types(type_hint: Any) -> tuple[type, ...]:
+    json_types = get_args(type_hint) or (type_hint,)
+    if float in json_types:
+        return (*json_types, int)
+    return json_types
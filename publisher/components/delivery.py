@@ -0,0 +1,118 @@
+"""Concurrent telegram delivery with global and per-chat rate limits."""
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from typing import Awaitable, Callable, Iterable, TypeVar
+
+from aiogram import exceptions
+
+from publisher.components import metrics
+from publisher.settings import app_settings
+
+logger = logging.getLogger(__file__)
+
+T = TypeVar('T')  # noqa: WPS111
+JobHandler = Callable[[T], Awaitable[None]]
+
+
+class TokenBucket:
+    """Token bucket rate limiter."""
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        """Set up limiter, the bucket starts full."""
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait for a free token and take it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                refilled = (now - self._updated_at) * self._rate
+                self._tokens = min(self._capacity, self._tokens + refilled)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+
+class DeliveryEngine:
+    """Bounded pool of telegram senders.
+
+    All senders share the global token bucket and the per-chat limiter.
+    Telegram flood control (retry after) pauses every sender, the message is retried, not dropped.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = app_settings.DELIVERY_CONCURRENCY,
+        rate: float = app_settings.DELIVERY_RATE_PER_SECOND,
+        per_chat_interval: float = app_settings.DELIVERY_PER_CHAT_INTERVAL_SECONDS,
+        network_retries: int = app_settings.DELIVERY_NETWORK_RETRIES,
+    ) -> None:
+        """Set up engine limits."""
+        self._concurrency = concurrency
+        self._bucket = TokenBucket(rate=rate, capacity=max(1, int(rate)))
+        self._per_chat_interval = per_chat_interval
+        self._network_retries = network_retries
+        self._chat_next_at: dict[int, float] = defaultdict(float)
+        self._paused_until: float = 0
+
+    async def call(self, chat_id: int, method: Callable[[], Awaitable[T]]) -> T:
+        """Call telegram method for the chat under rate limits, retry flood control and network errors."""
+        network_attempt = 0
+        while True:
+            await self._wait_for_slot(chat_id)
+            try:
+                with metrics.track_send():
+                    return await method()
+            except exceptions.TelegramRetryAfter as flood_exc:
+                logger.warning('flood control, pause all senders for {0}s'.format(flood_exc.retry_after))
+                self._paused_until = max(self._paused_until, time.monotonic() + flood_exc.retry_after)
+            except exceptions.TelegramNetworkError:
+                network_attempt += 1
+                if network_attempt > self._network_retries:
+                    raise
+                await asyncio.sleep(2 ** (network_attempt - 1))
+
+    async def run(self, jobs: Iterable[T], job_handler: JobHandler[T]) -> int:
+        """Process jobs by the bounded pool of senders, return processed jobs count."""
+        queue: asyncio.Queue[T] = asyncio.Queue()
+        for job in jobs:
+            queue.put_nowait(job)
+
+        processed = queue.qsize()
+        workers = [
+            asyncio.create_task(self._worker(queue, job_handler))
+            for _ in range(min(self._concurrency, processed))
+        ]
+        await asyncio.gather(*workers)
+        return processed
+
+    async def _worker(self, queue: asyncio.Queue[T], job_handler: JobHandler[T]) -> None:
+        while not queue.empty():
+            job = queue.get_nowait()
+            try:
+                await job_handler(job)
+            except Exception as handler_exc:
+                logger.exception('delivery job failed {0}'.format(handler_exc))
+
+    async def _wait_for_slot(self, chat_id: int) -> None:
+        pause = self._paused_until - time.monotonic()
+        while pause > 0:
+            await asyncio.sleep(pause)
+            pause = self._paused_until - time.monotonic()
+
+        now = time.monotonic()
+        ready_at = max(now, self._chat_next_at[chat_id])
+        self._chat_next_at[chat_id] = ready_at + self._per_chat_interval
+        if ready_at > now:
+            await asyncio.sleep(ready_at - now)
+
+        await self._bucket.acquire()
@@ -0,0 +1,22 @@
+"""Notification jobs of the delivery queue and their redis list encoding."""
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class DeliveryJob:
+    """Estate notification for the subscriber, a digest job carries all estates of the matched batch."""
+
+    user_id: int
+    estate_ids: tuple[int, ...]
+
+
+def encode_job(job: DeliveryJob) -> str:
+    """Return the job as `user_id:estate_id,estate_id`."""
+    return '{0}:{1}'.format(job.user_id, ','.join(map(str, job.estate_ids)))
+
+
+def decode_job(raw_job: str) -> DeliveryJob:
+    """Return the job encoded by encode_job, a legacy single estate job is decoded too."""
+    user_id, raw_estate_ids = raw_job.split(':')
+    estate_ids = tuple(map(int, raw_estate_ids.split(',')))
+    return DeliveryJob(user_id=int(user_id), estate_ids=estate_ids)
@@ -0,0 +1,98 @@
+"""Persistent outbound notifications queue.
+
+Reliable queue on redis lists: a job is moved from the pending list to the worker processing list
+and stays there until acknowledged, so a restarted worker resumes unacknowledged jobs.
+A job failed by an unexpected error is moved to the dead letters list instead of endless retries.
+"""
+import json
+from dataclasses import asdict
+from typing import Iterable
+
+from publisher.components import tracing
+from publisher.components.delivery_jobs import DeliveryJob, decode_job, encode_job
+from publisher.components.storage import db_pool
+from publisher.components.types import Estate
+
+DELIVERY_PENDING_KEY = 'prague-publisher:delivery:pending'
+DELIVERY_PROCESSING_KEY = 'prague-publisher:delivery:processing'
+DELIVERY_DEAD_LETTERS_KEY = 'prague-publisher:delivery:dead_letters'
+DELIVERY_ESTATE_KEY = 'prague-publisher:delivery:estate:id'
+TTL_DELIVERY_ESTATE = 60 * 60 * 24 * 3  # 3 days
+
+
+@tracing.traced
+def enqueue(estates: Iterable[Estate], jobs: Iterable[DeliveryJob]) -> int:
+    """Save estates payload and push notification jobs by one transaction."""
+    pipe = db_pool.pipeline(transaction=True)
+    for estate in estates:
+        estate_payload = json.dumps(asdict(estate))
+        pipe.set(f'{DELIVERY_ESTATE_KEY}:{estate.id}', estate_payload, ex=TTL_DELIVERY_ESTATE)
+
+    raw_jobs = [encode_job(job) for job in jobs]
+    if raw_jobs:
+        pipe.rpush(DELIVERY_PENDING_KEY, *raw_jobs)
+    pipe.execute()
+    return len(raw_jobs)
+
+
+@tracing.traced
+def take(worker: str, limit: int) -> list[DeliveryJob]:
+    """Move up to limit pending jobs to the worker processing list."""
+    pipe = db_pool.pipeline(transaction=False)
+    for _ in range(limit):
+        pipe.lmove(DELIVERY_PENDING_KEY, f'{DELIVERY_PROCESSING_KEY}:{worker}', 'LEFT', 'RIGHT')
+
+    return [
+        decode_job(raw_job)
+        for raw_job in pipe.execute()
+        if raw_job is not None
+    ]
+
+
+@tracing.traced
+def ack(worker: str, job: DeliveryJob) -> None:
+    """Remove processed job from the worker processing list."""
+    db_pool.lrem(f'{DELIVERY_PROCESSING_KEY}:{worker}', 1, encode_job(job))
+
+
+@tracing.traced
+def dead_letter(worker: str, job: DeliveryJob) -> None:
+    """Move failed job from the worker processing list to the dead letters list."""
+    raw_job = encode_job(job)
+    pipe = db_pool.pipeline(transaction=True)
+    pipe.lrem(f'{DELIVERY_PROCESSING_KEY}:{worker}', 1, raw_job)
+    pipe.rpush(DELIVERY_DEAD_LETTERS_KEY, raw_job)
+    pipe.execute()
+
+
+@tracing.traced
+def recover(worker: str) -> int:
+    """Return unacknowledged jobs of the worker to the head of the pending list."""
+    cnt = 0
+    while db_pool.lmove(f'{DELIVERY_PROCESSING_KEY}:{worker}', DELIVERY_PENDING_KEY, 'RIGHT', 'LEFT') is not None:
+        cnt += 1
+    return cnt
+
+
+@tracing.traced
+def get_pending_size() -> int:
+    """Return amount of jobs waiting for delivery."""
+    return db_pool.llen(DELIVERY_PENDING_KEY)  # type: ignore
+
+
+@tracing.traced
+def get_estates(estate_ids: Iterable[int]) -> dict[int, Estate]:
+    """Return saved estates payload by ids, expired ones are skipped."""
+    estate_ids = list(estate_ids)
+    if not estate_ids:
+        return {}
+
+    raw_estates = db_pool.mget([
+        f'{DELIVERY_ESTATE_KEY}:{estate_id}'
+        for estate_id in estate_ids
+    ])
+    return {
+        estate_id: Estate(**json.loads(raw_estate))
+        for estate_id, raw_estate in zip(estate_ids, raw_estates)  # type: ignore
+        if raw_estate is not None
+    }
@@ -0,0 +1,61 @@
+"""Publisher leader lease: the only worker holding it fetches and publishes ads for all shards."""
+import asyncio
+import logging
+import os
+import socket
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from publisher.components.storage import db_pool
+
+PUBLISHER_LEADER_KEY = 'prague-publisher:publisher:leader'
+RENEW_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+RELEASE_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+logger = logging.getLogger(__file__)
+
+WORKER_ID = '{0}:{1}'.format(socket.gethostname(), os.getpid())
+
+_renew_lease = db_pool.register_script(RENEW_LEASE_SCRIPT)
+_release_lease = db_pool.register_script(RELEASE_LEASE_SCRIPT)
+
+
+def acquire_leadership(worker: str, ttl: int) -> bool:
+    """Take the free leader lease or prolong own one."""
+    if db_pool.set(PUBLISHER_LEADER_KEY, worker, nx=True, ex=ttl):
+        return True
+    return bool(_renew_lease(keys=[PUBLISHER_LEADER_KEY], args=[worker, ttl]))
+
+
+@asynccontextmanager
+async def hold_leadership(worker: str, ttl: int) -> AsyncIterator[None]:
+    """Prolong own leader lease in background while the block runs."""
+    renewal = asyncio.create_task(_renew_leadership(worker, ttl))
+    try:
+        yield
+    finally:
+        renewal.cancel()
+        await asyncio.gather(renewal, return_exceptions=True)
+
+
+def release_leadership(worker: str) -> None:
+    """Drop own leader lease, so another worker takes it without waiting for expiration."""
+    _release_lease(keys=[PUBLISHER_LEADER_KEY], args=[worker])
+
+
+async def _renew_leadership(worker: str, ttl: int) -> None:
+    while True:
+        await asyncio.sleep(ttl / 3)
+        if not acquire_leadership(worker, ttl):
+            logger.warning('leader lease is taken by another worker, {0} lost it'.format(worker))
+            return
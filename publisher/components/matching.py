@@ -0,0 +1,135 @@
+"""Subscriptions index for matching new estates to subscribers."""
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import Any, Iterable
+
+from publisher.components import vectorized_matching
+from publisher.components.types import Estate, UserFilters
+from publisher.settings import app_settings
+
+Bounds = list[tuple[int, int]]  # sorted (bound value, user id) pairs
+UsersByValue = dict[Any, set[int]]
+
+
+class SubscriptionsIndex:
+    """Inverted index of user filters.
+
+    Every discrete filter (category, property type, districts, district names, layouts)
+    maps a value to the users who accept it, users without the filter accept any value.
+    Price and area bounds are kept sorted, so rejected users are found by bisect.
+    Users accepting a filter value are united once per index, then reused for every estate.
+    """
+
+    _discrete_filters = ('category', 'property_type', 'districts', 'district_names', 'layouts')
+
+    def __init__(self, users_filters: Iterable[UserFilters]) -> None:  # noqa: WPS231
+        """Build index by enabled user filters."""
+        self._users: set[int] = set()
+        self._skip_duplicates: set[int] = set()
+        self.digest_users: set[int] = set()
+        self._unfiltered: dict[str, set[int]] = defaultdict(set)
+        self._by_value: dict[str, UsersByValue] = defaultdict(lambda: defaultdict(set))
+        self._accepting: dict[str, UsersByValue] = defaultdict(dict)  # memoized unfiltered and by value union
+        lower_bounds: dict[str, Bounds] = defaultdict(list)
+        upper_bounds: Bounds = []
+
+        for user_filters in users_filters:
+            if not user_filters.is_enabled_notifications:
+                continue
+
+            user_id = user_filters.user_id
+            self._users.add(user_id)
+            if user_filters.skip_duplicates:
+                self._skip_duplicates.add(user_id)
+            if user_filters.digest:
+                self.digest_users.add(user_id)
+
+            for filter_name in self._discrete_filters:
+                self._add_discrete(filter_name, user_id, getattr(user_filters, filter_name))
+
+            if user_filters.min_price:
+                lower_bounds['price'].append((user_filters.min_price, user_id))
+            if user_filters.min_usable_area:
+                lower_bounds['usable_area'].append((user_filters.min_usable_area, user_id))
+            if user_filters.max_price:
+                upper_bounds.append((user_filters.max_price, user_id))
+
+        self._lower_bounds = {
+            field_name: _split_sorted(bounds)
+            for field_name, bounds in lower_bounds.items()
+        }
+        self._max_price = _split_sorted(upper_bounds)
+
+    def __len__(self) -> int:
+        """Return amount of indexed users."""
+        return len(self._users)
+
+    def get_candidates(self, estate: Estate) -> set[int]:
+        """Return ids of users whose filters accept the estate."""
+        estate_values = {
+            'category': estate.category,
+            'property_type': estate.property_type,
+            'districts': estate.district_number,
+            'district_names': estate.district_name,
+            'layouts': estate.layout,
+        }
+        groups = [
+            self._get_accepting(filter_name, estate_values[filter_name])
+            for filter_name in self._discrete_filters
+        ]
+        groups.sort(key=len)
+        candidates = self._users.intersection(*groups)
+        if not candidates:
+            return candidates
+
+        if estate.is_duplicate:
+            candidates -= self._skip_duplicates
+
+        self._drop_out_of_bounds(candidates, estate)
+        return candidates
+
+    def _drop_out_of_bounds(self, candidates: set[int], estate: Estate) -> None:
+        for field_name, (min_values, min_value_users) in self._lower_bounds.items():
+            candidates.difference_update(min_value_users[bisect_right(min_values, getattr(estate, field_name)):])
+
+        max_prices, max_price_users = self._max_price
+        candidates.difference_update(max_price_users[:bisect_left(max_prices, estate.price)])
+
+    def _get_accepting(self, filter_name: str, estate_value: Any) -> set[int]:
+        accepting = self._accepting[filter_name].get(estate_value)
+        if accepting is None:
+            accepting_value = self._by_value[filter_name].get(estate_value, set())
+            accepting = self._unfiltered[filter_name] | accepting_value
+            self._accepting[filter_name][estate_value] = accepting
+        return accepting
+
+    def _add_discrete(self, filter_name: str, user_id: int, filter_value: Any) -> None:
+        if not filter_value:
+            self._unfiltered[filter_name].add(user_id)
+            return
+
+        filter_values = filter_value if isinstance(filter_value, set) else {filter_value}
+        for one_value in filter_values:
+            self._by_value[filter_name][one_value].add(user_id)
+
+
+CandidatesIndex = SubscriptionsIndex | vectorized_matching.VectorizedIndex
+
+
+def build_index(users_filters: Iterable[UserFilters]) -> CandidatesIndex:
+    """Return the vectorized index if enabled, the inverted index otherwise."""
+    if not app_settings.MATCHING_VECTORIZED:
+        return SubscriptionsIndex(users_filters)
+
+    if not vectorized_matching.is_available():
+        raise RuntimeError('MATCHING_VECTORIZED is set, but numpy is not installed: poetry install --extras vectorized')
+
+    return vectorized_matching.VectorizedIndex(users_filters)
+
+
+def _split_sorted(bounds: Bounds) -> tuple[list[int], list[int]]:
+    bounds.sort()
+    return (
+        [bound for bound, _ in bounds],
+        [user_id for _, user_id in bounds],
+    )
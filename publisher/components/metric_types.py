@@ -0,0 +1,171 @@
+"""Metric families and their registry rendered in the prometheus text format."""
+import bisect
+import math
+import time
+from contextlib import contextmanager
+from typing import Generator, Iterable, TypeVar
+
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+    0.5, 1, 2.5, 5, 10, 30,
+)
+
+LabelValues = tuple[str, ...]
+MetricType = TypeVar('MetricType', bound='Metric')
+
+
+class Metric:
+    """Metric family, one sample per label values."""
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = ()) -> None:
+        """Set up empty family."""
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._samples: dict[LabelValues, float] = {}
+
+    def get(self, **labels: str) -> float:
+        """Return the sample value."""
+        return self._samples.get(self._get_key(labels), 0)
+
+    def render(self) -> list[str]:
+        """Return the family exposition lines."""
+        return [
+            '# HELP {0} {1}'.format(self.name, self.documentation),
+            '# TYPE {0} {1}'.format(self.name, self.kind),
+            *self._render_samples(),
+        ]
+
+    def _render_samples(self) -> list[str]:
+        return [
+            '{0}{1} {2}'.format(self.name, self._format_labels(key), _format_number(sample_value))
+            for key, sample_value in sorted(self._samples.items())
+        ]
+
+    def _get_key(self, labels: dict[str, str]) -> LabelValues:
+        if labels.keys() != set(self.label_names):
+            raise ValueError('{0} expects labels {1}, got {2}'.format(self.name, self.label_names, sorted(labels)))
+        return tuple(str(labels[label_name]) for label_name in self.label_names)
+
+    def _format_labels(self, key: LabelValues, **extra_labels: str) -> str:
+        pairs = [*zip(self.label_names, key), *extra_labels.items()]
+        if not pairs:
+            return ''
+        return '{{{0}}}'.format(','.join(
+            '{0}="{1}"'.format(label_name, _escape(label_value))
+            for label_name, label_value in pairs
+        ))
+
+
+class Counter(Metric):
+    """Monotonically increasing value."""
+
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Increase the sample."""
+        key = self._get_key(labels)
+        self._samples[key] = self._samples.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """Value going up and down."""
+
+    kind = 'gauge'
+
+    def set(self, amount: float, **labels: str) -> None:
+        """Replace the sample."""
+        self._samples[self._get_key(labels)] = amount
+
+
+class Histogram(Metric):
+    """Observations counted in cumulative buckets."""
+
+    kind = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        """Set up empty family."""
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._bounds = (*self.buckets, math.inf)
+        self._bucket_counts: dict[LabelValues, list[int]] = {}
+
+    def observe(self, amount: float, **labels: str) -> None:
+        """Count the observation in its bucket."""
+        key = self._get_key(labels)
+        if key not in self._bucket_counts:
+            self._bucket_counts[key] = [0 for _ in self._bounds]
+        self._bucket_counts[key][bisect.bisect_left(self.buckets, amount)] += 1
+        self._samples[key] = self._samples.get(key, 0) + amount
+
+    @contextmanager
+    def time(self, **labels: str) -> Generator[None, None, None]:
+        """Observe the block duration in seconds."""
+        started_at = time.perf_counter()
+        try:  # noqa: WPS501
+            yield
+        finally:
+            self.observe(time.perf_counter() - started_at, **labels)
+
+    def _render_samples(self) -> list[str]:
+        return [
+            line
+            for key in sorted(self._bucket_counts)
+            for line in self._render_key_samples(key)
+        ]
+
+    def _render_key_samples(self, key: LabelValues) -> list[str]:
+        lines = []
+        cumulative_count = 0
+        for bound, bucket_count in zip(self._bounds, self._bucket_counts[key]):
+            cumulative_count += bucket_count
+            bucket_labels = self._format_labels(key, le=_format_number(bound))
+            lines.append('{0}_bucket{1} {2}'.format(self.name, bucket_labels, cumulative_count))
+
+        key_labels = self._format_labels(key)
+        observed_sum = _format_number(self._samples[key])
+        lines.append('{0}_sum{1} {2}'.format(self.name, key_labels, observed_sum))
+        lines.append('{0}_count{1} {2}'.format(self.name, key_labels, cumulative_count))
+        return lines
+
+
+class Registry:
+    """Metric families of the process."""
+
+    def __init__(self) -> None:
+        """Set up empty registry."""
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: MetricType) -> MetricType:
+        """Add the metric family, names are unique."""
+        if metric.name in self._metrics:
+            raise ValueError('metric {0} already registered'.format(metric.name))
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Return all families in the prometheus text format."""
+        lines = [
+            line
+            for metric in self._metrics.values()
+            for line in metric.render()
+        ]
+        return '{0}\n'.format('\n'.join(lines))
+
+
+def _format_number(number: float) -> str:
+    if math.isinf(number):
+        return '+Inf' if number > 0 else '-Inf'
+    return repr(float(number))
+
+
+def _escape(label_value: str) -> str:
+    return label_value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
@@ -0,0 +1,116 @@
+"""Process metrics in the prometheus text format, served on a local HTTP port."""
+import logging
+from contextlib import contextmanager
+from typing import Generator
+
+from aiogram import exceptions
+from aiohttp import web
+
+from publisher.components.metric_types import Counter, Gauge, Histogram, Registry
+from publisher.settings import app_settings
+
+logger = logging.getLogger(__file__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class MetricsServer:
+    """Local HTTP endpoint in the process event loop."""
+
+    def __init__(self, metrics_registry: Registry) -> None:
+        """Set up stopped server."""
+        self._registry = metrics_registry
+        self._runner: web.AppRunner | None = None
+
+    async def start(self, host: str, port: int) -> None:
+        """Listen the port, once per process."""
+        if self._runner is not None:
+            return
+
+        app = web.Application()
+        app.router.add_get('/metrics', self.metrics_handler)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        self._runner = runner
+
+    async def stop(self) -> None:
+        """Stop listening."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+        self._runner = None
+
+    async def metrics_handler(self, request: web.Request) -> web.Response:
+        """Return the registry exposition."""
+        exposition = self._registry.render()
+        return web.Response(body=exposition.encode(), headers={'Content-Type': CONTENT_TYPE})
+
+
+registry = Registry()
+fetch_seconds = registry.register(Histogram(
+    'publisher_fetch_seconds',
+    'Estates API fetch latency.',
+    ['category'],
+))
+stage_seconds = registry.register(Histogram(
+    'publisher_stage_seconds',
+    'Dedup, match and publish stages latency per batch.',
+    ['stage'],
+))
+render_seconds = registry.register(Histogram(
+    'publisher_render_seconds',
+    'Message rendering latency.',
+    ['kind'],
+))
+send_seconds = registry.register(Histogram(
+    'publisher_send_seconds',
+    'Telegram send method latency.',
+))
+sends_total = registry.register(Counter(
+    'publisher_sends_total',
+    'Telegram send method calls.',
+    ['status'],
+))
+telegram_errors_total = registry.register(Counter(
+    'publisher_telegram_errors_total',
+    'Telegram errors by type.',
+    ['error'],
+))
+disabled_users_total = registry.register(Counter(
+    'publisher_disabled_users_total',
+    'Users with notifications disabled by telegram errors.',
+    ['reason'],
+))
+queue_depth = registry.register(Gauge(
+    'publisher_queue_depth',
+    'Items waiting in the queue.',
+    ['queue'],
+))
+metrics_server = MetricsServer(registry)
+
+
+@contextmanager
+def track_send() -> Generator[None, None, None]:
+    """Measure the telegram send method, count sends and errors by type."""
+    with send_seconds.time():
+        try:
+            yield
+        except exceptions.TelegramAPIError as exc:
+            sends_total.inc(status='failed')
+            telegram_errors_total.inc(error=type(exc).__name__)
+            raise
+    sends_total.inc(status='ok')
+
+
+async def serve() -> None:
+    """Start the metrics endpoint if the port is set."""
+    if not app_settings.METRICS_PORT:
+        return
+
+    await metrics_server.start(app_settings.METRICS_HOST, app_settings.METRICS_PORT)
+    logger.info('metrics served on {0}:{1}'.format(app_settings.METRICS_HOST, app_settings.METRICS_PORT))
+
+
+async def close_server() -> None:
+    """Stop the metrics endpoint, call it on the process shutdown."""
+    await metrics_server.stop()
@@ -1,17 +1,106 @@
 """Logs and notifications."""
+import asyncio
+import logging
 
-from aiogram import Bot
+from aiogram import exceptions
 
+from publisher.components.telegram import bot_provider
 from publisher.settings import app_settings
 
+TELEGRAM_MAX_MESSAGE_LENGTH = 4096
 
-async def send_logs_notification(message: str) -> None:
-    """Send message to the logs channel."""
+logger = logging.getLogger(__file__)
+
+
+class LogsNotifier:
+    """Collect messages for the logs channel and post them by batches in background.
+
+    Messages queued during the interval are joined into as few posts as possible.
+    """
+
+    def __init__(self, interval: float = app_settings.LOGS_NOTIFICATION_INTERVAL_SECONDS) -> None:
+        """Set up empty notifier."""
+        self.interval = interval
+        self._pending: list[str] = []
+        self._has_pending: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def put(self, message: str) -> None:
+        """Queue message, start background worker for the running event loop or restart the dead one."""
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._loop is not loop:
+            self._start_worker(loop)
+        elif self._task.done():
+            logger.warning('logs notifier worker is dead, restart it')
+            self._start_worker(loop)
+        self._pending.append(message)
+        self._has_pending.set()  # type: ignore
+
+    async def flush(self) -> None:
+        """Stop background worker and post queued messages at once."""
+        if self._task is not None and self._loop is asyncio.get_running_loop():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            await self._post(self._take_pending())
+        self._pending = []
+        self._has_pending = None
+        self._task = None
+        self._loop = None
+
+    def _start_worker(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._has_pending = asyncio.Event()
+        self._task = loop.create_task(self._worker())
+
+    async def _worker(self) -> None:
+        while True:
+            await self._has_pending.wait()  # type: ignore
+            await asyncio.sleep(self.interval)
+            await self._post(self._take_pending())
+
+    def _take_pending(self) -> list[str]:
+        messages = self._pending
+        self._pending = []
+        if self._has_pending is not None:
+            self._has_pending.clear()
+        return messages
+
+    async def _post(self, messages: list[str]) -> None:
+        for chunk in get_chunks(messages):
+            try:
+                await bot_provider.get().send_message(
+                    chat_id=app_settings.LOGS_CHANNEL_ID,
+                    text=chunk,
+                )
+            except exceptions.TelegramAPIError as exc:
+                logger.warning('sent to logs channel error: {0}'.format(exc))
+
+
+logs_notifier = LogsNotifier()
+
+
+def send_logs_notification(message: str) -> None:
+    """Queue message for the logs channel, never waits for telegram."""
     if not app_settings.BOT_TOKEN:
         return
 
-    async with Bot(app_settings.BOT_TOKEN) as bot_instance:
-        await bot_instance.send_message(
-            chat_id=app_settings.LOGS_CHANNEL_ID,
-            text=message,
-        )
+    logs_notifier.put(message)
+
+
+async def close_notifier() -> None:
+    """Post queued messages, call it on the process shutdown."""
+    await logs_notifier.flush()
+
+
+def get_chunks(messages: list[str]) -> list[str]:
+    """Join messages by lines into posts fitting the telegram message length limit."""
+    chunks: list[str] = []
+    for message in messages:
+        line = message[:TELEGRAM_MAX_MESSAGE_LENGTH]
+        free_space = TELEGRAM_MAX_MESSAGE_LENGTH - len(line)
+        if chunks and len(chunks[-1]) < free_space:
+            chunks[-1] = '{0}\n{1}'.format(chunks[-1], line)
+        else:
+            chunks.append(line)
+    return chunks
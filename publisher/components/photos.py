@@ -0,0 +1,32 @@
+"""Telegram file_id cache for estate photos.
+
+Telegram downloads a photo sent by url on every request, a photo sent by file_id is not downloaded again.
+"""
+from cachetools import TTLCache
+
+from publisher.components import storage
+from publisher.settings import app_settings
+
+_local_cache: TTLCache = TTLCache(maxsize=app_settings.PHOTO_CACHE_SIZE, ttl=app_settings.PHOTO_CACHE_TTL_SECONDS)
+
+
+def get_file_id(estate_id: int) -> str | None:
+    """Return cached file_id of the estate photo."""
+    file_id = _local_cache.get(estate_id)
+    if file_id is None:
+        file_id = storage.get_photo_file_id(estate_id)
+        if file_id is not None:
+            _local_cache[estate_id] = file_id
+    return file_id
+
+
+def save_file_id(estate_id: int, file_id: str) -> None:
+    """Cache file_id of the estate photo."""
+    _local_cache[estate_id] = file_id
+    storage.save_photo_file_id(estate_id, file_id)
+
+
+def forget_file_id(estate_id: int) -> None:
+    """Drop invalid file_id of the estate photo."""
+    _local_cache.pop(estate_id, None)
+    storage.delete_photo_file_id(estate_id)
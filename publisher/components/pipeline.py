@@ -0,0 +1,124 @@
+"""Chain of async stages connected by bounded queues."""
+import asyncio
+import contextvars
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from publisher.components import metrics, tracing
+
+logger = logging.getLogger(__file__)
+
+StageHandler = Callable[[Any], Awaitable[Any]]
+
+MIN_UPTIME_SECONDS = 1e-9
+
+
+@dataclass
+class StageStats:
+    """Stage counters."""
+
+    name: str
+    queue_depth: int
+    processed: int
+    failed: int
+    busy_seconds: float
+    throughput: float  # noqa: F841 items per second since the pipeline start
+
+
+class _Stage:
+    def __init__(self, name: str, stage_handler: StageHandler, maxsize: int) -> None:
+        self.name = name
+        self.stage_handler = stage_handler
+        self.queue: asyncio.Queue[tuple[contextvars.Context, Any]] = asyncio.Queue(maxsize=maxsize)
+        self.processed = 0
+        self.failed = 0
+        self.busy_seconds: float = 0
+
+
+class Pipeline:  # noqa: WPS214
+    """Stages run concurrently, each one takes items from its own bounded queue.
+
+    A handler returns the item for the next stage or None to drop it.
+    A full queue blocks the previous stage (back pressure).
+    Handlers run in the context of the put call, so they see its tracing span.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        """Set up empty pipeline."""
+        self._maxsize = maxsize
+        self._stages: list[_Stage] = []
+        self._workers: list[asyncio.Task] = []
+        self._started_at: float = 0
+
+    def add_stage(self, name: str, stage_handler: StageHandler) -> None:
+        """Append stage to the end of the pipeline."""
+        self._stages.append(_Stage(name, stage_handler, self._maxsize))
+
+    def start(self) -> None:
+        """Run stage workers."""
+        self._started_at = time.monotonic()
+        self._workers = [
+            asyncio.create_task(self._worker(stage_index))
+            for stage_index in range(len(self._stages))
+        ]
+
+    async def put(self, stage_input: Any) -> None:
+        """Feed item to the first stage, wait for a free place in the queue."""
+        await self._stages[0].queue.put((contextvars.copy_context(), stage_input))
+
+    async def join(self) -> None:
+        """Wait until all fed items pass all stages."""
+        for stage in self._stages:
+            await stage.queue.join()
+
+    async def stop(self) -> None:
+        """Process fed items and stop stage workers."""
+        await self.join()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def get_stats(self) -> list[StageStats]:
+        """Return stages queue depth and throughput."""
+        uptime = max(time.monotonic() - self._started_at, MIN_UPTIME_SECONDS)
+        return [
+            StageStats(
+                name=stage.name,
+                queue_depth=stage.queue.qsize(),
+                processed=stage.processed,
+                failed=stage.failed,
+                busy_seconds=round(stage.busy_seconds, 3),
+                throughput=round(stage.processed / uptime, 3),
+            )
+            for stage in self._stages
+        ]
+
+    async def _worker(self, stage_index: int) -> None:
+        stage = self._stages[stage_index]
+        next_index = stage_index + 1
+        next_stage = self._stages[next_index] if next_index < len(self._stages) else None
+        while True:
+            context, stage_input = await stage.queue.get()
+            handler_context = context.copy()
+            output = await asyncio.create_task(self._run_handler(stage, stage_input), context=handler_context)
+            if output is not None and next_stage is not None:
+                await next_stage.queue.put((context, output))
+            stage.queue.task_done()
+
+    async def _run_handler(self, stage: _Stage, stage_input: Any) -> Any:
+        started_at = time.monotonic()
+        try:
+            with tracing.span(stage.name):
+                output = await stage.stage_handler(stage_input)
+        except Exception as stage_exc:
+            stage.failed += 1
+            output = None
+            logger.exception('stage {0} failed {1}'.format(stage.name, stage_exc))
+        elapsed = time.monotonic() - started_at
+        stage.busy_seconds += elapsed
+        metrics.stage_seconds.observe(elapsed, stage=stage.name)
+        stage.processed += 1
+        return output
@@ -6,6 +6,7 @@ from typing import Any, Generator
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup, KeyboardButton, ReplyKeyboardMarkup
 from aiogram.utils import markdown
 from aiogram.utils.text_decorations import markdown_decoration
+from cachetools import LRUCache, cached
 
 from publisher.components import districts, storage
 from publisher.components.translation import get_i8n_text
@@ -83,11 +84,16 @@ def get_settings_menu(user_id: int) -> InlineKeyboardMarkup:
         'menu.skip_duplicates.{0}'.format('active' if user_settings.skip_duplicates else 'inactive'),
         user_settings.lang,
     )
+    digest_button = get_i8n_text(
+        'menu.digest.{0}'.format('active' if user_settings.digest else 'inactive'),
+        user_settings.lang,
+    )
     lang_button = get_i8n_text('menu.lang.{0}'.format(user_settings.lang), user_settings.lang)
     return InlineKeyboardMarkup(
         inline_keyboard=[
             [InlineKeyboardButton(text=notify_button, callback_data='settings:toggle:enabled')],
             [InlineKeyboardButton(text=skip_duplicates_button, callback_data='settings:toggle:skip_duplicates')],
+            [InlineKeyboardButton(text=digest_button, callback_data='settings:toggle:digest')],
             [InlineKeyboardButton(text=lang_button, callback_data='settings:toggle:lang')],
             [InlineKeyboardButton(
                 text=get_i8n_text('filters.button.close', user_settings.lang),
@@ -665,6 +671,16 @@ async def get_filters_representation(user_filters: UserFilters) -> str:
 
 def get_estate_as_post(ads_for_post: Estate, lang: str) -> dict[str, Any]:
     """Set up estate message settings for sending to customer."""
+    return dict(_render_estate_post(ads_for_post, lang))
+
+
+def _get_estate_post_key(ads_for_post: Estate, lang: str) -> tuple[int, str, str]:
+    return ads_for_post.id, ads_for_post.updated_at, lang
+
+
+@cached(cache=LRUCache(maxsize=app_settings.RENDER_CACHE_SIZE), key=_get_estate_post_key)
+def _render_estate_post(ads_for_post: Estate, lang: str) -> dict[str, Any]:
+    """Render estate post once per estate version and language, recipients share it."""
     ads_link_btn = InlineKeyboardMarkup(
         inline_keyboard=[
             [InlineKeyboardButton(text='Go to advertisement', url=ads_for_post.page_url)],
@@ -757,6 +773,21 @@ def get_estate_description_short(ads: Estate, lang: str) -> str:
     return markdown.text(*parts, sep=' ')
 
 
+def get_estates_digest(ads_list: list[Estate], lang: str) -> list[str]:
+    """Create digest messages, one row per estate."""
+    rows = [
+        get_estate_description_short(ads, lang)
+        for ads in ads_list
+    ]
+    return [
+        markdown.text(*batch, sep='\n')
+        for batch in _get_batches(
+            [get_i8n_text('digest.title', lang).format(len(ads_list))] + rows,
+            size=app_settings.TELEGRAM_MAX_ROWS_PER_MESSAGE,
+        )
+    ]
+
+
 def get_price_human_value(price: int | None, lang: str) -> str:
     """Return human-friendly price string."""
     if not price or price < 0:
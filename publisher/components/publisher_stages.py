@@ -0,0 +1,133 @@
+"""Publisher pipeline stages: dedup, match and publish batches of fetched estates.
+
+A batch moves the category high-water mark only once its ads are posted.
+"""
+import logging
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field, replace
+
+from publisher.components import delivery_queue, leadership, shards, storage, tracing
+from publisher.components.delivery_jobs import DeliveryJob
+from publisher.components.matching import CandidatesIndex, build_index
+from publisher.components.types import Estate, Shard
+from publisher.settings import app_settings
+
+logger = logging.getLogger(__file__)
+
+
+@dataclass
+class EstatesBatch:
+    """Fetched estates of the category on their way through the stages."""
+
+    category: str
+    estates: list[Estate]
+    subs_index: CandidatesIndex | None
+    fetched_ids: list[int] = field(default_factory=list)  # the high-water mark moves by them once posted
+
+
+class PublisherStages:
+    """Pipeline stage handlers sharing the counter and the ads ids in flight."""
+
+    def __init__(self, shards_count: int = 1) -> None:
+        """Set up empty counters."""
+        self.shards_count = shards_count
+        self.counter: Counter = Counter()
+        self.in_flight: set[int] = set()  # not posted yet ads ids passed to the match stage
+
+    async def dedup(self, batch: EstatesBatch) -> EstatesBatch | None:
+        """Drop posted and in flight ads, pass the rest oldest first."""
+        fetched_ids = [ads_item.id for ads_item in batch.estates]
+        new_ads = [
+            ads_item
+            for ads_item in _apply_new_only_filter(batch.estates)
+            if ads_item.id not in self.in_flight
+        ]
+        logger.info('got {0} not posted {1} ads'.format(len(new_ads), batch.category))
+        self.counter[f'{batch.category} not posted'] += len(new_ads)
+        if not new_ads:
+            if self.in_flight.isdisjoint(fetched_ids):
+                storage.update_high_water_mark(batch.category, fetched_ids)
+            return None
+
+        new_ads.reverse()
+        self.in_flight.update(ads_item.id for ads_item in new_ads)
+        return replace(batch, estates=new_ads, fetched_ids=fetched_ids)
+
+    async def match(self, batch: EstatesBatch) -> None:
+        """Enqueue notifications of the subscribers and mark ads posted."""
+        ads_ids = [ads_item.id for ads_item in batch.estates]
+        try:  # noqa: WPS501
+            self.counter[f'{batch.category} subs notifications'] += _post_ads_to_subscriptions(
+                ads=batch.estates,
+                subs_index=batch.subs_index,  # type: ignore
+            )
+            storage.mark_as_posted(ads_ids=ads_ids)
+            storage.update_high_water_mark(batch.category, batch.fetched_ids)
+        finally:
+            self.in_flight.difference_update(ads_ids)
+
+    async def publish(self, batch: EstatesBatch) -> None:
+        """Publish ads to the shards while the leader lease is held."""
+        ads_ids = [ads_item.id for ads_item in batch.estates]
+        try:  # noqa: WPS501
+            delivery_queue.enqueue(estates=batch.estates, jobs=[])
+            if not shards.publish(leadership.WORKER_ID, ads_ids, shards_count=self.shards_count):
+                logger.warning('leader lease is lost, skip publishing of {0} ads'.format(len(ads_ids)))
+                self.counter['leadership lost'] += 1
+                return
+            storage.update_high_water_mark(batch.category, batch.fetched_ids)
+            self.counter[f'{batch.category} published'] += len(ads_ids)
+        finally:
+            self.in_flight.difference_update(ads_ids)
+
+
+def match_shard(shard: Shard) -> int:
+    """Match ads published by the leader against the subscribers of the shard."""
+    ads_ids = shards.take(shard, limit=app_settings.PUBLISH_SHARD_BATCH)
+    if not ads_ids:
+        return 0
+
+    estates = delivery_queue.get_estates(ads_ids)
+    users_settings = storage.get_users_settings(
+        sub.user_id
+        for sub in storage.get_active_subscriptions()
+        if shards.is_owned(shard, sub.user_id)
+    )
+    subs_index = build_index(users_settings.values())
+    shard_ads = [estates[ads_id] for ads_id in ads_ids if ads_id in estates]
+    logger.info('shard {0} got {1} ads'.format(shard.index, len(shard_ads)))
+    logger.info('indexed {0} enabled subs'.format(len(subs_index)))
+    notifications_count = _post_ads_to_subscriptions(ads=shard_ads, subs_index=subs_index)
+    shards.ack(shard, ads_ids)
+    return notifications_count
+
+
+def _apply_new_only_filter(ads: list[Estate]) -> list[Estate]:
+    not_posted_ids = set(storage.filter_not_posted([ads_item.id for ads_item in ads]))
+    return [
+        new_ads
+        for new_ads in ads
+        if new_ads.id in not_posted_ids
+    ]
+
+
+def _post_ads_to_subscriptions(ads: list[Estate], subs_index: CandidatesIndex) -> int:
+    if not subs_index:
+        return 0
+
+    with tracing.span('matching', ads=len(ads), subs=len(subs_index)) as matching_attributes:
+        jobs = []
+        digests: dict[int, list[int]] = defaultdict(list)
+        for ads_for_post in ads:
+            for user_id in subs_index.get_candidates(ads_for_post):
+                if user_id in subs_index.digest_users:
+                    digests[user_id].append(ads_for_post.id)
+                else:
+                    jobs.append(DeliveryJob(user_id=user_id, estate_ids=(ads_for_post.id,)))
+        jobs.extend(
+            DeliveryJob(user_id=digest_user_id, estate_ids=tuple(estate_ids))
+            for digest_user_id, estate_ids in digests.items()
+        )
+        matching_attributes['jobs'] = len(jobs)
+    logger.info('enqueue {0} notifications'.format(len(jobs)))
+    return delivery_queue.enqueue(estates=ads, jobs=jobs)
@@ -0,0 +1,87 @@
+"""Adaptive pause between publisher cycles."""
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from publisher.components import reload
+from publisher.settings import app_settings
+
+logger = logging.getLogger(__file__)
+
+
+@dataclass
+class ScheduledInterval:
+    """Chosen pause before the next cycle."""
+
+    created_at: float  # noqa: F841
+    interval: float
+    reason: str
+
+
+class PollingScheduler:
+    """Choose the pause by the last cycle results.
+
+    Errors back off exponentially, bursts of new ads tighten the interval to the minimum,
+    quiet cycles in a row (nights) stretch it step by step up to the maximum.
+    """
+
+    quiet_factor = 1.5
+    history_size = 1000
+
+    def __init__(
+        self,
+        base_interval: float = app_settings.PUBLISH_INTERVAL_SECONDS,
+        min_interval: float = app_settings.PUBLISH_INTERVAL_MIN_SECONDS,
+        max_interval: float = app_settings.PUBLISH_INTERVAL_MAX_SECONDS,
+        burst_threshold: int = app_settings.PUBLISH_INTERVAL_BURST_ADS,
+    ) -> None:
+        """Set up scheduler limits."""
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.burst_threshold = burst_threshold
+        self.history: deque[ScheduledInterval] = deque(maxlen=self.history_size)
+        self._errors_in_row = 0
+        self._quiet_in_row = 0
+
+    def next_interval(self, new_ads: int, has_errors: bool = False) -> float:
+        """Return pause before the next cycle and record it."""
+        if has_errors:
+            self._errors_in_row = self._count_in_row(self._errors_in_row, factor=2)
+            self._quiet_in_row = 0
+            interval, reason = self.base_interval * 2 ** self._errors_in_row, 'error'
+        elif new_ads >= self.burst_threshold:
+            self._errors_in_row = 0
+            self._quiet_in_row = 0
+            interval, reason = self.min_interval, 'burst'
+        elif new_ads:
+            self._errors_in_row = 0
+            self._quiet_in_row = 0
+            interval, reason = self.base_interval, 'regular'
+        else:
+            self._errors_in_row = 0
+            self._quiet_in_row = self._count_in_row(self._quiet_in_row, factor=self.quiet_factor)
+            interval, reason = self.base_interval * self.quiet_factor ** self._quiet_in_row, 'quiet'
+
+        interval = min(max(interval, self.min_interval), self.max_interval)
+        scheduled = ScheduledInterval(created_at=time.time(), interval=interval, reason=reason)
+        self.history.append(scheduled)
+        logger.info(f'next cycle in {interval:.1f}s {reason=} {new_ads=}')
+        return interval
+
+    async def sleep(self, interval: float, tick: float = 0.2) -> None:
+        """Sleep the interval, wake up at once on the exit request."""
+        wake_up_at = time.monotonic() + interval
+        while not reload.has_exit_request():
+            remaining = wake_up_at - time.monotonic()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(min(tick, remaining))
+
+    def _count_in_row(self, in_row: int, factor: float) -> int:
+        """Count one more cycle in a row until the grown interval reaches the maximum, the power never overflows."""
+        if self.base_interval * factor ** in_row >= self.max_interval:
+            return in_row
+        return in_row + 1
@@ -0,0 +1,82 @@
+"""Publisher shards: hash ranges of subscribers and the lists of published estate ids.
+
+The leader fetches and dedups ads once and publishes their ids to every shard list,
+each shard worker matches them against its own subscribers.
+Taken ids stay in the shard processing list until acknowledged, so a restarted worker resumes them.
+Ids are published only while the leader lease is held, a stalled former leader never posts them twice.
+"""
+import functools
+import zlib
+from typing import Any, Iterable
+
+from publisher.components import storage
+from publisher.components.leadership import PUBLISHER_LEADER_KEY
+from publisher.components.types import Shard
+
+PUBLISHER_SHARD_KEY = 'prague-publisher:publisher:shard'
+PUBLISHER_SHARD_PROCESSING_KEY = 'prague-publisher:publisher:shard:processing'
+
+
+def get_shard_index(user_id: int, shards_count: int) -> int:
+    """Return shard owning the user, stable across processes and hosts."""
+    return zlib.crc32(str(user_id).encode()) % shards_count
+
+
+def is_owned(shard: Shard, user_id: int) -> bool:
+    """Check the user belongs to the shard hash range."""
+    return get_shard_index(user_id, shard.count) == shard.index
+
+
+def publish(worker: str, estate_ids: Iterable[int], shards_count: int) -> bool:
+    """Push estate ids to all shards and mark them posted by one transaction, if the worker holds the leader lease."""
+    estate_ids = list(estate_ids)
+    if not estate_ids:
+        return True
+
+    return bool(storage.db_pool.transaction(
+        functools.partial(_publish, worker=worker, estate_ids=estate_ids, shards_count=shards_count),  # type: ignore
+        PUBLISHER_LEADER_KEY,
+        value_from_callable=True,
+    ))
+
+
+def take(shard: Shard, limit: int) -> list[int]:
+    """Move up to limit published estate ids to the shard processing list."""
+    pipe = storage.db_pool.pipeline(transaction=False)
+    for _ in range(limit):
+        pipe.lmove(f'{PUBLISHER_SHARD_KEY}:{shard.index}', f'{PUBLISHER_SHARD_PROCESSING_KEY}:{shard.index}', 'LEFT', 'RIGHT')
+
+    return [
+        int(estate_id)
+        for estate_id in pipe.execute()
+        if estate_id is not None
+    ]
+
+
+def ack(shard: Shard, estate_ids: Iterable[int]) -> None:
+    """Remove matched estate ids from the shard processing list."""
+    pipe = storage.db_pool.pipeline(transaction=False)
+    for estate_id in estate_ids:
+        pipe.lrem(f'{PUBLISHER_SHARD_PROCESSING_KEY}:{shard.index}', 1, str(estate_id))
+    pipe.execute()
+
+
+def recover(shard: Shard) -> int:
+    """Return not acknowledged estate ids of the shard to the head of the shard list."""
+    processing_key = f'{PUBLISHER_SHARD_PROCESSING_KEY}:{shard.index}'
+    cnt = 0
+    while storage.db_pool.lmove(processing_key, f'{PUBLISHER_SHARD_KEY}:{shard.index}', 'RIGHT', 'LEFT') is not None:
+        cnt += 1
+    return cnt
+
+
+def _publish(pipe: Any, worker: str, estate_ids: list[int], shards_count: int) -> bool:
+    """Check the lease by the watching pipeline, publish and mark ids in the transaction."""
+    if pipe.get(PUBLISHER_LEADER_KEY) != worker:
+        return False
+
+    pipe.multi()
+    for shard_index in range(shards_count):
+        pipe.rpush(f'{PUBLISHER_SHARD_KEY}:{shard_index}', *estate_ids)
+    storage.add_posted_marks(pipe, estate_ids)
+    return True
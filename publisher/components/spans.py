@@ -0,0 +1,74 @@
+"""Spans of a traced cycle and their JSONL records."""
+import json
+import logging
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+traces_logger = logging.Logger('publisher.traces')  # out of the logging tree, writes to the traces file only
+
+
+@dataclass
+class Span:
+    """Timed operation of the traced cycle."""
+
+    cycle_id: str
+    span_id: int
+    parent_id: int | None
+    name: str
+    started_at: float
+    duration: float = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def finished_at(self) -> float:
+        """Return the span end timestamp."""
+        return self.started_at + self.duration
+
+
+class Cycle:
+    """Spans of one trace, they are written when the cycle is closed and no span of it is open."""
+
+    def __init__(self, name: str) -> None:
+        """Set up the cycle without spans."""
+        self.cycle_id = '{0}:{1}'.format(name, uuid.uuid4().hex)
+        self.finished_spans: list[Span] = []
+        self.open_spans = 0
+        self.spans_count = 0
+        self.is_closed = False
+
+    def open_span(self, name: str, parent: Span | None, attributes: dict[str, Any]) -> Span:
+        """Return the new span of the cycle started now."""
+        self.spans_count += 1
+        self.open_spans += 1
+        return Span(
+            cycle_id=self.cycle_id,
+            span_id=self.spans_count,
+            parent_id=parent.span_id if parent else None,
+            name=name,
+            started_at=time.time(),
+            attributes=attributes,
+        )
+
+    def finish_span(self, finished_span: Span, duration: float) -> None:
+        """Keep the finished span until the cycle is written."""
+        finished_span.duration = duration
+        self.open_spans -= 1
+        self.finished_spans.append(finished_span)
+        self._flush()
+
+    def close(self) -> None:
+        """Close the cycle, spans still open are written once finished."""
+        self.is_closed = True
+        self._flush()
+
+    def _flush(self) -> None:
+        if not self.is_closed or self.open_spans:
+            return
+
+        finished_spans = self.finished_spans
+        self.finished_spans = []
+        for finished_span in finished_spans:
+            traces_logger.info(json.dumps(asdict(finished_span), default=str))
@@ -1,11 +1,15 @@
 """Local storage functions."""
+import functools
 import uuid
-from dataclasses import asdict
+from dataclasses import asdict, replace
 from datetime import date, timedelta
-from typing import Any
+from itertools import batched
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping
 
 from redis import Redis  # type: ignore
 
+from publisher.components import tracing, user_settings_codec
 from publisher.components.types import Invoice, Subscription, UserFilters
 from publisher.settings import app_settings
 
@@ -15,48 +19,217 @@ db_pool: Redis = Redis.from_url(
     decode_responses=True,
 )
 
-POSTED_ADS_KEY = 'prague-publisher:posted_ads:id'
+POSTED_ADS_KEY = 'prague-publisher:posted_ads:id'  # legacy, key per ads
 TTL_POSTED_ADS = 60 * 60 * 24 * 180  # 6 months  # noqa: WPS432
+POSTED_ADS_BITMAP_KEY = 'prague-publisher:posted_ads:bitmap'
+POSTED_ADS_GENERATIONS = 7  # current month and 6 previous
+MONTHS_PER_YEAR = 12
+TTL_POSTED_ADS_GENERATION = 60 * 60 * 24 * 31 * POSTED_ADS_GENERATIONS  # noqa: WPS432
 INVOICE_KEY = 'prague-publisher:invoice:hash'
 TTL_INVOICE = 60 * 60  # 1 hour
-USER_SETTINGS_KEY = 'prague-publisher:user_filters:id'
+USER_SETTINGS_KEY = 'prague-publisher:user_filters:id'  # legacy, hash field per setting
+USER_SETTINGS_PACKED_KEY = 'prague-publisher:user_filters:packed:id'
 USER_USED_TRIAL_KEY = 'prague-publisher:user:trial:used:id'
 SUBSCRIPTION_KEY = 'prague-publisher:subscription:id'
 SUBSCRIPTIONS_ACTIVE_KEY = 'prague-publisher:subscription:active'
+FETCH_HIGH_WATER_MARK_KEY = 'prague-publisher:fetch:high_water_mark'
+PHOTO_FILE_ID_KEY = 'prague-publisher:photo:file_id:estate'
+TTL_PHOTO_FILE_ID = 60 * 60 * 24 * 7  # 1 week
 
+UsersSettings = dict[int, UserFilters]
 
+
+@tracing.traced
 def has_used_trial(user_id: int, promo: str) -> bool:
     """Return user trial used state."""
     return db_pool.exists(f'{USER_USED_TRIAL_KEY}:{user_id}:{promo}')  # type: ignore
 
 
+@tracing.traced
 def mark_used_trial(user_id: int, promo: str) -> None:
     """Mark user trial used."""
     db_pool.set(f'{USER_USED_TRIAL_KEY}:{user_id}:{promo}', 1)
 
 
+@tracing.traced
 def mark_as_posted(ads_ids: list[int]) -> int:
-    """Mark ads as posted."""
-    cnt = 0
+    """Mark ads as posted in the current month bitmap by one round trip."""
+    if not ads_ids:
+        return 0
+
+    pipe = db_pool.pipeline(transaction=False)
+    add_posted_marks(pipe, ads_ids)
+    pipe.execute()
+
+    return len(ads_ids)
+
+
+def add_posted_marks(pipe: Any, ads_ids: Iterable[int]) -> None:
+    """Queue marking ads as posted to the pipeline, the caller executes it with own commands."""
+    generation_key = _get_posted_ads_generations()[0]
     for one_id in ads_ids:
-        db_pool.set(f'{POSTED_ADS_KEY}:{one_id}', 1, ex=TTL_POSTED_ADS)
-        cnt += 1
+        pipe.setbit(generation_key, one_id, 1)
+    pipe.expire(generation_key, TTL_POSTED_ADS_GENERATION)
+
+
+@tracing.traced
+def filter_not_posted(ads_ids: list[int]) -> list[int]:
+    """Return ids of not posted yet ads, check all live bitmaps by one round trip."""
+    if not ads_ids:
+        return []
+
+    bitfield_args = [
+        bitfield_arg
+        for one_id in ads_ids
+        for bitfield_arg in ('GET', 'u1', one_id)
+    ]
+
+    pipe = db_pool.pipeline(transaction=False)
+    for generation_key in _get_posted_ads_generations():
+        pipe.execute_command('BITFIELD_RO', generation_key, *bitfield_args)
+
+    generations_bits = pipe.execute()
+    return [
+        one_id
+        for one_id, bits in zip(ads_ids, zip(*generations_bits))
+        if not any(bits)
+    ]
+
+
+@tracing.traced
+def migrate_posted_ads(batch_size: int = 1000) -> int:
+    """Move legacy posted ads keys to the monthly bitmaps."""
+    cnt = 0
+    live_generations = set(_get_posted_ads_generations())
+    for keys_batch in batched(db_pool.scan_iter(match=f'{POSTED_ADS_KEY}:*', count=batch_size), batch_size):
+        _migrate_posted_ads_batch(keys_batch, live_generations)
+        cnt += len(keys_batch)
 
     return cnt
 
 
-def is_not_posted_yet(ads_id: int) -> bool:
-    """Check what ads was already posted."""
-    is_posted = db_pool.exists(f'{POSTED_ADS_KEY}:{ads_id}')
+def _migrate_posted_ads_batch(keys_batch: tuple[str, ...], live_generations: set[str]) -> None:
+    pipe = db_pool.pipeline(transaction=False)
+    for legacy_key in keys_batch:
+        pipe.ttl(legacy_key)
+
+    for legacy_key, ttl in zip(keys_batch, pipe.execute()):
+        posted_seconds_ago = TTL_POSTED_ADS - max(ttl, 0)
+        generation_key = _get_posted_ads_generations(date.today() - timedelta(seconds=posted_seconds_ago))[0]
+        if generation_key in live_generations:
+            ads_id = int(legacy_key.split(':')[-1])
+            pipe.setbit(generation_key, ads_id, 1)
+            pipe.expire(generation_key, TTL_POSTED_ADS_GENERATION)
+        pipe.delete(legacy_key)
+
+    pipe.execute()
+
+
+def _get_posted_ads_generations(today: date | None = None) -> list[str]:
+    """Return live bitmap keys, from the current month to older ones."""
+    current = today or date.today()
+    months_total = current.year * MONTHS_PER_YEAR + current.month - 1
+    generations = []
+    for shift in range(POSTED_ADS_GENERATIONS):
+        year, month_index = divmod(months_total - shift, MONTHS_PER_YEAR)
+        generations.append('{0}:{1:04d}-{2:02d}'.format(POSTED_ADS_BITMAP_KEY, year, month_index + 1))
+    return generations
+
+
+@tracing.traced
+def get_high_water_mark(category: str) -> int | None:
+    """Return the greatest fetched estate id for the category."""
+    high_water_mark = db_pool.get(f'{FETCH_HIGH_WATER_MARK_KEY}:{category}')
+    if high_water_mark is None:
+        return None
+    return int(high_water_mark)  # type: ignore
+
+
+@tracing.traced
+def update_high_water_mark(category: str, ads_ids: list[int]) -> None:
+    """Move the category high-water mark forward by fetched estates ids."""
+    if not ads_ids:
+        return
+
+    high_water_mark = get_high_water_mark(category)
+    if high_water_mark is None or max(ads_ids) > high_water_mark:
+        db_pool.set(f'{FETCH_HIGH_WATER_MARK_KEY}:{category}', max(ads_ids))
+
 
-    return not is_posted
+@tracing.traced
+def get_photo_file_id(estate_id: int) -> str | None:
+    """Return telegram file_id of the estate photo if known."""
+    return db_pool.get(f'{PHOTO_FILE_ID_KEY}:{estate_id}')  # type: ignore
 
 
+@tracing.traced
+def save_photo_file_id(estate_id: int, file_id: str) -> None:
+    """Save telegram file_id of the estate photo."""
+    db_pool.set(f'{PHOTO_FILE_ID_KEY}:{estate_id}', file_id, ex=TTL_PHOTO_FILE_ID)
+
+
+@tracing.traced
+def delete_photo_file_id(estate_id: int) -> None:
+    """Forget telegram file_id of the estate photo."""
+    db_pool.delete(f'{PHOTO_FILE_ID_KEY}:{estate_id}')
+
+
+@tracing.traced
 def get_user_settings(user_id: int) -> UserFilters:
-    """Return user filters and settings or default."""
-    default_data = asdict(UserFilters(user_id=user_id))
-    saved_data: dict | None = db_pool.hgetall(name=f'{USER_SETTINGS_KEY}:{user_id}')  # type: ignore
+    """Return user filters and settings or default, legacy settings are migrated on the way."""
+    packed: str | None = db_pool.get(f'{USER_SETTINGS_PACKED_KEY}:{user_id}')  # type: ignore
+    if packed is not None:
+        return user_settings_codec.decode(user_id, packed)
 
+    saved_data: dict | None = db_pool.hgetall(name=f'{USER_SETTINGS_KEY}:{user_id}')  # type: ignore
+    return _migrate_user_settings({user_id: saved_data})[user_id]
+
+
+@tracing.traced
+def get_users_settings(user_ids: Iterable[int]) -> Mapping[int, UserFilters]:
+    """Return read-only snapshot of filters and settings for many users by two round trips at most."""
+    users_settings, not_packed_ids = _get_packed_users_settings(list(user_ids))
+    pipe = db_pool.pipeline(transaction=False)
+    for not_packed_id in not_packed_ids:
+        pipe.hgetall(name=f'{USER_SETTINGS_KEY}:{not_packed_id}')
+
+    legacy_users_settings = dict(zip(not_packed_ids, pipe.execute()))
+    users_settings.update(_migrate_user_settings(legacy_users_settings))
+    return MappingProxyType(users_settings)
+
+
+def _get_packed_users_settings(user_ids: list[int]) -> tuple[UsersSettings, list[int]]:
+    """Return decoded packed settings and ids of users without them."""
+    pipe = db_pool.pipeline(transaction=False)
+    for one_user_id in user_ids:
+        pipe.get(f'{USER_SETTINGS_PACKED_KEY}:{one_user_id}')
+
+    users_settings = {}
+    not_packed_ids = []
+    for user_id, packed in zip(user_ids, pipe.execute()):
+        if packed is None:
+            not_packed_ids.append(user_id)
+        else:
+            users_settings[user_id] = user_settings_codec.decode(user_id, packed)
+    return users_settings, not_packed_ids
+
+
+def _migrate_user_settings(users_saved_data: dict[int, dict | None]) -> UsersSettings:
+    """Decode legacy settings hashes, replace the saved ones by packed values."""
+    users_settings = {}
+    pipe = db_pool.pipeline()
+    for user_id, saved_data in users_saved_data.items():
+        users_settings[user_id] = _decode_user_settings(user_id, saved_data)
+        if saved_data:
+            packed = user_settings_codec.encode(users_settings[user_id])
+            pipe.set(f'{USER_SETTINGS_PACKED_KEY}:{user_id}', packed, nx=True)
+            pipe.delete(f'{USER_SETTINGS_KEY}:{user_id}')
+    pipe.execute()
+    return users_settings
+
+
+def _decode_user_settings(user_id: int, saved_data: dict | None) -> UserFilters:  # noqa: WPS231
+    default_data = asdict(UserFilters(user_id=user_id))
     if not saved_data:
         return UserFilters(
             **default_data,
@@ -77,6 +250,9 @@ def get_user_settings(user_id: int) -> UserFilters:
     if saved_data.get('skip_duplicates') is not None:
         default_data['skip_duplicates'] = bool(int(saved_data.get('skip_duplicates')))  # type: ignore
 
+    if saved_data.get('digest') is not None:
+        default_data['digest'] = bool(int(saved_data.get('digest')))  # type: ignore
+
     if saved_data.get('min_usable_area', None):
         default_data['min_usable_area'] = int(saved_data.get('min_usable_area'))  # type: ignore
 
@@ -103,30 +279,37 @@ def get_user_settings(user_id: int) -> UserFilters:
     )
 
 
+@tracing.traced
 def update_user_settings(user_id: int, **kwargs: Any) -> None:
-    """Update user filters and settings."""
-    filters_key = f'{USER_SETTINGS_KEY}:{user_id}'
-    for filter_name, filter_value in kwargs.items():
-        if filter_value is None:
-            db_pool.hdel(filters_key, filter_name)
-            continue
-
-        if isinstance(filter_value, bool):
-            filter_value = int(filter_value)
-
-        if isinstance(filter_value, set):
-            filter_value = ':'.join([
-                str(filter_value_item)
-                for filter_value_item in filter_value
-            ])
+    """Update user filters and settings, None resets the setting to default."""
+    default_settings = UserFilters(user_id=user_id)
+    changes = {
+        filter_name: getattr(default_settings, filter_name) if filter_value is None else filter_value
+        for filter_name, filter_value in kwargs.items()
+    }
+    db_pool.transaction(
+        functools.partial(_update_user_settings, user_id=user_id, changes=changes),
+        f'{USER_SETTINGS_PACKED_KEY}:{user_id}',
+        f'{USER_SETTINGS_KEY}:{user_id}',
+    )
 
-        db_pool.hset(
-            name=f'{USER_SETTINGS_KEY}:{user_id}',
-            key=filter_name,
-            value=str(filter_value),
-        )
+
+def _update_user_settings(pipe: Any, user_id: int, changes: dict[str, Any]) -> None:
+    """Read settings by the watching pipeline, write them packed in the transaction."""
+    packed_key = f'{USER_SETTINGS_PACKED_KEY}:{user_id}'
+    legacy_key = f'{USER_SETTINGS_KEY}:{user_id}'
+    packed = pipe.get(packed_key)
+    if packed is None:
+        user_settings = _decode_user_settings(user_id, pipe.hgetall(legacy_key))
+    else:
+        user_settings = user_settings_codec.decode(user_id, packed)
+
+    pipe.multi()
+    pipe.set(packed_key, user_settings_codec.encode(replace(user_settings, **changes)))
+    pipe.delete(legacy_key)
 
 
+@tracing.traced
 def get_active_subscriptions() -> list[Subscription]:
     """Return active subscriptions."""
     active_subs = []
@@ -137,6 +320,7 @@ def get_active_subscriptions() -> list[Subscription]:
     return active_subs
 
 
+@tracing.traced
 def get_subscription(user_id: int) -> Subscription | None:
     """Return user subscription if exists."""
     subscription_data: dict | None = db_pool.hgetall(name=f'{SUBSCRIPTION_KEY}:{user_id}')  # type: ignore
@@ -149,6 +333,7 @@ def get_subscription(user_id: int) -> Subscription | None:
     )
 
 
+@tracing.traced
 def renew_subscription(user_id: int, days: int) -> Subscription:
     """Create or renew user subscription."""
     renew_period = timedelta(days=days)
@@ -188,6 +373,7 @@ def renew_subscription(user_id: int, days: int) -> Subscription:
     return get_subscription(user_id)  # type: ignore
 
 
+@tracing.traced
 def stop_subscription(user_id: int) -> None:
     """Downgrade user subscription."""
     sub_key = f'{SUBSCRIPTION_KEY}:{user_id}'
@@ -199,6 +385,7 @@ def stop_subscription(user_id: int) -> None:
     db_pool.srem(SUBSCRIPTIONS_ACTIVE_KEY, user_id)
 
 
+@tracing.traced
 def create_invoice(
     user_id: int,
     days: int,
@@ -216,6 +403,7 @@ def create_invoice(
     return hash_
 
 
+@tracing.traced
 def get_invoice(
     invoice_hash: str,
 ) -> Invoice | None:
@@ -230,6 +418,7 @@ def get_invoice(
     )
 
 
+@tracing.traced
 def delete_invoice(
     invoice_hash: str,
 ) -> None:
@@ -0,0 +1,47 @@
+"""Shared telegram bot client."""
+import asyncio
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+
+from publisher.settings import app_settings
+
+
+class BotProvider:
+    """Long-lived bot with pooled HTTP session, created lazily for the running event loop."""
+
+    def __init__(self) -> None:
+        """Set up empty provider."""
+        self._bot: Bot | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def get(self) -> Bot:
+        """Return the shared bot, create new one for a new event loop."""
+        loop = asyncio.get_running_loop()
+        if self._bot is None or self._loop is not loop:
+            self._loop = loop
+            self._bot = Bot(
+                app_settings.BOT_TOKEN,
+                session=AiohttpSession(
+                    api=TelegramAPIServer.from_base(app_settings.TELEGRAM_API_URL),
+                    limit=app_settings.TELEGRAM_CONNECTIONS_LIMIT,
+                    timeout=app_settings.TIMEOUT,
+                ),
+            )
+        return self._bot
+
+    async def close(self) -> None:
+        """Close the shared bot session."""
+        if self._bot is not None and self._loop is asyncio.get_running_loop():
+            await self._bot.session.close()
+        self._bot = None
+        self._loop = None
+
+
+bot_provider = BotProvider()
+
+
+async def close_bot() -> None:
+    """Close bot session, call it on the process shutdown."""
+    await bot_provider.close()
@@ -0,0 +1,120 @@
+"""Lightweight tracing: nested spans of a cycle written to a rotating JSONL file.
+
+Spans are recorded inside a cycle only, out of a cycle span is a no-op.
+Finished spans of the cycle are written when no span of the cycle is open.
+"""
+import functools
+import inspect
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging.handlers import RotatingFileHandler
+from typing import Any, Awaitable, Callable, Generator, ParamSpec, TypeVar
+
+from publisher.components.spans import Cycle, Span, traces_logger
+from publisher.settings import app_settings
+
+logger = logging.getLogger(__file__)
+
+FuncParams = ParamSpec('FuncParams')
+FuncResult = TypeVar('FuncResult')
+
+_current_cycle: ContextVar[Cycle | None] = ContextVar('current_cycle', default=None)
+_current_span: ContextVar[Span | None] = ContextVar('current_span', default=None)
+
+
+def setup(service: str) -> None:
+    """Write traces of the process to the service file, if tracing is enabled."""
+    if not app_settings.TRACES_ENABLED or traces_logger.handlers:
+        return
+
+    traces_path = os.path.join(app_settings.TRACES_DIR, 'traces-{0}.jsonl'.format(service))
+    file_handler = RotatingFileHandler(
+        traces_path,
+        maxBytes=app_settings.TRACES_MAX_BYTES,
+        backupCount=app_settings.TRACES_BACKUP_COUNT,
+        encoding='utf-8',
+    )
+    file_handler.setFormatter(logging.Formatter('%(message)s'))  # noqa: WPS323
+    traces_logger.addHandler(file_handler)
+    logger.info('write traces to {0}'.format(traces_path))
+
+
+@contextmanager
+def cycle(name: str, **attributes: Any) -> Generator[dict[str, Any], None, None]:
+    """Start a new trace, the root span is named as the cycle."""
+    if not traces_logger.handlers:
+        yield attributes
+        return
+
+    new_cycle = Cycle(name)
+    token = _current_cycle.set(new_cycle)
+    try:
+        with span(name, **attributes) as span_attributes:
+            yield span_attributes
+    finally:
+        _current_cycle.reset(token)
+        new_cycle.close()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Generator[dict[str, Any], None, None]:
+    """Time the block as a child of the current span, yield attributes to fill in."""
+    current_cycle = _current_cycle.get()
+    if current_cycle is None:
+        yield attributes
+        return
+
+    new_span = current_cycle.open_span(name, _current_span.get(), attributes)
+    token = _current_span.set(new_span)
+    started_at = time.perf_counter()
+    try:
+        yield new_span.attributes
+    except BaseException as exc:
+        new_span.error = type(exc).__name__
+        raise
+    finally:
+        _current_span.reset(token)
+        current_cycle.finish_span(new_span, duration=time.perf_counter() - started_at)
+
+
+def traced(func: Callable[FuncParams, FuncResult]) -> Callable[FuncParams, FuncResult]:
+    """Wrap the function call into the span named by the module and the function.
+
+    Calls from another traced function of the same module are a part of its span.
+    """
+    module_prefix = '{0}.'.format(func.__module__.rsplit('.', 1)[-1])
+    span_name = '{0}{1}'.format(module_prefix, func.__name__)
+    if inspect.iscoroutinefunction(func):
+        return _traced_async(module_prefix, span_name, func)  # type: ignore
+
+    @functools.wraps(func)
+    def wrapper(*args: FuncParams.args, **kwargs: FuncParams.kwargs) -> FuncResult:
+        if not _should_trace(module_prefix):
+            return func(*args, **kwargs)
+        with span(span_name):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def _traced_async(
+    module_prefix: str,
+    span_name: str,
+    func: Callable[FuncParams, Awaitable[FuncResult]],
+) -> Callable[FuncParams, Awaitable[FuncResult]]:
+    @functools.wraps(func)
+    async def wrapper(*args: FuncParams.args, **kwargs: FuncParams.kwargs) -> FuncResult:
+        if not _should_trace(module_prefix):
+            return await func(*args, **kwargs)
+        with span(span_name):
+            return await func(*args, **kwargs)
+    return wrapper
+
+
+def _should_trace(module_prefix: str) -> bool:
+    if _current_cycle.get() is None:
+        return False
+    parent = _current_span.get()
+    return parent is None or not parent.name.startswith(module_prefix)
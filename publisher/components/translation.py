@@ -39,6 +39,8 @@ _i8n = {
     'menu.notify.active': {'en': '🟢 Notifications', 'ru': '🟢 Уведомления'},
     'menu.skip_duplicates.inactive': {'en': '🔴 Skip duplicates', 'ru': '🔴 Скрыть дубли'},
     'menu.skip_duplicates.active': {'en': '🟢 Skip duplicates', 'ru': '🟢 Скрыть дубли'},
+    'menu.digest.inactive': {'en': '🔴 Digest', 'ru': '🔴 Дайджест'},
+    'menu.digest.active': {'en': '🟢 Digest', 'ru': '🟢 Дайджест'},
     'menu.lang.en': {'en': '🇬🇧 Language', 'ru': '🇬🇧 Language'},
     'menu.lang.ru': {'en': '🇷🇺 Язык', 'ru': '🇷🇺 Язык'},
     'menu.lang.cz': {'en': 'Jazyk', 'ru': '🇨🇿 Jazyk'},
@@ -277,6 +279,10 @@ _i8n = {
         'en': '',
         'ru': '',
     },
+    'digest.title': {
+        'en': '🏠 {0} new ads by your filters:',
+        'ru': '🏠 {0} новых объявлений по вашим фильтрам:',
+    },
     'error.unknown_button': {
         'en': 'unknown command',
         'ru': 'неизвестная команда',
@@ -44,6 +44,14 @@ class Invoice:
     days: int
 
 
+@dataclass(frozen=True)
+class Shard:
+    """Publisher worker hash range of subscribers."""
+
+    index: int
+    count: int
+
+
 @dataclass
 class Subscription:
     """User subscription type."""
@@ -76,6 +84,7 @@ class UserFilters:
     lang: str = 'en'
     enabled: bool = False
     skip_duplicates: bool = False
+    digest: bool = False
     category: str | None = None
     property_type: str | None = None
     min_price: int | None = None
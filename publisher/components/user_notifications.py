@@ -0,0 +1,130 @@
+"""Estate notifications to a subscriber: posts with photos and digests.
+
+Telegram errors caused by the user are handled here, notifications are disabled for blocked bots and lost chats.
+"""
+import logging
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Generator
+
+from aiogram import Bot, exceptions
+
+from publisher.components import delivery, metrics, photos, presenter, storage, tracing
+from publisher.components.types import Estate
+
+logger = logging.getLogger(__file__)
+
+
+async def notify(
+    sender: delivery.DeliveryEngine,
+    bot_instance: Bot,
+    user_id: int,
+    ads_list: list[Estate],
+    lang: str,
+) -> None:
+    """Send the estate post to the user, a few estates are sent as a digest."""
+    if len(ads_list) == 1:
+        await _send_notify_to_user(sender, bot_instance, user_id, ads_list[0], lang)
+    else:
+        await _send_digest_to_user(sender, bot_instance, user_id, ads_list, lang)
+
+
+async def _send_notify_to_user(
+    sender: delivery.DeliveryEngine,
+    bot_instance: Bot,
+    user_id: int,
+    ads_for_post: Estate,
+    lang: str,
+) -> None:
+    logger.info(f'send notification by subscription {user_id=} {ads_for_post=}')
+    with metrics.render_seconds.time(kind='post'):
+        post = presenter.get_estate_as_post(ads_for_post, lang)
+    with _user_errors_handler(user_id):
+        await _send_photo(sender, bot_instance, user_id, ads_for_post.id, post)
+
+
+async def _send_digest_to_user(
+    sender: delivery.DeliveryEngine,
+    bot_instance: Bot,
+    user_id: int,
+    ads_list: list[Estate],
+    lang: str,
+) -> None:
+    logger.info('send digest by subscription {0} of {1} ads'.format(user_id, len(ads_list)))
+    with metrics.render_seconds.time(kind='digest'):
+        digest_texts = presenter.get_estates_digest(ads_list, lang)
+    with _user_errors_handler(user_id):
+        for digest_text in digest_texts:
+            await sender.call(user_id, partial(
+                bot_instance.send_message,
+                chat_id=user_id,
+                text=digest_text,
+                parse_mode='Markdown',
+                disable_web_page_preview=True,
+            ))
+
+
+@contextmanager
+def _user_errors_handler(user_id: int) -> Generator[None, None, None]:
+    """Log telegram errors, disable notifications for users who have blocked the bot."""
+    try:
+        yield
+    except (exceptions.TelegramBadRequest, exceptions.TelegramForbiddenError) as exc:
+        if 'chat not found' in exc.message:
+            _disable_notifications(user_id, reason='chat not found')
+            return
+        if 'bot was blocked by the user' in exc.message:
+            _disable_notifications(user_id, reason='bot was blocked')
+            return
+        logger.warning('sent to user error: {0}'.format(exc))
+
+    except exceptions.TelegramNetworkError as timeout_exc:
+        logger.warning('sent to user error: {0}'.format(timeout_exc))
+
+
+def _disable_notifications(user_id: int, reason: str) -> None:
+    logger.warning('disable user notification - {0}'.format(reason))
+    metrics.disabled_users_total.inc(reason=reason)
+    storage.update_user_settings(user_id, enabled=False)
+
+
+async def _send_photo(
+    sender: delivery.DeliveryEngine,
+    bot_instance: Bot,
+    user_id: int,
+    estate_id: int,
+    post: dict[str, Any],
+) -> None:
+    """Send the estate photo by cached telegram file_id, fallback to the photo url."""
+    with tracing.span('send_photo', user_id=user_id, estate_id=estate_id) as send_attributes:
+        send_attributes['by_file_id'] = await _send_photo_by_file_id(sender, bot_instance, user_id, estate_id, post)
+        if send_attributes['by_file_id']:
+            return
+
+        send_by_url = partial(bot_instance.send_photo, chat_id=user_id, **post)
+        message = await sender.call(user_id, send_by_url)
+        if message.photo:
+            photos.save_file_id(estate_id, message.photo[-1].file_id)
+
+
+async def _send_photo_by_file_id(
+    sender: delivery.DeliveryEngine,
+    bot_instance: Bot,
+    user_id: int,
+    estate_id: int,
+    post: dict[str, Any],
+) -> bool:
+    photo_file_id = photos.get_file_id(estate_id)
+    if not photo_file_id:
+        return False
+
+    cached_post = {**post, 'photo': photo_file_id}
+    try:
+        await sender.call(user_id, partial(bot_instance.send_photo, chat_id=user_id, **cached_post))
+    except exceptions.TelegramBadRequest as file_id_exc:
+        if 'file' not in file_id_exc.message.lower():
+            raise
+        logger.warning('drop invalid photo file_id {0}'.format(file_id_exc))
+        photos.forget_file_id(estate_id)
+        return False
+    return True
@@ -0,0 +1,70 @@
+"""Compact encoding of user filters and settings as one redis value.
+
+The value is a JSON array of positional fields, the first one is the format version.
+Flags are packed to one integer, sets are sorted lists, not set filters are nulls.
+"""
+import json
+from typing import Any
+
+from publisher.components.types import UserFilters
+
+VERSION = 1
+
+# persisted flag bits, never reuse them for another meaning
+ENABLED_FLAG = 1
+SKIP_DUPLICATES_FLAG = 2
+DIGEST_FLAG = 4
+
+
+def encode(user_filters: UserFilters) -> str:
+    """Return the packed value of the current version, user id is a part of the key."""
+    flags = ENABLED_FLAG if user_filters.enabled else 0
+    if user_filters.skip_duplicates:
+        flags |= SKIP_DUPLICATES_FLAG
+    if user_filters.digest:
+        flags |= DIGEST_FLAG
+
+    return json.dumps([
+        VERSION,
+        user_filters.lang,
+        flags,
+        user_filters.category,
+        user_filters.property_type,
+        user_filters.min_price,
+        user_filters.max_price,
+        user_filters.min_usable_area,
+        _encode_set(user_filters.layouts),
+        _encode_set(user_filters.districts),
+        _encode_set(user_filters.district_names),
+    ], ensure_ascii=False, separators=(',', ':'))
+
+
+def decode(user_id: int, packed: str) -> UserFilters:
+    """Return user filters by the packed value, unknown version raises ValueError."""
+    packed_fields = json.loads(packed)
+    if packed_fields[0] != VERSION:
+        raise ValueError('unknown user settings version {0}'.format(packed_fields[0]))
+
+    return UserFilters(
+        user_id=user_id,
+        lang=packed_fields[1],
+        enabled=bool(packed_fields[2] & ENABLED_FLAG),
+        skip_duplicates=bool(packed_fields[2] & SKIP_DUPLICATES_FLAG),
+        digest=bool(packed_fields[2] & DIGEST_FLAG),
+        category=packed_fields[3],
+        property_type=packed_fields[4],
+        min_price=packed_fields[5],
+        max_price=packed_fields[6],
+        min_usable_area=packed_fields[7],
+        layouts=_decode_set(packed_fields[8]),
+        districts=_decode_set(packed_fields[9]),
+        district_names=_decode_set(packed_fields[10]),
+    )
+
+
+def _encode_set(filter_values: set[Any] | None) -> list[Any] | None:
+    return None if filter_values is None else sorted(filter_values)
+
+
+def _decode_set(filter_values: list[Any] | None) -> set[Any] | None:
+    return None if filter_values is None else set(filter_values)
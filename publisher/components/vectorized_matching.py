@@ -0,0 +1,104 @@
+"""Vectorized matching: columnar NumPy arrays of user filters, an estate is matched against all users at once.
+
+NumPy is an optional dependency, install it to enable the MATCHING_VECTORIZED engine: poetry install --extras vectorized
+"""
+from typing import Any, Iterable
+
+from publisher.components.compiled_filters import CompiledEstate, CompiledFilters
+from publisher.components.types import Estate, UserFilters
+from publisher.components.user_settings_codec import DIGEST_FLAG, SKIP_DUPLICATES_FLAG
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+WORD_BITS = 64
+WORD_MASK = (1 << WORD_BITS) - 1
+NO_MAX_PRICE = (1 << WORD_BITS - 1) - 1  # int64 max
+
+# compiled filters mask and the compiled estate bit of discrete filters
+DISCRETE_FILTERS = (
+    ('category', 'category'),
+    ('property_type', 'property_type'),
+    ('districts', 'district_bit'),
+    ('district_names', 'district_name_bit'),
+    ('layouts', 'layout_bit'),
+)
+
+
+def is_available() -> bool:
+    """Is NumPy installed."""
+    return np is not None
+
+
+class VectorizedIndex:
+    """Enabled user filters as columns, same candidates as SubscriptionsIndex.
+
+    Discrete filters are bitmasks of compiled filters split to uint64 words, one column per word.
+    """
+
+    def __init__(self, users_filters: Iterable[UserFilters]) -> None:
+        """Build columns by enabled user filters."""
+        compiled_filters = [
+            CompiledFilters(user_filters)
+            for user_filters in users_filters
+            if user_filters.is_enabled_notifications
+        ]
+        self._user_ids = _get_column([compiled.user_id for compiled in compiled_filters], np.int64)
+        self._min_price = _get_column([compiled.min_price for compiled in compiled_filters], np.int64)
+        self._max_price = _get_column([compiled.max_price or NO_MAX_PRICE for compiled in compiled_filters], np.int64)
+        self._min_usable_area = _get_column([compiled.min_usable_area for compiled in compiled_filters], np.int64)
+        self._skip_duplicates = _get_column([
+            bool(compiled.flags & SKIP_DUPLICATES_FLAG)
+            for compiled in compiled_filters
+        ], np.bool_)
+        self.digest_users = {compiled.user_id for compiled in compiled_filters if compiled.flags & DIGEST_FLAG}
+        self._unfiltered: dict[str, Any] = {}
+        self._mask_words: dict[str, list[Any]] = {}
+        for mask_name, _ in DISCRETE_FILTERS:
+            masks = [getattr(compiled, mask_name) for compiled in compiled_filters]
+            self._unfiltered[mask_name] = _get_column([not mask for mask in masks], np.bool_)
+            self._mask_words[mask_name] = _get_mask_words(masks)
+
+    def __len__(self) -> int:
+        """Return amount of indexed users."""
+        return len(self._user_ids)
+
+    def get_candidates(self, estate: Estate) -> set[int]:
+        """Return ids of users whose filters accept the estate."""
+        return set(self.match(CompiledEstate(estate)).tolist())
+
+    def match(self, estate: CompiledEstate) -> Any:
+        """Return the array of user ids whose filters accept the compiled estate."""
+        matched = self._min_price <= estate.price
+        matched &= self._max_price >= estate.price
+        matched &= self._min_usable_area <= estate.usable_area
+        if estate.is_duplicate:
+            matched &= ~self._skip_duplicates
+
+        for mask_name, bit_name in DISCRETE_FILTERS:
+            matched &= self._get_accepting(mask_name, getattr(estate, bit_name))
+        return self._user_ids[matched]
+
+    def _get_accepting(self, mask_name: str, estate_bit: int) -> Any:
+        unfiltered = self._unfiltered[mask_name]
+        mask_words = self._mask_words[mask_name]
+        word_index, word_bit = divmod(estate_bit.bit_length() - 1, WORD_BITS)
+        if not estate_bit or word_index >= len(mask_words):
+            return unfiltered  # unknown value passes no filter
+        accepting = mask_words[word_index] & np.uint64(1 << word_bit) != 0
+        return unfiltered | accepting
+
+
+def _get_column(column_values: list[Any], dtype: Any) -> Any:
+    return np.array(column_values, dtype=dtype)
+
+
+def _get_mask_words(masks: list[int]) -> list[Any]:
+    max_bit_length = max((mask.bit_length() for mask in masks), default=0)
+    words_count = max_bit_length // WORD_BITS + 1
+    return [
+        _get_column([mask >> word_shift & WORD_MASK for mask in masks], np.uint64)
+        for word_shift in range(0, words_count * WORD_BITS, WORD_BITS)
+    ]
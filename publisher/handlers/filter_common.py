@@ -1,6 +1,7 @@
 """Common filters buttons."""
 import asyncio
 import logging
+from contextlib import aclosing
 
 from aiogram import Router
 from aiogram.fsm.context import FSMContext
@@ -62,25 +63,38 @@ async def filter_close(query: CallbackQuery, state: FSMContext | None = None) ->
 
 
 async def _show_last_estate(filters: types.UserFilters, message: Message) -> None:
-    last_ads = await api_client.fetch_estates(limit=app_settings.FETCH_ADS_LIMIT, without_duplicates=True)
-    logger.info('_show_last_estate: got {0}'.format(len(last_ads)))
-
-    counter = 0
-    for ads in last_ads:
-        if filters.is_compatible(ads):
-            estate_settings = presenter.get_estate_as_post(ads, filters.lang)
-            logger.info(f'publish {estate_settings=}')
-            try:
-                await message.answer_photo(**estate_settings)
-            except Exception as exc:
-                logger.error(f'Exception {exc=}')
-                await asyncio.sleep(1)
-            counter += 1
-
-        if counter >= app_settings.SHOW_ADS_LIMIT:
-            return
-
-    if counter > 0:
+    compatible_ads = await _find_compatible_estates(filters)
+    logger.info('_show_last_estate: got {0}'.format(len(compatible_ads)))
+
+    for ads in compatible_ads:
+        estate_settings = presenter.get_estate_as_post(ads, filters.lang)
+        logger.info(f'publish {estate_settings=}')
+        try:
+            await message.answer_photo(**estate_settings)
+        except Exception as exc:
+            logger.error(f'Exception {exc=}')
+            await asyncio.sleep(1)
+
+    if 0 < len(compatible_ads) < app_settings.SHOW_ADS_LIMIT:
         await message.answer(
             text=translation.get_i8n_text('estates.example', filters.lang),
         )
+
+
+async def _find_compatible_estates(filters: types.UserFilters) -> list[types.Estate]:
+    """Stream the last estates until enough of them are compatible, the rest of the response is not read.
+
+    Estates found before a fetch error are shown anyway.
+    """
+    compatible_ads: list[types.Estate] = []
+    last_ads = api_client.iter_estates(limit=app_settings.FETCH_ADS_LIMIT, without_duplicates=True)
+    try:
+        async with aclosing(last_ads):
+            async for ads in last_ads:
+                if filters.is_compatible(ads):
+                    compatible_ads.append(ads)
+                if len(compatible_ads) >= app_settings.SHOW_ADS_LIMIT:
+                    break
+    except Exception as fetch_exc:
+        logger.warning('show {0} found estates, the fetch failed: {1}'.format(len(compatible_ads), fetch_exc))
+    return compatible_ads
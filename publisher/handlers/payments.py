@@ -36,7 +36,7 @@ async def got_trial(query: CallbackQuery) -> None:
     await query.message.answer(  # type: ignore
         text=translation.get_i8n_text('start.set_filters', settings.lang),
     )
-    await send_logs_notification('trial applied "trial" {0} {1}'.format(
+    send_logs_notification('trial applied "trial" {0} {1}'.format(
         query.from_user.id,
         query.from_user.username,
     ))
@@ -98,7 +98,7 @@ async def buy(query: CallbackQuery) -> None:
             resize_keyboard=True,
         )
     )
-    await send_logs_notification('payment try {0} {1} {2}'.format(
+    send_logs_notification('payment try {0} {1} {2}'.format(
         price.slug,
         query.from_user.id,
         query.from_user.username,
@@ -156,7 +156,7 @@ async def payment_success(message: Message, bot: Bot) -> None:
         text=translation.get_i8n_text('payment.accepted', settings.lang).format(sub.expired_at.isoformat()),
         reply_markup=presenter.get_main_menu(message.chat.id),
     )
-    await send_logs_notification('stars payment accepted {0}'.format(invoice))
+    send_logs_notification('stars payment accepted {0}'.format(invoice))
 
 
 def init(dp: Dispatcher) -> None:
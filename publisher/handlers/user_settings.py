@@ -46,6 +46,22 @@ async def user_settings_toggle_skip_duplicates(query: CallbackQuery) -> None:
     )
 
 
+@router.callback_query(lambda callback: callback.data and callback.data == 'settings:toggle:digest')
+async def user_settings_toggle_digest(query: CallbackQuery) -> None:
+    """Change digest mode status."""
+    logger.info('digest toggle')
+    settings = storage.get_user_settings(query.from_user.id)
+
+    if settings.digest:
+        storage.update_user_settings(query.from_user.id, digest=False)
+    else:
+        storage.update_user_settings(query.from_user.id, digest=True)
+
+    await query.message.edit_reply_markup(  # type: ignore
+        reply_markup=presenter.get_settings_menu(query.from_user.id),
+    )
+
+
 @router.callback_query(lambda callback: callback.data and callback.data == 'settings:toggle:lang')
 async def user_settings_toggle_lang(query: CallbackQuery) -> None:
     """Change user language."""
@@ -1,110 +1,165 @@
-"""Get estates and publish them to customers."""
+"""Get estates and enqueue notifications for customers.
+
+Fetch, dedup and match stages run concurrently over bounded queues,
+the notifications are sent by the sender workers.
+In the sharded mode the leader fetches and dedups ads, the shard workers match them.
+"""
 import asyncio
 import logging
 import signal
+import sys
 from collections import Counter
 
-from aiogram import Bot, exceptions
-
-from publisher.components import api_client, presenter, storage, reload
-from publisher.components.types import Estate, Subscription
+from publisher.components import api_client, delivery_queue, leadership, metrics, reload, shards, storage, tracing
+from publisher.components.matching import CandidatesIndex, build_index
+from publisher.components.pipeline import Pipeline, StageHandler
+from publisher.components.publisher_stages import EstatesBatch, PublisherStages, match_shard
+from publisher.components.scheduler import PollingScheduler
+from publisher.components.types import Shard
 from publisher.settings import app_settings
 
 logger = logging.getLogger(__file__)
 
 
-async def publisher(limit: int = 1, max_iteration: int | None = 1) -> Counter:
-    """Fetch ads by API and post them to customers."""
+async def publisher(
+    limit: int = 1,
+    max_iteration: int | None = 1,
+    polling_scheduler: PollingScheduler | None = None,
+) -> Counter:
+    """Fetch ads by API and enqueue notifications for customers."""
+    logger.info('migrated {0} legacy posted ads'.format(storage.migrate_posted_ads()))
+    await metrics.serve()
+    tracing.setup('publisher')
+    polling_scheduler = polling_scheduler or PollingScheduler()
+    stages = PublisherStages()
+    pipeline = _start_pipeline(('dedup', stages.dedup), ('match', stages.match))
+
     current_iter: int = 1
     counters: Counter = Counter()
     while max_iteration is None or current_iter < max_iteration:
         current_iter += 1
         logger.info(f'publisher start {current_iter=}')
-        counters = await _publisher(limit)
-        logger.info(f'publisher end {current_iter=} {counters=}')
+        with tracing.cycle('publisher', iteration=current_iter):
+            counters = await _publisher(pipeline, limit)
+        logger.info(f'publisher end {current_iter=} {counters=} {stages.counter=}')
+        _update_queue_depth(pipeline)
         if reload.has_exit_request():
             break
-        await asyncio.sleep(5)
+        await polling_scheduler.sleep(polling_scheduler.next_interval(
+            new_ads=counters['sale new'] + counters['lease new'],
+            has_errors=bool(counters['fetch errors']),
+        ))
+
+    await _shutdown(pipeline)
+    return counters + stages.counter
+
+
+async def sharded_publisher(  # noqa: WPS213
+    shard: Shard,
+    limit: int = 1,
+    max_iteration: int | None = 1,
+    polling_scheduler: PollingScheduler | None = None,
+) -> Counter:
+    """Run the shard worker, the one holding the leader lease also fetches ads for all shards."""
+    recovered = shards.recover(shard)
+    logger.info(f'sharded publisher start {shard=} {leadership.WORKER_ID=} {recovered=}')
+    await metrics.serve()
+    tracing.setup('publisher-{0}'.format(shard.index))
+    polling_scheduler = polling_scheduler or PollingScheduler()
+    stages = PublisherStages(shards_count=shard.count)
+    pipeline = _start_pipeline(('dedup', stages.dedup), ('publish', stages.publish))
+
+    current_iter: int = 0
+    counters: Counter = Counter()
+    while max_iteration is None or current_iter < max_iteration:
+        current_iter += 1
+        interval = polling_scheduler.min_interval
+        with tracing.cycle('sharded publisher', iteration=current_iter, shard=shard.index):
+            if leadership.acquire_leadership(leadership.WORKER_ID, ttl=app_settings.PUBLISH_LEADER_LEASE_SECONDS):
+                async with leadership.hold_leadership(leadership.WORKER_ID, ttl=app_settings.PUBLISH_LEADER_LEASE_SECONDS):
+                    counters = await _fetch(pipeline, limit, subs_index=None)
+                    await pipeline.join()
+                interval = polling_scheduler.next_interval(
+                    new_ads=counters['sale new'] + counters['lease new'],
+                    has_errors=bool(counters['fetch errors']),
+                )
 
-    return counters
+            with metrics.stage_seconds.time(stage='shard match'), tracing.span('shard match'):
+                stages.counter['shard subs notifications'] += match_shard(shard)
+        _update_queue_depth(pipeline)
+        logger.info(f'sharded publisher end {current_iter=} {counters=} {stages.counter=}')
+        if reload.has_exit_request():
+            break
+        await polling_scheduler.sleep(interval)
 
+    leadership.release_leadership(leadership.WORKER_ID)
+    await _shutdown(pipeline)
+    return counters + stages.counter
 
-async def _publisher(limit: int) -> Counter:
-    counter: Counter = Counter()
 
+def _start_pipeline(*stages: tuple[str, StageHandler]) -> Pipeline:
+    pipeline = Pipeline(maxsize=app_settings.PUBLISH_PIPELINE_QUEUE_SIZE)
+    for stage_name, stage_handler in stages:
+        pipeline.add_stage(stage_name, stage_handler)
+    pipeline.start()
+    return pipeline
+
+
+async def _publisher(pipeline: Pipeline, limit: int) -> Counter:
+    """Fetch stage: fetch latest ads and feed them to the pipeline."""
     active_subs = storage.get_active_subscriptions()
     logger.info('got {0} active subs'.format(len(active_subs)))
     if not active_subs:
-        return counter
+        return Counter()
 
-    for category in ('sale', 'lease'):
-        ads_for_publish = await api_client.fetch_estates(category=category, limit=limit)
-        logger.info('got {0} {1} ads'.format(len(ads_for_publish), category))
-        counter[f'{category} total'] = len(ads_for_publish)
+    subs_index = build_index(storage.get_users_settings(sub.user_id for sub in active_subs).values())
+    logger.info('indexed {0} enabled subs'.format(len(subs_index)))
+    return await _fetch(pipeline, limit, subs_index)
 
-        new_ads = _apply_new_only_filter(ads_for_publish)
-        new_ads.reverse()
-        logger.info('got {0} new {1} ads'.format(len(new_ads), category))
 
-        storage.mark_as_posted(ads_ids=[ads_for_post.id for ads_for_post in new_ads])
-        if new_ads:
-            counter[f'{category} subs notifications'] += await _post_ads_to_subscriptions(
-                ads=new_ads,
-                subs=active_subs,
+async def _fetch(pipeline: Pipeline, limit: int, subs_index: CandidatesIndex | None) -> Counter:
+    counter: Counter = Counter()
+    for category in ('sale', 'lease'):
+        high_water_mark = storage.get_high_water_mark(category)
+        with (
+            metrics.fetch_seconds.time(category=category),
+            tracing.span('fetch', category=category, high_water_mark=high_water_mark) as fetch_attributes,
+        ):
+            ads_for_publish = await api_client.fetch_estates_since(
+                high_water_mark=high_water_mark,
+                category=category,
+                limit=limit,
+                max_limit=app_settings.PUBLISH_ADS_CATCH_UP_LIMIT,
             )
+            fetch_attributes['estates'] = len(ads_for_publish)
+        logger.info('got {0} {1} ads'.format(len(ads_for_publish), category))
+        counter[f'{category} total'] = len(ads_for_publish)
+        if not ads_for_publish:
+            counter['fetch errors'] += 1
+            continue
+
+        counter[f'{category} new'] = sum(
+            1
+            for ads_item in ads_for_publish
+            if high_water_mark is None or ads_item.id > high_water_mark
+        )
+        await pipeline.put(EstatesBatch(category=category, estates=ads_for_publish, subs_index=subs_index))
 
     return counter
 
 
-def _apply_new_only_filter(ads: list[Estate]) -> list[Estate]:
-    return [
-        new_ads
-        for new_ads in ads
-        if storage.is_not_posted_yet(new_ads.id)
-    ]
-
-
-async def _post_ads_to_subscriptions(ads: list[Estate], subs: list[Subscription]) -> int:
-    cnt = 0
-    async with Bot(app_settings.BOT_TOKEN) as bot_instance:
-        for ads_for_post in ads:
-            for sub in subs:
-                user_filters = storage.get_user_settings(sub.user_id)
-                logger.debug(f'send notification check {sub=} {ads_for_post=} {user_filters=}')
-                if not user_filters.is_enabled_notifications or not user_filters.is_compatible(ads_for_post):
-                    continue
-
-                logger.info(f'send notification by subscription {sub=} {ads_for_post=} {user_filters=}')
-                await _send_notify_to_user(
-                    bot_instance=bot_instance,
-                    user_id=sub.user_id,
-                    ads_for_post=ads_for_post,
-                )
-                cnt += 1
-    return cnt
+async def _shutdown(pipeline: Pipeline) -> None:
+    await pipeline.stop()
+    await api_client.close_session()
+    await metrics.close_server()
 
 
-async def _send_notify_to_user(bot_instance: Bot, user_id: int, ads_for_post: Estate) -> None:
-    settings = storage.get_user_settings(user_id)
-    try:
-        await bot_instance.send_photo(
-            chat_id=user_id,
-            **presenter.get_estate_as_post(ads_for_post, settings.lang),
-        )
-    except (exceptions.TelegramBadRequest, exceptions.TelegramForbiddenError) as exc:
-        if 'chat not found' in exc.message:
-            logger.warning('disable user notification - chat not found')
-            storage.update_user_settings(user_id, enabled=False)
-            return
-        if 'bot was blocked by the user' in exc.message:
-            logger.warning('disable user notification - bot was blocked')
-            storage.update_user_settings(user_id, enabled=False)
-            return
-        logger.warning('sent to user error: {0}'.format(exc))
-
-    except exceptions.TelegramNetworkError as timeout_exc:
-        logger.warning('sent to user error: {0}'.format(timeout_exc))
-        await asyncio.sleep(1)
+def _update_queue_depth(pipeline: Pipeline) -> None:
+    pipeline_stats = pipeline.get_stats()
+    logger.info(f'publisher pipeline {pipeline_stats}')
+    for stage_stats in pipeline_stats:
+        metrics.queue_depth.set(stage_stats.queue_depth, queue=stage_stats.name)
+    metrics.queue_depth.set(delivery_queue.get_pending_size(), queue='delivery')
 
 
 if __name__ == '__main__':
@@ -113,4 +168,12 @@ if __name__ == '__main__':
         format='%(asctime)s %(levelname)-8s %(message)s',  # noqa: WPS323
     )
     signal.signal(signal.SIGINT, reload.exit_request)
-    asyncio.run(publisher(limit=app_settings.PUBLISH_ADS_LIMIT, max_iteration=None))
+    if len(sys.argv) > 2:
+        shard_index, shards_count = map(int, sys.argv[1:3])
+        asyncio.run(sharded_publisher(
+            shard=Shard(index=shard_index, count=shards_count),
+            limit=app_settings.PUBLISH_ADS_LIMIT,
+            max_iteration=None,
+        ))
+    else:
+        asyncio.run(publisher(limit=app_settings.PUBLISH_ADS_LIMIT, max_iteration=None))
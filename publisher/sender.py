@@ -0,0 +1,103 @@
+"""Deliver queued estate notifications to subscribers."""
+import asyncio
+import logging
+import signal
+import sys
+from collections import Counter
+from typing import Awaitable, Mapping
+
+from aiogram import Bot
+
+from publisher.components import delivery, delivery_queue, metrics, reload, storage, telegram, tracing
+from publisher.components.delivery_jobs import DeliveryJob
+from publisher.components.types import Estate
+from publisher.components.user_notifications import notify
+from publisher.settings import app_settings
+
+logger = logging.getLogger(__file__)
+
+
+async def sender(worker: str, max_iteration: int | None = 1) -> Counter:
+    """Drain the delivery queue and send notifications."""
+    logger.info('sender start {0}, recovered {1} jobs'.format(worker, delivery_queue.recover(worker)))
+    await metrics.serve()
+    tracing.setup('sender-{0}'.format(worker))
+    current_iter: int = 0
+    counters: Counter = Counter()
+    engine = delivery.DeliveryEngine()
+    bot_instance = telegram.bot_provider.get()
+    while max_iteration is None or current_iter < max_iteration:
+        current_iter += 1
+        processed = await _sender(engine, bot_instance, worker)
+        counters['processed'] += processed
+        if reload.has_exit_request():
+            break
+        if not processed:
+            await asyncio.sleep(app_settings.DELIVERY_QUEUE_IDLE_SECONDS)
+
+    await telegram.close_bot()
+    await metrics.close_server()
+
+    logger.info(f'sender end {worker=} {counters=}')
+    return counters
+
+
+async def _sender(engine: delivery.DeliveryEngine, bot_instance: Bot, worker: str) -> int:
+    jobs = delivery_queue.take(worker, limit=app_settings.DELIVERY_QUEUE_BATCH)
+    if not jobs:
+        return 0
+
+    with tracing.cycle('sender', worker=worker, jobs=len(jobs)):
+        await _send_jobs(engine, bot_instance, worker, jobs)
+    return len(jobs)
+
+
+async def _send_jobs(engine: delivery.DeliveryEngine, bot_instance: Bot, worker: str, jobs: list[DeliveryJob]) -> None:
+    estates = delivery_queue.get_estates({estate_id for job in jobs for estate_id in job.estate_ids})
+    users_settings = storage.get_users_settings({job.user_id for job in jobs})
+    pending_size = delivery_queue.get_pending_size()
+    metrics.queue_depth.set(pending_size, queue='delivery')
+    logger.info('got {0} jobs, pending {1}'.format(len(jobs), pending_size))
+
+    actual_jobs = []
+    for job in jobs:
+        if _get_ads_list(job, estates) and users_settings[job.user_id].is_enabled_notifications:
+            actual_jobs.append(job)
+        else:
+            logger.info(f'skip outdated job {job=}')
+            delivery_queue.ack(worker, job)
+
+    await engine.run(actual_jobs, lambda user_job: _deliver(worker, user_job, notify(
+        sender=engine,
+        bot_instance=bot_instance,
+        user_id=user_job.user_id,
+        ads_list=_get_ads_list(user_job, estates),
+        lang=users_settings[user_job.user_id].lang,
+    )))
+
+
+def _get_ads_list(job: DeliveryJob, estates: Mapping[int, Estate]) -> list[Estate]:
+    """Return not expired estates of the job."""
+    return [estates[estate_id] for estate_id in job.estate_ids if estate_id in estates]
+
+
+async def _deliver(worker: str, job: DeliveryJob, notification: Awaitable[None]) -> None:
+    """Ack the delivered job, move the job failed by an error not handled for the user to dead letters."""
+    try:
+        await notification
+    except Exception as notify_exc:
+        logger.exception('delivery failed, move {0} to dead letters: {1}'.format(job, notify_exc))
+        delivery_queue.dead_letter(worker, job)
+        return
+
+    delivery_queue.ack(worker, job)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(
+        level=logging.DEBUG if app_settings.DEBUG else logging.INFO,
+        format='%(asctime)s %(levelname)-8s %(message)s',  # noqa: WPS323
+    )
+    signal.signal(signal.SIGINT, reload.exit_request)
+    worker_name = sys.argv[1] if len(sys.argv) > 1 else '0'
+    asyncio.run(sender(worker=worker_name, max_iteration=None))
@@ -25,15 +25,47 @@ class AppSettings(BaseSettings, extra='ignore'):
     PUBLISH_CHANNEL_SALE_ID: int = Field(default=-1002190184244)
     PUBLISH_CHANNEL_LEASE_ID: int = Field(default=-1002199845067)
     LOGS_CHANNEL_ID: int = Field(default=-1002376200898)
-    PUBLISH_ADS_LIMIT: int = Field(default=100)
+    LOGS_NOTIFICATION_INTERVAL_SECONDS: float = Field(default=5)
+    PUBLISH_ADS_LIMIT: int = Field(default=20)
+    PUBLISH_ADS_CATCH_UP_LIMIT: int = Field(default=1000)
+    PUBLISH_INTERVAL_SECONDS: float = Field(default=5)
+    PUBLISH_INTERVAL_MIN_SECONDS: float = Field(default=2)
+    PUBLISH_INTERVAL_MAX_SECONDS: float = Field(default=60)
+    PUBLISH_INTERVAL_BURST_ADS: int = Field(default=10)
+    PUBLISH_PIPELINE_QUEUE_SIZE: int = Field(default=4)
+    PUBLISH_LEADER_LEASE_SECONDS: int = Field(default=90)
+    PUBLISH_SHARD_BATCH: int = Field(default=1000)
+    MATCHING_VECTORIZED: bool = Field(default=False)  # needs numpy
     CHANNEL_ADS_LIMIT: int = Field(default=1000)
     CHANNEL_ADS_SLIDING_WINDOW_HOURS: int = Field(default=1)
     TELEGRAM_MAX_ROWS_PER_MESSAGE: int = Field(default=50)
+    TELEGRAM_CONNECTIONS_LIMIT: int = Field(default=20)
+    TELEGRAM_API_URL: str = Field(default='https://api.telegram.org')
+    METRICS_HOST: str = Field(default='127.0.0.1')
+    METRICS_PORT: int = Field(default=0)  # disabled
+    TRACES_ENABLED: bool = Field(default=False)
+    TRACES_DIR: str = Field(default=os.path.join(APP_PATH, 'logs'))
+    TRACES_MAX_BYTES: int = Field(default=50 * 1024 * 1024)
+    TRACES_BACKUP_COUNT: int = Field(default=5)
     FETCH_ADS_LIMIT: int = Field(default=500)
     SHOW_ADS_LIMIT: int = Field(default=1)
 
+    DELIVERY_CONCURRENCY: int = Field(default=8)
+    DELIVERY_RATE_PER_SECOND: float = Field(default=25)
+    DELIVERY_PER_CHAT_INTERVAL_SECONDS: float = Field(default=1)
+    DELIVERY_NETWORK_RETRIES: int = Field(default=3)
+    DELIVERY_QUEUE_BATCH: int = Field(default=100)
+    DELIVERY_QUEUE_IDLE_SECONDS: float = Field(default=1)
+    PHOTO_CACHE_SIZE: int = 2048
+    PHOTO_CACHE_TTL_SECONDS: int = 60 * 60
+    RENDER_CACHE_SIZE: int = 1024
+
     API_TOKEN: str = Field(default='dev-token')
     API_URL: str = Field(default='http://127.0.0.1:9001')
+    API_CONNECTIONS_LIMIT: int = Field(default=10)
+    API_DNS_CACHE_SECONDS: int = Field(default=300)
+    API_KEEPALIVE_SECONDS: float = Field(default=30)
+    API_STREAM_CHUNK_BYTES: int = Field(default=64 * 1024)
     REDIS_DSN: str = Field('redis://localhost:6379/1')
 
     # Heleket merchant
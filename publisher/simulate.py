@@ -0,0 +1,112 @@
+"""Load simulation of the subscribers publisher with fake estates API and fake telegram.
+
+Run against a scratch redis database and local fake servers only:
+REDIS_DSN=redis://localhost:6379/15 API_URL=http://127.0.0.1:9101 TELEGRAM_API_URL=http://127.0.0.1:9102 \
+    python -m publisher.simulate --subscribers 50000 --ads 200
+"""
+import argparse
+import asyncio
+import logging
+import random
+from collections import Counter
+
+from aiohttp import web
+
+from publisher import sender
+from publisher.components import api_client, delivery, storage, telegram, tracing
+from publisher.components.publisher_stages import PublisherStages
+from publisher.publisher import _publisher, _start_pipeline  # noqa: WPS450
+from publisher.settings import app_settings
+from publisher.simulation import fake_servers, report, synthetic
+
+logger = logging.getLogger(__file__)
+
+
+async def simulate(args: argparse.Namespace) -> Counter:
+    """Run one publisher cycle and deliver all notifications to the fake telegram."""
+    rnd = random.Random(args.seed)
+    tracing.setup('simulate')
+    timings: dict[str, float] = {}
+    with report.measure(timings, 'subscribers setup'):
+        synthetic.fill_subscribers(args.subscribers, rnd)
+
+    estates_api = fake_servers.FakeEstatesApi(synthetic.get_estates(args.ads, rnd))
+    telegram_api = fake_servers.FakeTelegramApi(args.latency_ms / 1000, args.flood_share, args.retry_after, rnd)
+    runners = [
+        await fake_servers.start_server(estates_api.get_app(), app_settings.API_URL),
+        await fake_servers.start_server(telegram_api.get_app(), app_settings.TELEGRAM_API_URL),
+    ]
+    publisher_counter = await _run_publisher(timings)
+    with report.measure(timings, 'delivery'):
+        await _run_sender(delivery.DeliveryEngine(concurrency=args.concurrency, rate=args.rate))
+    await _shutdown(runners)
+
+    report.print_report(args, timings, publisher_counter, estates_api.counter + telegram_api.counter)
+    return telegram_api.counter
+
+
+def main() -> None:
+    """Parse arguments, check the environment is local and run the simulation."""
+    parser = _get_parser()
+    args = parser.parse_args()
+    for url in (app_settings.API_URL, app_settings.TELEGRAM_API_URL):
+        if not fake_servers.is_local(url):
+            parser.error('set API_URL and TELEGRAM_API_URL to local addresses, got {0}'.format(url))
+    if storage.db_pool.dbsize():
+        parser.error('set REDIS_DSN to an empty scratch database')
+
+    asyncio.run(simulate(args))
+
+
+def _get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--subscribers', type=int, default=50_000)  # noqa: WPS432
+    parser.add_argument('--ads', type=int, default=200, help='new ads per category')  # noqa: WPS432
+    parser.add_argument('--latency-ms', type=float, default=50)  # noqa: WPS432
+    parser.add_argument('--flood-share', type=float, default=0.01, help='share of too many requests answers')  # noqa: WPS432
+    parser.add_argument('--retry-after', type=int, default=1)
+    parser.add_argument('--concurrency', type=int, default=app_settings.DELIVERY_CONCURRENCY)
+    parser.add_argument('--rate', type=float, default=app_settings.DELIVERY_RATE_PER_SECOND)
+    parser.add_argument('--seed', type=int, default=1)
+    return parser
+
+
+async def _run_publisher(timings: dict[str, float]) -> Counter:
+    """Run one publisher cycle over all synthetic estates, save the stages time."""
+    for category in ('sale', 'lease'):
+        storage.update_high_water_mark(category, [synthetic.FIRST_ESTATE_ID - 1])
+
+    stages = PublisherStages()
+    pipeline = _start_pipeline(('dedup', stages.dedup), ('match', stages.match))
+    with report.measure(timings, 'publisher cycle'):
+        with report.measure(timings, 'fetch'), tracing.cycle('publisher'):
+            fetch_counter = await _publisher(pipeline, limit=app_settings.PUBLISH_ADS_LIMIT)
+        await pipeline.stop()
+
+    for stage_stats in pipeline.get_stats():
+        timings[stage_stats.name] = stage_stats.busy_seconds
+    return fetch_counter + stages.counter
+
+
+async def _run_sender(engine: delivery.DeliveryEngine) -> None:
+    """Deliver queued notifications until the queue is empty."""
+    bot_instance = telegram.bot_provider.get()
+    processed = 1
+    while processed:
+        processed = await sender._sender(engine, bot_instance, 'simulate')  # noqa: WPS437
+        logger.debug('delivered {0} jobs'.format(processed))
+
+
+async def _shutdown(runners: list[web.AppRunner]) -> None:
+    await api_client.close_session()
+    await telegram.close_bot()
+    for runner in runners:
+        await runner.cleanup()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(
+        level=logging.DEBUG if app_settings.DEBUG else logging.WARNING,
+        format='%(asctime)s %(levelname)-8s %(message)s',  # noqa: WPS323
+    )
+    main()
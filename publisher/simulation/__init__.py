@@ -0,0 +1 @@
+"""Fake servers and synthetic data of the load simulation."""
@@ -0,0 +1,110 @@
+"""Local fake estates API and telegram bot API servers."""
+import asyncio
+import random
+import time
+from collections import Counter
+from dataclasses import asdict
+from http import HTTPStatus
+from typing import Any
+from urllib.parse import urlparse
+
+from aiohttp import web
+
+from publisher.components.types import Estate
+
+LOCAL_HOSTS = frozenset(('127.0.0.1', 'localhost'))
+
+
+class FakeEstatesApi:
+    """Serve synthetic estates, newest first."""
+
+    def __init__(self, estates: list[Estate]) -> None:
+        """Set up served estates."""
+        self.estates = sorted(estates, key=lambda estate: -estate.id)
+        self.counter: Counter = Counter()
+
+    def get_app(self) -> web.Application:
+        """Return the API application."""
+        app = web.Application()
+        app.router.add_get('/v2/estates', self.estates_handler)
+        return app
+
+    async def estates_handler(self, request: web.Request) -> web.Response:
+        """Return latest estates page."""
+        self.counter['requests'] += 1
+        limit = int(request.query.get('limit', 1))
+        category = request.query.get('category')
+        page = [
+            asdict(estate)
+            for estate in self.estates
+            if category is None or estate.category == category
+        ][:limit]
+        return web.json_response({'estates': page})
+
+
+class FakeTelegramApi:
+    """Answer bot API methods with the latency, reply too many requests sometimes."""
+
+    def __init__(self, latency: float, flood_share: float, retry_after: int, rnd: random.Random) -> None:
+        """Set up answers behaviour."""
+        self.latency = latency
+        self.flood_share = flood_share
+        self.retry_after = retry_after
+        self.counter: Counter = Counter()
+        self._rnd = rnd
+
+    def get_app(self) -> web.Application:
+        """Return the bot API application."""
+        app = web.Application()
+        app.router.add_post('/bot{token}/{method}', self.method_handler)
+        return app
+
+    async def method_handler(self, request: web.Request) -> web.Response:
+        """Answer any method by the sent message."""
+        method = request.match_info['method']
+        self.counter[method] += 1
+        await asyncio.sleep(self.latency)
+        if self._rnd.random() < self.flood_share:
+            self.counter['too many requests'] += 1
+            return self._get_flood_response()
+
+        form = await request.post()
+        message: dict[str, Any] = {
+            'message_id': self.counter['messages'],
+            'date': int(time.time()),
+            'chat': {'id': int(str(form.get('chat_id', 0))), 'type': 'private'},
+        }
+        if method.lower() == 'sendphoto':
+            message['photo'] = [self._get_photo()]
+        self.counter['messages'] += 1
+        return web.json_response({'ok': True, 'result': message})
+
+    def _get_flood_response(self) -> web.Response:
+        return web.json_response(status=HTTPStatus.TOO_MANY_REQUESTS, data={
+            'ok': False,
+            'error_code': HTTPStatus.TOO_MANY_REQUESTS,
+            'description': 'Too Many Requests: retry after {0}'.format(self.retry_after),
+            'parameters': {'retry_after': self.retry_after},
+        })
+
+    def _get_photo(self) -> dict[str, Any]:
+        return {
+            'file_id': 'fake-file-{0}'.format(self.counter['messages']),
+            'file_unique_id': 'fake-unique-{0}'.format(self.counter['messages']),
+            'width': 1,
+            'height': 1,
+        }
+
+
+def is_local(url: str) -> bool:
+    """Check the url points to the local host."""
+    return urlparse(url).hostname in LOCAL_HOSTS
+
+
+async def start_server(app: web.Application, url: str) -> web.AppRunner:
+    """Serve the application on the url host and port."""
+    parsed_url = urlparse(url)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, parsed_url.hostname, parsed_url.port).start()
+    return runner
@@ -0,0 +1,39 @@
+"""Timings and the report of the load simulation."""
+import argparse
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Generator
+
+REPORT_STAGES = ('subscribers setup', 'fetch', 'dedup', 'match', 'publisher cycle', 'delivery')
+
+
+@contextmanager
+def measure(timings: dict[str, float], name: str) -> Generator[None, None, None]:
+    """Save the block run time by the name."""
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = time.perf_counter() - started_at
+
+
+def print_report(
+    args: argparse.Namespace,
+    timings: dict[str, float],
+    counter: Counter,
+    requests_counter: Counter,
+) -> None:
+    """Print stages time, counters and the end-to-end throughput."""
+    notifications = counter['sale subs notifications'] + counter['lease subs notifications']
+    total_time = timings['publisher cycle'] + timings['delivery']
+    throughput = notifications / total_time if total_time else 0
+    report = [
+        f'subscribers: {args.subscribers}, new ads: {args.ads} per category',
+        *[f'{stage_name}: {timings[stage_name]:.3f}s' for stage_name in REPORT_STAGES],
+        f'counters: {dict(counter)}',
+        f'requests: {dict(requests_counter)}',
+        f'notifications: {notifications}, telegram messages: {requests_counter["messages"]}',
+        f'end-to-end: {total_time:.3f}s, {throughput:.1f} notifications/s',
+    ]
+    print('\n'.join(report))  # noqa: WPS421
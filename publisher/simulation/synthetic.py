@@ -0,0 +1,92 @@
+"""Synthetic estates and subscribers of the load simulation."""
+import random
+from types import MappingProxyType
+from typing import Any, Sequence
+
+from publisher.components import storage
+from publisher.components.types import Estate
+from publisher.settings import app_settings
+
+FIRST_ESTATE_ID = 10_000_000
+SUBSCRIPTION_DAYS = 30
+
+ENABLED_SHARE = 0.9
+SKIP_DUPLICATES_SHARE = 0.5
+DIGEST_SHARE = 0.1
+DUPLICATE_SHARE = 0.1
+FILTERED_SHARE = 0.5  # users with a districts or a layouts filter
+FILTER_VALUES = 3
+
+PRICES = MappingProxyType({
+    'sale': (5_000_000, 20_000_000),
+    'lease': (10_000, 60_000),
+})
+MAX_PRICES = MappingProxyType({
+    'sale': (None, 8_000_000, 12_000_000),
+    'lease': (None, 25_000, 40_000),
+})
+MIN_USABLE_AREAS = (None, 30, 50)
+USABLE_AREA = (15, 150)
+PROPERTY_TYPES = ('flat', 'house', 'commercial')
+PROPERTY_TYPES_WEIGHTS = (8, 1, 1)
+
+
+def get_estates(amount: int, rnd: random.Random) -> list[Estate]:
+    """Return synthetic estates, amount of each category."""
+    return [
+        _get_estate(index, 'sale' if index < amount else 'lease', rnd)
+        for index in range(amount * 2)
+    ]
+
+
+def fill_subscribers(amount: int, rnd: random.Random) -> None:
+    """Save synthetic subscriptions and user filters."""
+    for user_id in range(1, amount + 1):
+        storage.renew_subscription(user_id=user_id, days=SUBSCRIPTION_DAYS)
+        category = rnd.choice(('sale', 'lease', None))
+        storage.update_user_settings(
+            user_id,
+            enabled=rnd.random() < ENABLED_SHARE,
+            lang=rnd.choice(app_settings.ENABLED_LANGUAGES),
+            skip_duplicates=rnd.random() < SKIP_DUPLICATES_SHARE,
+            digest=rnd.random() < DIGEST_SHARE,
+            category=category,
+            property_type=rnd.choice(('flat', None)),
+            max_price=_get_max_price(category, rnd),
+            min_usable_area=rnd.choice(MIN_USABLE_AREAS),
+            districts=_get_filter_values(app_settings.ENABLED_DISTRICTS, rnd),
+            layouts=_get_filter_values(app_settings.ENABLED_LAYOUTS, rnd),
+        )
+
+
+def _get_estate(index: int, category: str, rnd: random.Random) -> Estate:
+    return Estate(
+        id=FIRST_ESTATE_ID + index,
+        category=category,
+        source_name=rnd.choice(('sreality', 'bezrealitky', 'idnes', 'expats')),
+        source_uid=str(index),
+        title='Simulated estate {0}'.format(index),
+        layout=rnd.choice(app_settings.ENABLED_LAYOUTS),
+        address='Simulated street {0}, Praha'.format(index),
+        price=rnd.randint(*PRICES[category]),
+        usable_area=rnd.randint(*USABLE_AREA),
+        district_number=rnd.choice(app_settings.ENABLED_DISTRICTS),
+        energy_rating=rnd.choice('ABCDEFG'),
+        image_url='https://example.com/{0}.jpg'.format(index),
+        page_url='https://example.com/{0}'.format(index),
+        updated_at='Tue, 05 Nov 2024 07:57:50 GMT',
+        property_type=rnd.choices(PROPERTY_TYPES, weights=PROPERTY_TYPES_WEIGHTS)[0],
+        is_duplicate=rnd.random() < DUPLICATE_SHARE,
+    )
+
+
+def _get_max_price(category: str | None, rnd: random.Random) -> int | None:
+    if category is None:
+        return None
+    return rnd.choice(MAX_PRICES[category])
+
+
+def _get_filter_values(filter_values: Sequence[Any], rnd: random.Random) -> set[Any] | None:
+    if rnd.random() < FILTERED_SHARE:
+        return set(rnd.sample(filter_values, FILTER_VALUES))
+    return None
@@ -6,15 +6,16 @@ from typing import Any
 
 from aiogram import Bot, exceptions
 
-from publisher.components import presenter, storage, translation
+from publisher.components import metrics, presenter, storage, telegram, translation
 from publisher.settings import app_settings
 
 logger = logging.getLogger(__file__)
 
 
-async def run() -> Counter:
+async def run() -> Counter:  # noqa: WPS213
     """Fetch active subscriptions and downgrade if expired."""
     logger.info('downgrade start')
+    await metrics.serve()
     counters: Counter = Counter()
     subs_for_downgrade = [
         sub
@@ -27,41 +28,44 @@ async def run() -> Counter:
         if sub.is_expired_soon
     ]
 
-    async with Bot(app_settings.BOT_TOKEN) as bot_instance:
-        for sub_expire_soon in expired_soon:
-            counters['expired soon'] += 1
+    bot_instance = telegram.bot_provider.get()
+    for sub_expire_soon in expired_soon:
+        counters['expired soon'] += 1
 
-            user_filters = storage.get_user_settings(sub_expire_soon.user_id)
-            if user_filters.is_enabled_notifications:
-                logger.info(f'expired soon {sub_expire_soon=}')
-                await _send_notify(
-                    bot_instance=bot_instance,
-                    chat_id=sub_expire_soon.user_id,
-                    text=translation.get_i8n_text('subscription.expired', user_filters.lang),
-                    reply_markup=presenter.get_prices_menu(sub_expire_soon.user_id),
-                )
+        user_filters = storage.get_user_settings(sub_expire_soon.user_id)
+        if user_filters.is_enabled_notifications:
+            logger.info(f'expired soon {sub_expire_soon=}')
+            await _send_notify(
+                bot_instance=bot_instance,
+                chat_id=sub_expire_soon.user_id,
+                text=translation.get_i8n_text('subscription.expired', user_filters.lang),
+                reply_markup=presenter.get_prices_menu(sub_expire_soon.user_id),
+            )
 
-        for sub_for_stop in subs_for_downgrade:
-            storage.stop_subscription(sub_for_stop.user_id)
-            counters['downgraded'] += 1
+    for sub_for_stop in subs_for_downgrade:
+        storage.stop_subscription(sub_for_stop.user_id)
+        counters['downgraded'] += 1
 
-            user_filters = storage.get_user_settings(sub_for_stop.user_id)
-            if user_filters.is_enabled_notifications:
-                logger.info(f'downgrade {sub_for_stop=}')
-                await _send_notify(
-                    bot_instance=bot_instance,
-                    chat_id=sub_for_stop.user_id,
-                    text=translation.get_i8n_text('subscription.downgraded', user_filters.lang),
-                    reply_markup=presenter.get_main_menu(sub_for_stop.user_id),
-                )
+        user_filters = storage.get_user_settings(sub_for_stop.user_id)
+        if user_filters.is_enabled_notifications:
+            logger.info(f'downgrade {sub_for_stop=}')
+            await _send_notify(
+                bot_instance=bot_instance,
+                chat_id=sub_for_stop.user_id,
+                text=translation.get_i8n_text('subscription.downgraded', user_filters.lang),
+                reply_markup=presenter.get_main_menu(sub_for_stop.user_id),
+            )
 
+    await telegram.close_bot()
+    await metrics.close_server()
     logger.info(f'downgrade end {counters=}')
     return counters
 
 
 async def _send_notify(bot_instance: Bot, **kwargs: Any) -> None:
     try:
-        await bot_instance.send_message(**kwargs)
+        with metrics.track_send():
+            await bot_instance.send_message(**kwargs)
     except exceptions.TelegramAPIError as exc:
         logger.warning(f'Send notify exception {exc}')
 
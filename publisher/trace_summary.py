@@ -0,0 +1,89 @@
+"""Summarize a traced cycle: the slowest spans and the critical path.
+
+Show the slowest cycle of the traces file or the given one:
+python -m publisher.trace_summary logs/traces-publisher.jsonl
+python -m publisher.trace_summary logs/traces-publisher.jsonl --cycle <cycle-id> --top 20
+"""
+import argparse
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from publisher.components.spans import Span
+
+
+def load_cycles(path: Path) -> dict[str, list[Span]]:
+    """Return spans grouped by the cycle, in order of the file."""
+    cycles: dict[str, list[Span]] = defaultdict(list)
+    with path.open(encoding='utf-8') as traces_file:
+        for line in traces_file:
+            if line.strip():
+                traced_span = Span(**json.loads(line))
+                cycles[traced_span.cycle_id].append(traced_span)
+    return cycles
+
+
+def get_cycle_duration(spans: list[Span]) -> float:
+    """Return wall time from the first span start to the last span end."""
+    finished_at = max(one_span.finished_at for one_span in spans)
+    return finished_at - min(one_span.started_at for one_span in spans)
+
+
+def get_slowest(spans: list[Span], top: int) -> list[Span]:
+    """Return the longest spans."""
+    return sorted(spans, key=lambda one_span: -one_span.duration)[:top]
+
+
+def get_critical_path(spans: list[Span]) -> list[Span]:
+    """Return the chain from the root, each next span is the last finished child of the previous one."""
+    children: dict[int | None, list[Span]] = defaultdict(list)
+    for one_span in spans:
+        children[one_span.parent_id].append(one_span)
+
+    critical_path: list[Span] = []
+    next_spans = children[None]
+    while next_spans:
+        last_finished = max(next_spans, key=lambda child_span: child_span.finished_at)
+        critical_path.append(last_finished)
+        next_spans = children[last_finished.span_id]
+    return critical_path
+
+
+def main() -> None:
+    """Print the cycle summary."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('path', type=Path, help='traces JSONL file')
+    parser.add_argument('--cycle', help='cycle id, the slowest cycle by default')
+    parser.add_argument('--top', type=int, default=10, help='amount of the slowest spans')
+    args = parser.parse_args()
+
+    cycles = load_cycles(args.path)
+    if not cycles:
+        sys.exit('no spans in {0}'.format(args.path))
+    if args.cycle is None:
+        args.cycle = max(cycles, key=lambda cycle_id: get_cycle_duration(cycles[cycle_id]))
+    if args.cycle not in cycles:
+        sys.exit('cycle {0} not found in {1}'.format(args.cycle, args.path))
+
+    _print_summary(args.cycle, cycles[args.cycle], args.top)
+
+
+def _print_summary(cycle_id: str, spans: list[Span], top: int) -> None:
+    summary = [
+        'cycle {0}: {1} spans, {2:.3f}s'.format(cycle_id, len(spans), get_cycle_duration(spans)),
+        'slowest spans:',
+        *[_format_span(slow_span) for slow_span in get_slowest(spans, top)],
+        'critical path:',
+        *[_format_span(path_span) for path_span in get_critical_path(spans)],
+    ]
+    print('\n'.join(summary))  # noqa: WPS421
+
+
+def _format_span(traced_span: Span) -> str:
+    error = ' error={0}'.format(traced_span.error) if traced_span.error else ''
+    return '  {0:>9.3f}s  {1} {2}{3}'.format(traced_span.duration, traced_span.name, traced_span.attributes, error)
+
+
+if __name__ == '__main__':
+    main()
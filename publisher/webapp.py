@@ -1,12 +1,13 @@
 import asyncio
 import logging
+import threading
 from http import HTTPStatus
-from typing import Any
+from typing import Any, Coroutine
 
-from aiogram import exceptions, Bot
+from aiogram import exceptions
 from flask import Flask, abort, request
 
-from publisher.components import presenter, storage, translation
+from publisher.components import presenter, storage, telegram, translation
 from publisher.components.notifications import send_logs_notification
 from publisher.components.types import Invoice, Subscription
 from publisher.settings import app_settings
@@ -14,6 +15,9 @@ from publisher.settings import app_settings
 app = Flask(__name__)
 app.logger.setLevel(logging.INFO)
 
+_notifications_loop: asyncio.AbstractEventLoop | None = None
+_notifications_loop_lock = threading.Lock()
+
 
 @app.route('/webhook', methods=['POST'])
 def purchase_webhook() -> Any:
@@ -41,14 +45,24 @@ def purchase_webhook() -> Any:
         days=invoice.days,
     )
 
-    asyncio.run(_apply_invoice(invoice, sub))
+    _run_in_notifications_loop(_apply_invoice(invoice, sub))
     app.logger.info('webhook: applied')
     return {'status': 'OK'}
 
 
 async def _apply_invoice(invoice: Invoice, sub: Subscription) -> None:
     await _send_payment_notification_to_user(invoice.user_id, sub)
-    await send_logs_notification('crypto payment accepted {0}'.format(invoice))
+    send_logs_notification('crypto payment accepted {0}'.format(invoice))
+
+
+def _run_in_notifications_loop(coro: Coroutine[Any, Any, None]) -> None:
+    """Run the coroutine in the long-lived background loop, so the shared bot session survives between requests."""
+    global _notifications_loop  # noqa: WPS420
+    with _notifications_loop_lock:
+        if _notifications_loop is None:
+            _notifications_loop = asyncio.new_event_loop()  # noqa: WPS122
+            threading.Thread(target=_notifications_loop.run_forever, daemon=True).start()  # noqa: WPS121
+    asyncio.run_coroutine_threadsafe(coro, _notifications_loop).result()  # noqa: WPS121
 
 
 def _get_user_ip() -> str | None:
@@ -59,12 +73,11 @@ def _get_user_ip() -> str | None:
 
 async def _send_payment_notification_to_user(user_id: int, sub: Subscription) -> None:
     settings = storage.get_user_settings(user_id)
-    async with Bot(app_settings.BOT_TOKEN) as bot_instance:
-        try:
-            await bot_instance.send_message(
-                chat_id=user_id,
-                text=translation.get_i8n_text('payment.accepted', settings.lang).format(sub.expired_at.isoformat()),
-                reply_markup=presenter.get_main_menu(user_id),
-            )
-        except (exceptions.TelegramBadRequest, exceptions.TelegramForbiddenError) as exc:
-            app.logger.warning('sent notification to user error: {0}'.format(exc))
+    try:
+        await telegram.bot_provider.get().send_message(
+            chat_id=user_id,
+            text=translation.get_i8n_text('payment.accepted', settings.lang).format(sub.expired_at.isoformat()),
+            reply_markup=presenter.get_main_menu(user_id),
+        )
+    except (exceptions.TelegramBadRequest, exceptions.TelegramForbiddenError) as exc:
+        app.logger.warning('sent notification to user error: {0}'.format(exc))
@@ -0,0 +1,56 @@
+from dataclasses import replace
+from unittest import mock
+
+import pytest
+
+from publisher.components.api_client import fetch_estates_since
+
+
+@pytest.fixture()
+def fixture_fetch_estates(fixture_estate_item):
+    async def _fetch(limit, category):
+        return [replace(fixture_estate_item, id=estate_id) for estate_id in range(100, 100 - limit, -1)]
+
+    with mock.patch('publisher.components.api_client.fetch_estates', side_effect=_fetch) as fetch_mock:
+        yield fetch_mock
+
+
+@pytest.mark.parametrize('high_water_mark, expected_limits', [
+    (None, [2]),
+    (99, [2]),
+    (98, [2, 4]),
+    (90, [2, 4, 8, 16]),
+    (10, [2, 4, 8, 16, 20]),
+])
+async def test_fetch_estates_since(fixture_fetch_estates, high_water_mark, expected_limits):
+    response = await fetch_estates_since(high_water_mark=high_water_mark, category='sale', limit=2, max_limit=20)
+
+    assert [one_call.kwargs['limit'] for one_call in fixture_fetch_estates.call_args_list] == expected_limits
+    assert len(response) == expected_limits[-1]
+
+
+async def test_fetch_estates_since_failed():
+    with mock.patch('publisher.components.api_client.fetch_estates', return_value=[]) as fetch_mock:
+        response = await fetch_estates_since(high_water_mark=1, category='sale', limit=2, max_limit=20)
+
+    assert response == []
+    assert fetch_mock.call_count == 1
+
+
+async def test_fetch_estates_since_bumped_ads(fixture_estate_item):
+    async def _fetch(limit, category):
+        bumped = replace(fixture_estate_item, id=1)
+        return [bumped, *[replace(fixture_estate_item, id=estate_id) for estate_id in range(100, 101 - limit, -1)]]
+
+    with mock.patch('publisher.components.api_client.fetch_estates', side_effect=_fetch) as fetch_mock:
+        response = await fetch_estates_since(high_water_mark=90, category='sale', limit=2, max_limit=20)
+
+    assert [one_call.kwargs['limit'] for one_call in fetch_mock.call_args_list] == [2, 4, 8, 16]
+    assert response[-1].id == 86
+
+
+async def test_fetch_estates_since_max_limit(fixture_fetch_estates, caplog):
+    response = await fetch_estates_since(high_water_mark=10, category='sale', limit=2, max_limit=20)
+
+    assert len(response) == 20
+    assert 'older ones are skipped at the catch-up limit' in caplog.text
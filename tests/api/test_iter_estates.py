@@ -0,0 +1,40 @@
+import random
+
+import pytest
+from aiohttp import web
+
+from publisher.components import api_client
+from publisher.simulation.fake_servers import FakeEstatesApi
+from publisher.simulation.synthetic import get_estates
+
+
+@pytest.fixture()
+async def fixture_estates_api(mocker):
+    estates_api = FakeEstatesApi(get_estates(20, random.Random(1)))
+    runner = web.AppRunner(estates_api.get_app())
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    mocker.patch.object(api_client, 'BASIC_URL', f'http://{host}:{port}/v2/estates')
+    mocker.patch.object(api_client.app_settings, 'API_STREAM_CHUNK_BYTES', 128)
+    yield estates_api
+    await api_client.close_session()
+    await runner.cleanup()
+
+
+async def test_iter_estates(fixture_estates_api):
+    estates = [estate async for estate in api_client.iter_estates(limit=5, category='sale')]
+
+    expected = [estate for estate in fixture_estates_api.estates if estate.category == 'sale'][:5]
+    assert estates == expected
+    assert estates == await api_client.fetch_estates(limit=5, category='sale')
+
+
+async def test_iter_estates_failed(mocker):
+    mocker.patch.object(api_client, 'BASIC_URL', 'http://127.0.0.1:1/v2/estates')
+
+    with pytest.raises(Exception):
+        [estate async for estate in api_client.iter_estates(limit=5)]  # noqa: WPS428
+
+    await api_client.close_session()
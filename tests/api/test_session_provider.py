@@ -0,0 +1,32 @@
+from publisher.components.api_client import SessionProvider
+
+
+async def test_session_provider_reuse_session():
+    provider = SessionProvider()
+
+    session = provider.get()
+
+    assert provider.get() is session
+    await provider.close()
+    assert session.closed is True
+
+
+async def test_session_provider_recreate_closed_session():
+    provider = SessionProvider()
+    session = provider.get()
+    await provider.close()
+
+    new_session = provider.get()
+
+    assert new_session is not session
+    assert new_session.closed is False
+    await provider.close()
+
+
+async def test_session_provider_close_empty():
+    provider = SessionProvider()
+
+    await provider.close()
+
+    assert provider.get().closed is False
+    await provider.close()
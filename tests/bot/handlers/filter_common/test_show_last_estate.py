@@ -0,0 +1,48 @@
+from unittest.mock import AsyncMock
+
+from publisher.components.types import UserFilters
+from publisher.handlers import filter_common
+
+
+async def test_show_last_estate_stops_stream(mocker, fixture_estate_item, fixture_estate_item_house):
+    consumed = []
+
+    async def _iter_estates(**kwargs):
+        for estate in (fixture_estate_item_house, fixture_estate_item, fixture_estate_item):
+            consumed.append(estate)
+            yield estate
+
+    mocker.patch('publisher.components.api_client.iter_estates', side_effect=_iter_estates)
+    message_mock = AsyncMock()
+
+    await filter_common._show_last_estate(UserFilters(user_id=1, property_type='flat'), message_mock)
+
+    assert consumed == [fixture_estate_item_house, fixture_estate_item]
+    message_mock.answer_photo.assert_called_once()
+    message_mock.answer.assert_not_called()
+
+
+async def test_show_last_estate_not_found(mocker, fixture_estate_item_house):
+    async def _iter_estates(**kwargs):
+        yield fixture_estate_item_house
+
+    mocker.patch('publisher.components.api_client.iter_estates', side_effect=_iter_estates)
+    message_mock = AsyncMock()
+
+    await filter_common._show_last_estate(UserFilters(user_id=1, property_type='flat'), message_mock)
+
+    message_mock.answer_photo.assert_not_called()
+    message_mock.answer.assert_not_called()
+
+
+async def test_show_last_estate_failed_stream(mocker, fixture_estate_item):
+    async def _iter_estates(**kwargs):
+        yield fixture_estate_item
+        raise RuntimeError('connection reset')
+
+    mocker.patch('publisher.components.api_client.iter_estates', side_effect=_iter_estates)
+    message_mock = AsyncMock()
+
+    await filter_common._show_last_estate(UserFilters(user_id=1, property_type='flat'), message_mock)
+
+    message_mock.answer_photo.assert_called_once()
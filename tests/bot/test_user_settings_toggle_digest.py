@@ -0,0 +1,20 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+import publisher.handlers.user_settings
+from publisher.components.storage import get_user_settings, update_user_settings
+
+
+@pytest.mark.parametrize('filters_digest, expected_state', [
+    (True, False),
+    (False, True),
+])
+async def test_user_settings_toggle_digest(filters_digest: bool, expected_state: bool):
+    query_mock = AsyncMock()
+    query_mock.from_user.id = 1
+    update_user_settings(query_mock.from_user.id, digest=filters_digest)
+
+    await publisher.handlers.user_settings.user_settings_toggle_digest(query_mock)
+
+    assert get_user_settings(query_mock.from_user.id).digest is expected_state
@@ -1,8 +1,26 @@
-from publisher.channel_publisher import _post_ads_to_channel, _prepare_ads_for_post
+from publisher.channel_publisher import _post_ads_to_channel, _render_ads_for_post, _sort_rendered_ads
 from publisher.settings import app_settings
 
 
 async def test_post_ads_to_channel_smoke(fixture_estate_item):
-    res = await _post_ads_to_channel(_prepare_ads_for_post([fixture_estate_item]), app_settings.PUBLISH_CHANNEL_SALE_ID)
+    res = await _post_ads_to_channel(
+        _sort_rendered_ads([_render_ads_for_post(fixture_estate_item)]),
+        app_settings.PUBLISH_CHANNEL_SALE_ID,
+    )
 
     assert res == 1
+
+
+def test_sort_rendered_ads(fixture_estate_item, fixture_estate_item_house):
+    fixture_estate_item.price = 100
+    fixture_estate_item_house.price = 200
+
+    res = _sort_rendered_ads([
+        _render_ads_for_post(fixture_estate_item),
+        _render_ads_for_post(fixture_estate_item_house),
+    ])
+
+    assert res == [
+        _render_ads_for_post(fixture_estate_item_house)[1],
+        _render_ads_for_post(fixture_estate_item)[1],
+    ]
@@ -1,7 +1,37 @@
-from publisher.channel_publisher import publish
+from publisher.channel_publisher import _publish, publish
 
 
 async def test_publish_smoke():
     res = await publish()
 
     assert res is None
+
+
+async def test_publish_streamed_estates(mocker, fixture_estate_item, fixture_estate_item_house):
+    estates = [fixture_estate_item, fixture_estate_item_house]
+
+    async def _iter_estates(**kwargs):
+        for estate in estates:
+            yield estate
+
+    mocker.patch('publisher.components.api_client.iter_estates', side_effect=_iter_estates)
+    post_mock = mocker.patch('publisher.channel_publisher._post_ads_to_channel', return_value=1)
+
+    res = await _publish('sale', destination=1)
+
+    assert res == len(estates)
+    assert len(post_mock.call_args.kwargs['ads']) == len(estates)
+
+
+async def test_publish_failed_stream(mocker, fixture_estate_item):
+    async def _iter_estates(**kwargs):
+        yield fixture_estate_item
+        raise RuntimeError('connection reset')
+
+    mocker.patch('publisher.components.api_client.iter_estates', side_effect=_iter_estates)
+    post_mock = mocker.patch('publisher.channel_publisher._post_ads_to_channel', return_value=1)
+
+    res = await _publish('sale', destination=1)
+
+    assert res == 0
+    post_mock.assert_not_called()
@@ -0,0 +1,78 @@
+import pytest
+
+from publisher.components.compiled_filters import CompiledEstate, CompiledFilters
+from publisher.components.types import UserFilters
+
+USERS_FILTERS = [
+    UserFilters(user_id=1, enabled=True),
+    UserFilters(user_id=1, enabled=False, category='sale'),
+    UserFilters(user_id=1, enabled=True, category='lease'),
+    UserFilters(user_id=1, enabled=True, property_type='flat'),
+    UserFilters(user_id=1, enabled=True, property_type='house'),
+    UserFilters(user_id=1, enabled=True, skip_duplicates=True, digest=True),
+    UserFilters(user_id=1, enabled=True, min_price=8999000),
+    UserFilters(user_id=1, enabled=True, min_price=8999001),
+    UserFilters(user_id=1, enabled=True, max_price=8999000),
+    UserFilters(user_id=1, enabled=True, max_price=8998999),
+    UserFilters(user_id=1, enabled=True, min_usable_area=35),
+    UserFilters(user_id=1, enabled=True, min_usable_area=36),
+    UserFilters(user_id=1, enabled=True, districts={1, 5}),
+    UserFilters(user_id=1, enabled=True, districts={1}),
+    UserFilters(user_id=1, enabled=True, districts={99}),
+    UserFilters(user_id=1, enabled=True, district_names={'Andel'}),
+    UserFilters(user_id=1, enabled=True, district_names={'Letna', 'Holešovice'}),
+    UserFilters(user_id=1, enabled=True, layouts={'one_one', 'two_kk'}),
+    UserFilters(user_id=1, enabled=True, layouts={'two_kk'}),
+    UserFilters(user_id=1, enabled=True, layouts={'unknown_layout'}),
+    UserFilters(
+        user_id=2,
+        lang='ru',
+        enabled=True,
+        category='sale',
+        property_type='flat',
+        min_price=5000000,
+        max_price=10000000,
+        layouts={'one_kk', 'two_kk'},
+        min_usable_area=40,
+        districts={1, 2, 7},
+        district_names={'Holešovice'},
+    ),
+]
+
+
+@pytest.mark.parametrize('user_filters', USERS_FILTERS)
+def test_compiled_filters_round_trip(user_filters):
+    compiled = CompiledFilters(user_filters)
+
+    assert compiled.to_user_filters() == user_filters
+
+
+def test_compiled_filters_round_trip_empty_values():
+    user_filters = UserFilters(user_id=1, min_price=0, max_price=0, min_usable_area=0, districts=set(), layouts=set())
+
+    assert CompiledFilters(user_filters).to_user_filters() == UserFilters(user_id=1)
+
+
+@pytest.mark.parametrize('user_filters', USERS_FILTERS)
+def test_compiled_filters_same_as_is_compatible(
+    user_filters,
+    fixture_estate_item,
+    fixture_estate_item_house,
+    fixture_estate_item_commercial,
+):
+    compiled = CompiledFilters(user_filters)
+
+    for estate in (fixture_estate_item, fixture_estate_item_house, fixture_estate_item_commercial):
+        for is_duplicate in (False, True):
+            estate.is_duplicate = is_duplicate
+            assert compiled.is_compatible(CompiledEstate(estate)) is user_filters.is_compatible(estate)
+
+
+def test_compiled_estate_unknown_values(fixture_estate_item):
+    fixture_estate_item.layout = 'not_interned_layout'
+    fixture_estate_item.district_name = 'Not interned district'
+    estate = CompiledEstate(fixture_estate_item)
+
+    assert CompiledFilters(UserFilters(user_id=1)).is_compatible(estate)
+    assert not CompiledFilters(UserFilters(user_id=1, layouts={'two_kk'})).is_compatible(estate)
+    assert not CompiledFilters(UserFilters(user_id=1, district_names={'Letna'})).is_compatible(estate)
@@ -0,0 +1,138 @@
+import json
+from dataclasses import asdict
+
+import pytest
+
+from publisher.components.decoder import ArrayParser, DecodeError, Decoder
+from publisher.components.types import District, Estate
+
+
+@pytest.fixture()
+def estates_decoder():
+    return Decoder(Estate)
+
+
+def test_decode_same_as_dataclass(estates_decoder, fixture_estate_item, fixture_estate_item_house):
+    raw_estates = [asdict(fixture_estate_item), asdict(fixture_estate_item_house)]
+    body = json.dumps({'estates': raw_estates}).encode()
+
+    estates = estates_decoder.decode(body, 'estates')
+
+    assert estates == [Estate(**raw_estate) for raw_estate in raw_estates]
+    assert all(isinstance(estate, Estate) for estate in estates)
+
+
+def test_decode_defaults_and_unknown_keys(estates_decoder, fixture_estate_item):
+    raw_estate = asdict(fixture_estate_item)
+    del raw_estate['property_type']
+    del raw_estate['is_duplicate']
+    del raw_estate['district_name']
+    raw_estate['unknown_field'] = 'unknown'
+
+    estate = estates_decoder.decode_item(raw_estate)
+
+    assert estate.property_type == 'flat'
+    assert estate.is_duplicate is False
+    assert estate.district_name is None
+    assert not hasattr(estate, 'unknown_field')
+
+
+@pytest.mark.parametrize('field_name, field_value', [
+    ('id', '1'),
+    ('price', None),
+    ('title', 42),
+    ('district_name', 5),
+    ('is_duplicate', 'no'),
+])
+def test_decode_item_wrong_type(estates_decoder, fixture_estate_item, field_name, field_value):
+    raw_estate = asdict(fixture_estate_item)
+    raw_estate[field_name] = field_value
+
+    with pytest.raises(DecodeError, match=field_name):
+        estates_decoder.decode_item(raw_estate)
+
+
+def test_decode_item_missing_field(estates_decoder, fixture_estate_item):
+    raw_estate = asdict(fixture_estate_item)
+    del raw_estate['price']
+
+    with pytest.raises(DecodeError, match='price'):
+        estates_decoder.decode_item(raw_estate)
+
+
+def test_decode_skip_invalid_items(estates_decoder, fixture_estate_item):
+    invalid_estate = {**asdict(fixture_estate_item), 'id': None}
+    body = json.dumps({'estates': [invalid_estate, asdict(fixture_estate_item), 'not an object']}).encode()
+
+    assert estates_decoder.decode(body, 'estates') == [fixture_estate_item]
+
+
+def test_decode_districts():
+    body = b'{"districts": [{"name": "Praha 1", "number": 1}]}'
+
+    assert Decoder(District).decode(body, 'districts') == [District(name='Praha 1', number=1)]
+
+
+def test_decode_invalid_json(estates_decoder):
+    with pytest.raises(ValueError):
+        estates_decoder.decode(b'<html>', 'estates')
+
+
+def test_decode_item_validated_signature(estates_decoder, fixture_estate_item):
+    raw_estate = asdict(fixture_estate_item)
+    estates_decoder.decode_item(raw_estate)
+
+    assert estates_decoder.decode_item({**raw_estate, 'id': 2}).id == 2
+    with pytest.raises(DecodeError, match='usable_area'):
+        estates_decoder.decode_item({**raw_estate, 'usable_area': '35'})
+
+
+async def _iter_chunks(body: bytes, chunk_size: int):
+    for start in range(0, len(body), chunk_size):
+        yield body[start:start + chunk_size]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 64, 100000])
+async def test_iter_decode_chunks(estates_decoder, fixture_estate_item, fixture_estate_item_house, chunk_size):
+    raw_estates = [asdict(fixture_estate_item), asdict(fixture_estate_item_house)]
+    body = json.dumps({'estates': raw_estates}, ensure_ascii=False, indent=1).encode()
+
+    estates = [estate async for estate in estates_decoder.iter_decode(_iter_chunks(body, chunk_size), 'estates')]
+
+    assert estates == [fixture_estate_item, fixture_estate_item_house]
+
+
+async def test_iter_decode_skip_invalid_items(estates_decoder, fixture_estate_item):
+    body = json.dumps({'estates': [{'id': 'wrong'}, asdict(fixture_estate_item), 42]}).encode()
+
+    estates = [estate async for estate in estates_decoder.iter_decode(_iter_chunks(body, 10), 'estates')]
+
+    assert estates == [fixture_estate_item]
+
+
+async def test_iter_decode_empty(estates_decoder):
+    estates = [estate async for estate in estates_decoder.iter_decode(_iter_chunks(b'{"estates": []}', 3), 'estates')]
+
+    assert estates == []
+
+
+@pytest.mark.parametrize('body', [
+    b'',
+    b'{"estates": [',
+    b'{"estates": [{"id": 1',
+    b'{"districts": []}',
+])
+async def test_iter_decode_truncated(estates_decoder, body):
+    with pytest.raises(DecodeError, match='truncated'):
+        [estate async for estate in estates_decoder.iter_decode(_iter_chunks(body, 5), 'estates')]
+
+
+def test_array_parser_feed():
+    parser = ArrayParser('estates')
+
+    assert parser.feed(b'{"total": 2, "est') == []
+    assert parser.feed(b'ates": [{"id": 1}, {"id"') == [{'id': 1}]
+    assert parser.feed(b': 2}') == [{'id': 2}]
+    assert not parser.is_finished
+    assert parser.feed(b']}') == []
+    assert parser.is_finished
@@ -0,0 +1,81 @@
+import time
+from unittest import mock
+
+import pytest
+from aiogram import exceptions
+
+from publisher.components.delivery import DeliveryEngine, TokenBucket
+
+
+async def test_token_bucket_rate_limit():
+    bucket = TokenBucket(rate=100, capacity=1)
+    started_at = time.monotonic()
+
+    for _ in range(6):
+        await bucket.acquire()
+
+    assert time.monotonic() - started_at >= 0.04
+
+
+async def test_delivery_engine_run_all_jobs():
+    engine = DeliveryEngine(concurrency=3, rate=1000, per_chat_interval=0)
+    processed = []
+
+    async def _handler(job: int) -> None:
+        processed.append(await engine.call(job, mock.AsyncMock(return_value=job)))
+
+    res = await engine.run(range(10), _handler)
+
+    assert res == 10
+    assert sorted(processed) == list(range(10))
+
+
+async def test_delivery_engine_run_empty():
+    res = await DeliveryEngine().run([], mock.AsyncMock())
+
+    assert res == 0
+
+
+async def test_delivery_engine_handler_failed():
+    handler = mock.AsyncMock(side_effect=RuntimeError())
+
+    res = await DeliveryEngine(rate=1000).run([1, 2], handler)
+
+    assert res == 2
+    assert handler.await_count == 2
+
+
+async def test_delivery_engine_per_chat_interval():
+    engine = DeliveryEngine(rate=1000, per_chat_interval=0.05)
+    method = mock.AsyncMock()
+    started_at = time.monotonic()
+
+    for _ in range(3):
+        await engine.call(1, method)
+
+    assert time.monotonic() - started_at >= 0.1
+    assert method.await_count == 3
+
+
+async def test_delivery_engine_retry_after():
+    engine = DeliveryEngine(rate=1000, per_chat_interval=0)
+    method = mock.AsyncMock(side_effect=[
+        exceptions.TelegramRetryAfter(method=mock.Mock(), message='flood', retry_after=0),
+        'sent',
+    ])
+
+    res = await engine.call(1, method)
+
+    assert res == 'sent'
+    assert method.await_count == 2
+
+
+async def test_delivery_engine_network_error():
+    engine = DeliveryEngine(rate=1000, per_chat_interval=0, network_retries=1)
+    method = mock.AsyncMock(side_effect=exceptions.TelegramNetworkError(method=mock.Mock(), message='timeout'))
+
+    with mock.patch('publisher.components.delivery.asyncio.sleep', mock.AsyncMock()):
+        with pytest.raises(exceptions.TelegramNetworkError):
+            await engine.call(1, method)
+
+    assert method.await_count == 2
@@ -0,0 +1,68 @@
+from publisher.components import delivery_queue
+from publisher.components.storage import db_pool
+from publisher.components.delivery_jobs import DeliveryJob
+
+
+def test_enqueue(fixture_estate_item):
+    res = delivery_queue.enqueue(
+        estates=[fixture_estate_item],
+        jobs=[DeliveryJob(user_id=1, estate_ids=(1,)), DeliveryJob(user_id=2, estate_ids=(1,))],
+    )
+
+    assert res == 2
+    assert delivery_queue.get_pending_size() == 2
+    assert delivery_queue.get_estates([1, 2]) == {1: fixture_estate_item}
+
+
+def test_enqueue_without_jobs(fixture_estate_item):
+    res = delivery_queue.enqueue(estates=[fixture_estate_item], jobs=[])
+
+    assert res == 0
+    assert delivery_queue.get_pending_size() == 0
+
+
+def test_take():
+    delivery_queue.enqueue(estates=[], jobs=[DeliveryJob(user_id=1, estate_ids=(1,)), DeliveryJob(user_id=2, estate_ids=(1,))])
+
+    res = delivery_queue.take('first', limit=1)
+
+    assert res == [DeliveryJob(user_id=1, estate_ids=(1,))]
+    assert delivery_queue.take('second', limit=10) == [DeliveryJob(user_id=2, estate_ids=(1,))]
+    assert delivery_queue.take('second', limit=10) == []
+    assert delivery_queue.get_pending_size() == 0
+
+
+def test_ack_and_recover():
+    jobs = [DeliveryJob(user_id=user_id, estate_ids=(1,)) for user_id in (1, 2, 3)]
+    delivery_queue.enqueue(estates=[], jobs=jobs)
+    delivery_queue.take('test', limit=2)
+    delivery_queue.ack('test', jobs[0])
+
+    res = delivery_queue.recover('test')
+
+    assert res == 1
+    assert delivery_queue.take('test', limit=10) == jobs[1:]
+
+
+def test_get_estates_empty():
+    assert delivery_queue.get_estates([]) == {}
+
+
+def test_dead_letter():
+    jobs = [DeliveryJob(user_id=1, estate_ids=(1,)), DeliveryJob(user_id=2, estate_ids=(1,))]
+    delivery_queue.enqueue(estates=[], jobs=jobs)
+    delivery_queue.take('test', limit=2)
+
+    delivery_queue.dead_letter('test', jobs[0])
+
+    assert delivery_queue.recover('test') == 1
+    assert db_pool.lrange(delivery_queue.DELIVERY_DEAD_LETTERS_KEY, 0, -1) == ['1:1']
+
+
+def test_take_digest_and_legacy_jobs():
+    db_pool.rpush(delivery_queue.DELIVERY_PENDING_KEY, '1:5')
+    delivery_queue.enqueue(estates=[], jobs=[DeliveryJob(user_id=2, estate_ids=(5, 7, 9))])
+
+    res = delivery_queue.take('test', limit=10)
+
+    assert res == [DeliveryJob(user_id=1, estate_ids=(5,)), DeliveryJob(user_id=2, estate_ids=(5, 7, 9))]
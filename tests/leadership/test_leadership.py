@@ -0,0 +1,37 @@
+import asyncio
+
+from publisher.components import leadership
+from publisher.components.storage import db_pool
+
+
+def test_acquire_and_release_leadership():
+    assert leadership.acquire_leadership('first', ttl=10) is True
+    assert leadership.acquire_leadership('second', ttl=10) is False
+    assert leadership.acquire_leadership('first', ttl=10) is True
+
+    leadership.release_leadership('second')
+    assert leadership.acquire_leadership('second', ttl=10) is False
+
+    leadership.release_leadership('first')
+    assert leadership.acquire_leadership('second', ttl=10) is True
+
+
+async def test_hold_leadership_renews_lease():
+    leadership.acquire_leadership('first', ttl=3)
+
+    async with leadership.hold_leadership('first', ttl=3):
+        await asyncio.sleep(1.2)
+        assert db_pool.ttl(leadership.PUBLISHER_LEADER_KEY) == 3
+
+    assert leadership.acquire_leadership('second', ttl=3) is False
+
+
+async def test_hold_leadership_lost_lease():
+    leadership.acquire_leadership('first', ttl=3)
+
+    async with leadership.hold_leadership('first', ttl=3):
+        leadership.release_leadership('first')
+        leadership.acquire_leadership('second', ttl=3)
+        await asyncio.sleep(1.2)
+
+    assert leadership.acquire_leadership('first', ttl=3) is False
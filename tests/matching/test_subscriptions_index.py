@@ -0,0 +1,79 @@
+import pytest
+
+from publisher.components.matching import SubscriptionsIndex
+from publisher.components.types import UserFilters
+
+
+def test_subscriptions_index_skip_disabled(fixture_estate_item):
+    index = SubscriptionsIndex([
+        UserFilters(user_id=1, enabled=False),
+        UserFilters(user_id=2, enabled=True),
+    ])
+
+    assert len(index) == 1
+    assert index.get_candidates(fixture_estate_item) == {2}
+
+
+def test_subscriptions_index_empty(fixture_estate_item):
+    index = SubscriptionsIndex([])
+
+    assert len(index) == 0
+    assert index.get_candidates(fixture_estate_item) == set()
+
+
+@pytest.mark.parametrize('user_filters', [
+    UserFilters(user_id=1, enabled=True),
+    UserFilters(user_id=1, enabled=True, category='sale'),
+    UserFilters(user_id=1, enabled=True, category='lease'),
+    UserFilters(user_id=1, enabled=True, property_type='flat'),
+    UserFilters(user_id=1, enabled=True, property_type='house'),
+    UserFilters(user_id=1, enabled=True, skip_duplicates=True),
+    UserFilters(user_id=1, enabled=True, min_price=0, max_price=0, min_usable_area=0),
+    UserFilters(user_id=1, enabled=True, min_price=8999000),
+    UserFilters(user_id=1, enabled=True, min_price=8999001),
+    UserFilters(user_id=1, enabled=True, max_price=8999000),
+    UserFilters(user_id=1, enabled=True, max_price=8998999),
+    UserFilters(user_id=1, enabled=True, min_usable_area=35),
+    UserFilters(user_id=1, enabled=True, min_usable_area=36),
+    UserFilters(user_id=1, enabled=True, districts=set()),
+    UserFilters(user_id=1, enabled=True, districts={1, 5}),
+    UserFilters(user_id=1, enabled=True, districts={1}),
+    UserFilters(user_id=1, enabled=True, district_names={'Andel'}),
+    UserFilters(user_id=1, enabled=True, district_names={'Letna'}),
+    UserFilters(user_id=1, enabled=True, layouts={'one_one', 'two_kk'}),
+    UserFilters(user_id=1, enabled=True, layouts={'two_kk'}),
+])
+def test_subscriptions_index_same_as_is_compatible(user_filters, fixture_estate_item, fixture_estate_item_house):
+    index = SubscriptionsIndex([user_filters])
+
+    for estate in (fixture_estate_item, fixture_estate_item_house):
+        for is_duplicate in (False, True):
+            estate.is_duplicate = is_duplicate
+            expected = {user_filters.user_id} if user_filters.is_compatible(estate) else set()
+            assert index.get_candidates(estate) == expected
+
+
+def test_subscriptions_index_many_users(fixture_estate_item):
+    index = SubscriptionsIndex([
+        UserFilters(user_id=1, enabled=True, category='sale', max_price=9000000),
+        UserFilters(user_id=2, enabled=True, category='lease'),
+        UserFilters(user_id=3, enabled=True, min_price=100, districts={5}),
+        UserFilters(user_id=4, enabled=True, min_price=9000000),
+        UserFilters(user_id=5, enabled=True, layouts={'one_one'}, min_usable_area=30),
+    ])
+
+    assert index.get_candidates(fixture_estate_item) == {1, 3, 5}
+
+
+def test_subscriptions_index_reused_for_many_estates(fixture_estate_item):
+    index = SubscriptionsIndex([
+        UserFilters(user_id=1, enabled=True, skip_duplicates=True),
+        UserFilters(user_id=2, enabled=True, max_price=1),
+        UserFilters(user_id=3, enabled=True, districts={fixture_estate_item.district_number}),
+    ])
+    fixture_estate_item.is_duplicate = True
+
+    assert index.get_candidates(fixture_estate_item) == {3}
+
+    fixture_estate_item.is_duplicate = False
+    assert index.get_candidates(fixture_estate_item) == {1, 3}
@@ -0,0 +1,143 @@
+import random
+from dataclasses import replace
+
+import pytest
+
+from publisher.components import vectorized_matching
+from publisher.components.matching import SubscriptionsIndex, build_index
+from publisher.components.types import UserFilters
+from publisher.settings import app_settings
+
+pytest.importorskip('numpy')
+
+USERS_FILTERS = [
+    UserFilters(user_id=1, enabled=True),
+    UserFilters(user_id=1, enabled=True, category='sale'),
+    UserFilters(user_id=1, enabled=True, category='lease'),
+    UserFilters(user_id=1, enabled=True, property_type='flat'),
+    UserFilters(user_id=1, enabled=True, property_type='house'),
+    UserFilters(user_id=1, enabled=True, skip_duplicates=True),
+    UserFilters(user_id=1, enabled=True, min_price=8999000),
+    UserFilters(user_id=1, enabled=True, min_price=8999001),
+    UserFilters(user_id=1, enabled=True, max_price=8999000),
+    UserFilters(user_id=1, enabled=True, max_price=8998999),
+    UserFilters(user_id=1, enabled=True, min_usable_area=35),
+    UserFilters(user_id=1, enabled=True, min_usable_area=36),
+    UserFilters(user_id=1, enabled=True, districts={1, 5}),
+    UserFilters(user_id=1, enabled=True, districts={1}),
+    UserFilters(user_id=1, enabled=True, district_names={'Andel'}),
+    UserFilters(user_id=1, enabled=True, district_names={'Letna'}),
+    UserFilters(user_id=1, enabled=True, layouts={'one_one', 'two_kk'}),
+    UserFilters(user_id=1, enabled=True, layouts={'two_kk'}),
+    UserFilters(user_id=1, enabled=True, district_names={f'wide-district-{num}' for num in range(70)}),
+]
+
+
+def test_vectorized_index_skip_disabled(fixture_estate_item):
+    index = vectorized_matching.VectorizedIndex([
+        UserFilters(user_id=1, enabled=False),
+        UserFilters(user_id=2, enabled=True),
+    ])
+
+    assert len(index) == 1
+    assert index.get_candidates(fixture_estate_item) == {2}
+
+
+def test_vectorized_index_empty(fixture_estate_item):
+    index = vectorized_matching.VectorizedIndex([])
+
+    assert len(index) == 0
+    assert index.get_candidates(fixture_estate_item) == set()
+
+
+@pytest.mark.parametrize('user_filters', USERS_FILTERS)
+def test_vectorized_index_same_as_is_compatible(user_filters, fixture_estate_item, fixture_estate_item_house):
+    index = vectorized_matching.VectorizedIndex([user_filters])
+
+    for estate in (fixture_estate_item, fixture_estate_item_house):
+        for is_duplicate in (False, True):
+            estate.is_duplicate = is_duplicate
+            expected = {user_filters.user_id} if user_filters.is_compatible(estate) else set()
+            assert index.get_candidates(estate) == expected
+
+
+def test_vectorized_index_unknown_values(fixture_estate_item):
+    fixture_estate_item.layout = 'not_interned_layout'
+    fixture_estate_item.district_number = 404
+    index = vectorized_matching.VectorizedIndex([
+        UserFilters(user_id=1, enabled=True),
+        UserFilters(user_id=2, enabled=True, layouts={'two_kk'}),
+        UserFilters(user_id=3, enabled=True, districts={7}),
+    ])
+
+    assert index.get_candidates(fixture_estate_item) == {1}
+
+
+def test_vectorized_index_random_same_as_is_compatible(fixture_estate_item):
+    rnd = random.Random(42)
+    users_filters = [
+        UserFilters(
+            user_id=user_id,
+            enabled=rnd.random() < 0.9,
+            skip_duplicates=rnd.random() < 0.5,
+            category=rnd.choice([None, 'sale', 'lease']),
+            property_type=rnd.choice([None, 'flat', 'house']),
+            min_price=rnd.choice([None, 0, rnd.randrange(1_000_000, 10_000_000, 500_000)]),
+            max_price=rnd.choice([None, 0, rnd.randrange(1_000_000, 12_000_000, 500_000)]),
+            layouts=set(rnd.sample(app_settings.ENABLED_LAYOUTS, rnd.randint(0, 3))) or None,
+            min_usable_area=rnd.choice([None, rnd.randrange(20, 90, 5)]),
+            districts=set(rnd.sample(app_settings.ENABLED_DISTRICTS, rnd.randint(0, 3))) or None,
+            district_names=rnd.choice([None, {'Holešovice'}, {'Letna', 'Andel'}]),
+        )
+        for user_id in range(1, 2001)
+    ]
+    index = vectorized_matching.VectorizedIndex(users_filters)
+
+    for _ in range(200):
+        estate = replace(
+            fixture_estate_item,
+            category=rnd.choice(['sale', 'lease']),
+            property_type=rnd.choice(['flat', 'house', 'commercial']),
+            price=rnd.randrange(500_000, 13_000_000, 250_000),
+            usable_area=rnd.randrange(15, 120),
+            layout=rnd.choice([*app_settings.ENABLED_LAYOUTS, 'unknown']),
+            district_number=rnd.choice([*app_settings.ENABLED_DISTRICTS, 99]),
+            district_name=rnd.choice([None, 'Holešovice', 'Letna', 'Andel', 'Smichov']),
+            is_duplicate=rnd.random() < 0.3,
+        )
+        expected = {
+            user_filters.user_id
+            for user_filters in users_filters
+            if user_filters.enabled and user_filters.is_compatible(estate)
+        }
+        assert index.get_candidates(estate) == expected
+
+
+def test_build_index_vectorized(mocker):
+    mocker.patch.object(app_settings, 'MATCHING_VECTORIZED', True)
+
+    assert isinstance(build_index([]), vectorized_matching.VectorizedIndex)
+
+
+def test_build_index_without_numpy(mocker):
+    mocker.patch.object(app_settings, 'MATCHING_VECTORIZED', True)
+    mocker.patch.object(vectorized_matching, 'is_available', return_value=False)
+
+    with pytest.raises(RuntimeError, match='numpy'):
+        build_index([])
+
+
+def test_build_index_default():
+    assert isinstance(build_index([]), SubscriptionsIndex)
+
+
+def test_vectorized_index_digest_users():
+    users_filters = [
+        UserFilters(user_id=1, enabled=True, digest=True),
+        UserFilters(user_id=2, enabled=True),
+        UserFilters(user_id=3, enabled=False, digest=True),
+    ]
+
+    index = vectorized_matching.VectorizedIndex(users_filters)
+
+    assert index.digest_users == SubscriptionsIndex(users_filters).digest_users == {1}
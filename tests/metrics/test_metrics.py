@@ -0,0 +1,91 @@
+from unittest import mock
+
+import pytest
+from aiogram import exceptions
+
+from publisher.components import metrics
+
+
+def test_render_counter_and_gauge():
+    registry = metrics.Registry()
+    sends = registry.register(metrics.Counter('test_sends_total', 'Sends.', ['status']))
+    depth = registry.register(metrics.Gauge('test_queue_depth', 'Depth.'))
+
+    sends.inc(status='ok')
+    sends.inc(2, status='ok')
+    sends.inc(status='fa"iled')
+    depth.set(5)
+
+    assert registry.render() == '\n'.join([
+        '# HELP test_sends_total Sends.',
+        '# TYPE test_sends_total counter',
+        'test_sends_total{status="fa\\"iled"} 1.0',
+        'test_sends_total{status="ok"} 3.0',
+        '# HELP test_queue_depth Depth.',
+        '# TYPE test_queue_depth gauge',
+        'test_queue_depth 5.0',
+        '',
+    ])
+
+
+def test_render_histogram():
+    histogram = metrics.Histogram('test_seconds', 'Latency.', ['stage'], buckets=[1, 0.1])
+
+    histogram.observe(0.1, stage='match')
+    histogram.observe(0.5, stage='match')
+    histogram.observe(3, stage='match')
+
+    assert histogram.render() == [
+        '# HELP test_seconds Latency.',
+        '# TYPE test_seconds histogram',
+        'test_seconds_bucket{stage="match",le="0.1"} 1',
+        'test_seconds_bucket{stage="match",le="1.0"} 2',
+        'test_seconds_bucket{stage="match",le="+Inf"} 3',
+        'test_seconds_sum{stage="match"} 3.6',
+        'test_seconds_count{stage="match"} 3',
+    ]
+
+
+def test_wrong_labels():
+    counter = metrics.Counter('test_total', 'Test.', ['status'])
+
+    with pytest.raises(ValueError):
+        counter.inc(kind='ok')
+
+
+def test_register_duplicate():
+    registry = metrics.Registry()
+    registry.register(metrics.Counter('test_total', 'Test.'))
+
+    with pytest.raises(ValueError):
+        registry.register(metrics.Counter('test_total', 'Test.'))
+
+
+def test_track_send_error():
+    sent_before = metrics.sends_total.get(status='failed')
+    errors_before = metrics.telegram_errors_total.get(error='TelegramBadRequest')
+
+    with pytest.raises(exceptions.TelegramBadRequest):
+        with metrics.track_send():
+            raise exceptions.TelegramBadRequest(method=mock.Mock(), message='chat not found')
+
+    assert metrics.sends_total.get(status='failed') == sent_before + 1
+    assert metrics.telegram_errors_total.get(error='TelegramBadRequest') == errors_before + 1
+
+
+async def test_metrics_handler():
+    registry = metrics.Registry()
+    registry.register(metrics.Gauge('test_queue_depth', 'Depth.')).set(1)
+
+    response = await metrics.MetricsServer(registry).metrics_handler(mock.Mock())
+
+    assert response.headers['Content-Type'] == metrics.CONTENT_TYPE
+    assert response.body == registry.render().encode()
+
+
+async def test_serve_disabled(mocker):
+    start_mock = mocker.patch('publisher.components.metrics.metrics_server.start')
+
+    await metrics.serve()
+
+    start_mock.assert_not_called()
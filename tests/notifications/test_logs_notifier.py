@@ -0,0 +1,58 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+from publisher.components.notifications import TELEGRAM_MAX_MESSAGE_LENGTH, LogsNotifier, get_chunks
+
+
+def test_get_chunks_join_messages():
+    response = get_chunks(['first', 'second'])
+
+    assert response == ['first\nsecond']
+
+
+def test_get_chunks_message_length_limit():
+    response = get_chunks(['a' * 3000, 'b' * 3000, 'c' * 5000])
+
+    assert response == ['a' * 3000, 'b' * 3000, 'c' * TELEGRAM_MAX_MESSAGE_LENGTH]
+
+
+async def test_logs_notifier_coalesce_messages(mocker):
+    bot_mock = AsyncMock()
+    mocker.patch('publisher.components.notifications.bot_provider.get', return_value=bot_mock)
+    notifier = LogsNotifier(interval=0.01)
+
+    notifier.put('first')
+    notifier.put('second')
+    await asyncio.sleep(0.05)
+
+    assert bot_mock.send_message.call_count == 1
+    assert bot_mock.send_message.call_args.kwargs['text'] == 'first\nsecond'
+    await notifier.flush()
+
+
+async def test_logs_notifier_flush(mocker):
+    bot_mock = AsyncMock()
+    mocker.patch('publisher.components.notifications.bot_provider.get', return_value=bot_mock)
+    notifier = LogsNotifier(interval=60)
+
+    notifier.put('first')
+    await notifier.flush()
+
+    assert bot_mock.send_message.call_count == 1
+    assert bot_mock.send_message.call_args.kwargs['text'] == 'first'
+
+
+async def test_logs_notifier_restart_dead_worker(mocker):
+    bot_mock = AsyncMock()
+    bot_mock.send_message.side_effect = [RuntimeError('connection lost'), None]
+    mocker.patch('publisher.components.notifications.bot_provider.get', return_value=bot_mock)
+    notifier = LogsNotifier(interval=0.01)
+
+    notifier.put('first')
+    await asyncio.sleep(0.05)
+    notifier.put('second')
+    await asyncio.sleep(0.05)
+
+    assert bot_mock.send_message.call_count == 2
+    assert bot_mock.send_message.call_args.kwargs['text'] == 'second'
+    await notifier.flush()
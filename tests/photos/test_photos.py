@@ -0,0 +1,36 @@
+import pytest
+
+from publisher.components import photos, storage
+
+
+@pytest.fixture(autouse=True)
+def fixture_empty_local_cache():
+    photos._local_cache.clear()
+    yield
+    photos._local_cache.clear()
+
+
+def test_get_file_id_not_found():
+    assert photos.get_file_id(1) is None
+
+
+def test_save_file_id():
+    photos.save_file_id(1, 'file-id')
+
+    assert photos.get_file_id(1) == 'file-id'
+    assert storage.get_photo_file_id(1) == 'file-id'
+
+
+def test_get_file_id_from_storage():
+    storage.save_photo_file_id(1, 'file-id')
+
+    assert photos.get_file_id(1) == 'file-id'
+    assert photos._local_cache[1] == 'file-id'
+
+
+def test_forget_file_id():
+    photos.save_file_id(1, 'file-id')
+
+    photos.forget_file_id(1)
+
+    assert photos.get_file_id(1) is None
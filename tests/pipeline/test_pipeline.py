@@ -0,0 +1,69 @@
+import asyncio
+
+from publisher.components.pipeline import Pipeline
+
+
+async def test_pipeline_happy_path():
+    results = []
+
+    async def _double(item):
+        return item * 2
+
+    async def _odd_only(item):
+        return item if item % 4 else None
+
+    async def _collect(item):
+        results.append(item)
+
+    pipeline = Pipeline(maxsize=2)
+    pipeline.add_stage('double', _double)
+    pipeline.add_stage('filter', _odd_only)
+    pipeline.add_stage('collect', _collect)
+    pipeline.start()
+
+    for item in range(10):
+        await pipeline.put(item)
+    await pipeline.stop()
+
+    stats = pipeline.get_stats()
+    assert results == [2, 6, 10, 14, 18]
+    assert [stage.name for stage in stats] == ['double', 'filter', 'collect']
+    assert [stage.processed for stage in stats] == [10, 10, 5]
+    assert all(stage.queue_depth == 0 for stage in stats)
+
+
+async def test_pipeline_stage_failed():
+    async def _failed(item):
+        raise RuntimeError()
+
+    pipeline = Pipeline(maxsize=1)
+    pipeline.add_stage('failed', _failed)
+    pipeline.start()
+
+    await pipeline.put(1)
+    await pipeline.put(2)
+    await pipeline.stop()
+
+    assert pipeline.get_stats()[0].failed == 2
+
+
+async def test_pipeline_back_pressure():
+    release = asyncio.Event()
+
+    async def _blocked(item):
+        await release.wait()
+
+    pipeline = Pipeline(maxsize=1)
+    pipeline.add_stage('blocked', _blocked)
+    pipeline.start()
+    await pipeline.put(1)
+    await pipeline.put(2)
+
+    put_task = asyncio.create_task(pipeline.put(3))
+    await asyncio.sleep(0.01)
+
+    assert put_task.done() is False
+    assert pipeline.get_stats()[0].queue_depth == 1
+    release.set()
+    await put_task
+    await pipeline.stop()
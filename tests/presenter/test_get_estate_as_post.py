@@ -0,0 +1,30 @@
+from dataclasses import replace
+from unittest import mock
+
+from publisher.components import presenter
+
+
+def test_get_estate_as_post_happy_path(fixture_estate_item):
+    res = presenter.get_estate_as_post(fixture_estate_item, 'en')
+
+    assert res['photo'] == fixture_estate_item.image_url
+    assert res['parse_mode'] == 'Markdown'
+    assert res['caption'] == presenter._get_estate_description(fixture_estate_item, 'en')
+    assert res['reply_markup'].inline_keyboard[0][0].url == fixture_estate_item.page_url
+
+
+def test_get_estate_as_post_rendered_once(fixture_estate_item):
+    presenter._render_estate_post.cache_clear()
+
+    with mock.patch(
+        'publisher.components.presenter._get_estate_description',
+        wraps=presenter._get_estate_description,
+    ) as description_mock:
+        first = presenter.get_estate_as_post(fixture_estate_item, 'en')
+        second = presenter.get_estate_as_post(replace(fixture_estate_item), 'en')
+        presenter.get_estate_as_post(fixture_estate_item, 'ru')
+        presenter.get_estate_as_post(replace(fixture_estate_item, updated_at='now'), 'en')
+
+    assert description_mock.call_count == 3
+    assert first == second
+    assert first is not second
@@ -0,0 +1,19 @@
+from publisher.components.presenter import get_estates_digest
+from publisher.settings import app_settings
+
+
+def test_get_estates_digest_happy_path(fixture_estate_item, fixture_estate_item_house):
+    response = get_estates_digest([fixture_estate_item, fixture_estate_item_house], 'en')
+
+    assert len(response) == 1
+    assert response[0].startswith('🏠 2 new ads by your filters:')
+    assert len(response[0].split('\n')) == 3
+
+
+def test_get_estates_digest_batches(fixture_estate_item):
+    ads_list = [fixture_estate_item] * app_settings.TELEGRAM_MAX_ROWS_PER_MESSAGE
+
+    response = get_estates_digest(ads_list, 'ru')
+
+    assert len(response) == 2
+    assert response[0].startswith('🏠 {0} новых объявлений'.format(len(ads_list)))
@@ -0,0 +1,30 @@
+from publisher.components.matching import SubscriptionsIndex
+from publisher.components.publisher_stages import PublisherStages
+from publisher.components.storage import filter_not_posted, get_high_water_mark
+from publisher.components.types import UserFilters
+from publisher.publisher import _fetch, _start_pipeline
+
+
+async def test_fetch_moves_high_water_mark_after_posting(fixture_estates_list, mocker):
+    mocker.patch('publisher.publisher.api_client.fetch_estates_since', return_value=fixture_estates_list)
+    stages = PublisherStages()
+    pipeline = _start_pipeline(('dedup', stages.dedup), ('match', stages.match))
+
+    await _fetch(pipeline, 2, SubscriptionsIndex([UserFilters(user_id=1, enabled=True)]))
+    await pipeline.stop()
+
+    assert get_high_water_mark('sale') == max(ads_item.id for ads_item in fixture_estates_list)
+    assert filter_not_posted([ads_item.id for ads_item in fixture_estates_list]) == []
+
+
+async def test_fetch_failed_match_keeps_high_water_mark(fixture_estates_list, mocker):
+    mocker.patch('publisher.publisher.api_client.fetch_estates_since', return_value=fixture_estates_list)
+    mocker.patch('publisher.components.publisher_stages._post_ads_to_subscriptions', side_effect=RuntimeError('match failed'))
+    stages = PublisherStages()
+    pipeline = _start_pipeline(('dedup', stages.dedup), ('match', stages.match))
+
+    await _fetch(pipeline, 2, SubscriptionsIndex([UserFilters(user_id=1, enabled=True)]))
+    await pipeline.stop()
+
+    assert get_high_water_mark('sale') is None
+    assert len(filter_not_posted([ads_item.id for ads_item in fixture_estates_list])) == 2
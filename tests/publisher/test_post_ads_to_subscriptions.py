@@ -1,71 +1,95 @@
-from publisher.components.storage import renew_subscription, update_user_settings
-from publisher.publisher import _post_ads_to_subscriptions
+from publisher.components import delivery_queue
+from publisher.components.delivery_jobs import DeliveryJob
+from publisher.components.matching import SubscriptionsIndex
+from publisher.components.publisher_stages import _post_ads_to_subscriptions
+from publisher.components.storage import get_users_settings, renew_subscription, update_user_settings
+from publisher.components.types import UserFilters
+from publisher.settings import app_settings
 
 
-async def test_post_ads_to_subscriptions_subs_not_exists(fixture_estate_item):
-    res = await _post_ads_to_subscriptions(
+def test_post_ads_to_subscriptions_subs_not_exists(fixture_estate_item):
+    res = _post_ads_to_subscriptions(
         [fixture_estate_item],
-        [],
+        SubscriptionsIndex([]),
     )
 
     assert res == 0
 
 
-async def test_post_ads_to_subscriptions_subs_not_compatible(fixture_estate_item):
-    sub = renew_subscription(user_id=1, days=1)
+def test_post_ads_to_subscriptions_subs_not_compatible(fixture_estate_item):
+    renew_subscription(user_id=1, days=1)
     update_user_settings(user_id=1, enabled=False)
 
-    res = await _post_ads_to_subscriptions(
+    res = _post_ads_to_subscriptions(
         [fixture_estate_item],
-        [sub],
+        SubscriptionsIndex(get_users_settings([1]).values()),
     )
 
     assert res == 0
 
 
-async def test_post_ads_to_subscriptions_happy_path(fixture_estate_item):
-    sub = renew_subscription(user_id=1, days=1)
+def test_post_ads_to_subscriptions_happy_path(fixture_estate_item):
+    renew_subscription(user_id=1, days=1)
     update_user_settings(user_id=1)
 
-    res = await _post_ads_to_subscriptions(
+    res = _post_ads_to_subscriptions(
         [fixture_estate_item],
-        [sub],
+        SubscriptionsIndex(get_users_settings([1]).values()),
     )
 
     assert res == 1
+    assert delivery_queue.get_pending_size() == 1
+    assert delivery_queue.get_estates([fixture_estate_item.id]) == {fixture_estate_item.id: fixture_estate_item}
 
 
-async def test_post_ads_to_subscriptions_house(fixture_estate_item_house, fixture_estate_item):
-    sub = renew_subscription(user_id=1, days=1)
+def test_post_ads_to_subscriptions_house(fixture_estate_item_house, fixture_estate_item):
+    renew_subscription(user_id=1, days=1)
     update_user_settings(user_id=1, property_type='house')
 
-    res = await _post_ads_to_subscriptions(
+    res = _post_ads_to_subscriptions(
         [fixture_estate_item_house, fixture_estate_item],
-        [sub],
+        SubscriptionsIndex(get_users_settings([1]).values()),
     )
 
     assert res == 1
 
 
-async def test_post_ads_to_subscriptions_commercial(fixture_estate_item_commercial, fixture_estate_item):
-    sub = renew_subscription(user_id=1, days=1)
+def test_post_ads_to_subscriptions_commercial(fixture_estate_item_commercial, fixture_estate_item):
+    renew_subscription(user_id=1, days=1)
     update_user_settings(user_id=1, property_type='commercial')
 
-    res = await _post_ads_to_subscriptions(
+    res = _post_ads_to_subscriptions(
         [fixture_estate_item_commercial, fixture_estate_item],
-        [sub],
+        SubscriptionsIndex(get_users_settings([1]).values()),
     )
 
     assert res == 1
 
 
-async def test_post_ads_to_subscriptions_district_name_filtered(fixture_estate_item, fixture_estate_item_house):
-    sub = renew_subscription(user_id=1, days=1)
+def test_post_ads_to_subscriptions_district_name_filtered(fixture_estate_item, fixture_estate_item_house):
+    renew_subscription(user_id=1, days=1)
     update_user_settings(user_id=1, district_names={'Letna'})
 
-    res = await _post_ads_to_subscriptions(
+    res = _post_ads_to_subscriptions(
         [fixture_estate_item, fixture_estate_item_house],
-        [sub],
+        SubscriptionsIndex(get_users_settings([1]).values()),
     )
 
     assert res == 0
+
+
+def test_post_ads_to_subscriptions_digest_above_queue_batch(fixture_estate_item, fixture_one_more_estate_item):
+    users_amount = app_settings.DELIVERY_QUEUE_BATCH + 20
+    users_filters = [UserFilters(user_id=user_id, enabled=True) for user_id in range(2, users_amount + 1)]
+    users_filters.append(UserFilters(user_id=1, enabled=True, digest=True))
+
+    res = _post_ads_to_subscriptions(
+        [fixture_estate_item, fixture_one_more_estate_item],
+        SubscriptionsIndex(users_filters),
+    )
+
+    jobs = delivery_queue.take('test', limit=res)
+    assert res == (users_amount - 1) * 2 + 1
+    assert [job for job in jobs if job.user_id == 1] == [
+        DeliveryJob(user_id=1, estate_ids=(fixture_estate_item.id, fixture_one_more_estate_item.id)),
+    ]
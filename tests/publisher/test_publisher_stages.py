@@ -0,0 +1,64 @@
+from publisher.components import delivery_queue, leadership, storage
+from publisher.components.matching import SubscriptionsIndex
+from publisher.components.publisher_stages import EstatesBatch, PublisherStages
+from publisher.components.storage import filter_not_posted, mark_as_posted
+from publisher.components.types import UserFilters
+
+
+async def test_publisher_stages_happy_path(fixture_estates_list):
+    stages = PublisherStages()
+    batch = EstatesBatch(
+        category='sale',
+        estates=fixture_estates_list,
+        subs_index=SubscriptionsIndex([UserFilters(user_id=1, enabled=True)]),
+    )
+    mark_as_posted([fixture_estates_list[0].id])
+
+    new_batch = await stages.dedup(batch)
+    await stages.match(new_batch)
+
+    assert [ads_item.id for ads_item in new_batch.estates] == [fixture_estates_list[1].id]
+    assert stages.counter['sale not posted'] == 1
+    assert stages.counter['sale subs notifications'] == 1
+    assert stages.in_flight == set()
+    assert delivery_queue.get_pending_size() == 1
+    assert filter_not_posted([fixture_estates_list[1].id]) == []
+
+
+async def test_publisher_stages_skip_in_flight(fixture_estates_list):
+    stages = PublisherStages()
+    batch = EstatesBatch(category='sale', estates=fixture_estates_list, subs_index=SubscriptionsIndex([]))
+
+    first_batch = await stages.dedup(batch)
+    second_batch = await stages.dedup(batch)
+
+    assert len(first_batch.estates) == 2
+    assert second_batch is None
+    assert stages.in_flight == {ads_item.id for ads_item in fixture_estates_list}
+
+
+async def test_publisher_stages_publish_lost_lease(fixture_estates_list):
+    stages = PublisherStages(shards_count=1)
+    batch = EstatesBatch(category='sale', estates=fixture_estates_list, subs_index=None)
+    leadership.acquire_leadership('another', ttl=10)
+
+    new_batch = await stages.dedup(batch)
+    await stages.publish(new_batch)
+
+    assert stages.counter['leadership lost'] == 1
+    assert stages.counter['sale published'] == 0
+    assert stages.in_flight == set()
+    assert storage.get_high_water_mark('sale') is None
+    assert len(filter_not_posted([ads_item.id for ads_item in fixture_estates_list])) == 2
+
+
+async def test_publisher_stages_publish_leader(fixture_estates_list):
+    stages = PublisherStages(shards_count=1)
+    batch = EstatesBatch(category='sale', estates=fixture_estates_list, subs_index=None)
+    leadership.acquire_leadership(leadership.WORKER_ID, ttl=10)
+
+    new_batch = await stages.dedup(batch)
+    await stages.publish(new_batch)
+
+    assert stages.counter['sale published'] == 2
+    assert filter_not_posted([ads_item.id for ads_item in fixture_estates_list]) == []
@@ -0,0 +1,48 @@
+from collections import Counter
+
+import pytest
+
+from publisher.components import delivery_queue, leadership, shards, storage
+from publisher.components.publisher_stages import match_shard
+from publisher.components.types import Shard
+from publisher.publisher import sharded_publisher
+
+
+async def test_sharded_publisher_smoke():
+    res = await sharded_publisher(shard=Shard(index=0, count=2), limit=2)
+
+    assert isinstance(res, Counter)
+    assert leadership.acquire_leadership('another', ttl=10) is True
+
+
+def test_match_shard_own_users_only(fixture_estate_item):
+    shard = Shard(index=1, count=2)
+    own_user, foreign_user = 1, 4
+    for user_id in (own_user, foreign_user):
+        storage.renew_subscription(user_id=user_id, days=1)
+        storage.update_user_settings(user_id, enabled=True)
+    delivery_queue.enqueue(estates=[fixture_estate_item], jobs=[])
+    leadership.acquire_leadership('test', ttl=10)
+    shards.publish('test', [fixture_estate_item.id], shards_count=2)
+
+    response = match_shard(shard)
+
+    assert shards.is_owned(shard, own_user) is True
+    assert shards.is_owned(shard, foreign_user) is False
+
+    assert response == 1
+    assert [job.user_id for job in delivery_queue.take('test', limit=10)] == [own_user]
+
+
+def test_match_shard_failed_ads_recovered(fixture_estate_item, mocker):
+    shard = Shard(index=0, count=1)
+    delivery_queue.enqueue(estates=[fixture_estate_item], jobs=[])
+    leadership.acquire_leadership('test', ttl=10)
+    shards.publish('test', [fixture_estate_item.id], shards_count=1)
+    mocker.patch('publisher.components.publisher_stages._post_ads_to_subscriptions', side_effect=RuntimeError('match failed'))
+
+    with pytest.raises(RuntimeError):
+        match_shard(shard)
+
+    assert shards.recover(shard) == 1
+    assert shards.take(shard, limit=10) == [fixture_estate_item.id]
@@ -0,0 +1,63 @@
+import time
+
+import pytest
+
+from publisher.components.scheduler import PollingScheduler
+
+
+@pytest.fixture()
+def fixture_scheduler():
+    yield PollingScheduler(base_interval=5, min_interval=2, max_interval=60, burst_threshold=10)
+
+
+def test_next_interval_regular(fixture_scheduler):
+    assert fixture_scheduler.next_interval(new_ads=3) == 5
+    assert fixture_scheduler.history[-1].reason == 'regular'
+
+
+def test_next_interval_burst(fixture_scheduler):
+    assert fixture_scheduler.next_interval(new_ads=10) == 2
+    assert fixture_scheduler.history[-1].reason == 'burst'
+
+
+def test_next_interval_quiet(fixture_scheduler):
+    res = [fixture_scheduler.next_interval(new_ads=0) for _ in range(12)]
+
+    assert res[:2] == [7.5, 11.25]
+    assert res == sorted(res)
+    assert res[-1] == 60
+    assert fixture_scheduler.next_interval(new_ads=1) == 5
+
+
+def test_next_interval_errors(fixture_scheduler):
+    res = [fixture_scheduler.next_interval(new_ads=0, has_errors=True) for _ in range(5)]
+
+    assert res == [10, 20, 40, 60, 60]
+    assert fixture_scheduler.next_interval(new_ads=1) == 5
+    assert len(fixture_scheduler.history) == 6
+
+
+async def test_sleep(fixture_scheduler):
+    started_at = time.monotonic()
+
+    await fixture_scheduler.sleep(0.1, tick=0.01)
+
+    assert time.monotonic() - started_at >= 0.1
+
+
+async def test_sleep_exit_request(fixture_scheduler, monkeypatch):
+    monkeypatch.setattr('publisher.components.reload._has_stop_request', True)
+    started_at = time.monotonic()
+
+    await fixture_scheduler.sleep(10)
+
+    assert time.monotonic() - started_at < 1
+
+
+def test_next_interval_long_errors_and_quiet(fixture_scheduler):
+    errors = [fixture_scheduler.next_interval(new_ads=0, has_errors=True) for _ in range(5000)]
+    quiet = [fixture_scheduler.next_interval(new_ads=0) for _ in range(5000)]
+
+    assert errors[-1] == 60
+    assert quiet[-1] == 60
+    assert fixture_scheduler.next_interval(new_ads=0, has_errors=True) == 10
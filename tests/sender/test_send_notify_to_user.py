@@ -1,7 +1,7 @@
 from aiogram import Bot
 
-from publisher.components import storage
-from publisher.publisher import _send_notify_to_user
+from publisher.components import delivery, storage
+from publisher.components.user_notifications import _send_notify_to_user
 from publisher.settings import app_settings
 
 
@@ -10,7 +10,13 @@ async def test_send_notify_to_user_smoke(fixture_estate_item):
     assert storage.get_user_settings(1).is_enabled_notifications is True
 
     async with Bot(app_settings.BOT_TOKEN) as bot_instance:
-        res = await _send_notify_to_user(bot_instance, user_id=1, ads_for_post=fixture_estate_item)
+        res = await _send_notify_to_user(
+            sender=delivery.DeliveryEngine(),
+            bot_instance=bot_instance,
+            user_id=1,
+            ads_for_post=fixture_estate_item,
+            lang='en',
+        )
 
     assert res is None
     assert storage.get_user_settings(1).is_enabled_notifications is False
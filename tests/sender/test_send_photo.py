@@ -0,0 +1,61 @@
+from unittest import mock
+
+import pytest
+from aiogram import exceptions
+
+from publisher.components import delivery, photos
+from publisher.components.user_notifications import _send_photo
+
+
+@pytest.fixture(autouse=True)
+def fixture_empty_local_cache():
+    photos._local_cache.clear()
+    yield
+    photos._local_cache.clear()
+
+
+@pytest.fixture()
+def fixture_bot():
+    bot_instance = mock.AsyncMock()
+    bot_instance.send_photo.return_value.photo = [mock.Mock(file_id='small'), mock.Mock(file_id='big')]
+    yield bot_instance
+
+
+async def test_send_photo_cache_miss(fixture_bot):
+    await _send_photo(delivery.DeliveryEngine(), fixture_bot, 1, 10, {'photo': 'https://photo.url'})
+
+    assert fixture_bot.send_photo.call_args.kwargs == {'chat_id': 1, 'photo': 'https://photo.url'}
+    assert photos.get_file_id(10) == 'big'
+
+
+async def test_send_photo_cache_hit(fixture_bot):
+    photos.save_file_id(10, 'cached')
+
+    await _send_photo(delivery.DeliveryEngine(), fixture_bot, 1, 10, {'photo': 'https://photo.url'})
+
+    assert fixture_bot.send_photo.call_count == 1
+    assert fixture_bot.send_photo.call_args.kwargs == {'chat_id': 1, 'photo': 'cached'}
+
+
+async def test_send_photo_invalid_file_id(fixture_bot):
+    photos.save_file_id(10, 'invalid')
+    fixture_bot.send_photo.side_effect = [
+        exceptions.TelegramBadRequest(method=mock.Mock(), message='Bad Request: wrong file identifier'),
+        fixture_bot.send_photo.return_value,
+    ]
+
+    await _send_photo(delivery.DeliveryEngine(), fixture_bot, 1, 10, {'photo': 'https://photo.url'})
+
+    assert fixture_bot.send_photo.call_count == 2
+    assert fixture_bot.send_photo.call_args.kwargs == {'chat_id': 1, 'photo': 'https://photo.url'}
+    assert photos.get_file_id(10) == 'big'
+
+
+async def test_send_photo_chat_not_found(fixture_bot):
+    photos.save_file_id(10, 'cached')
+    fixture_bot.send_photo.side_effect = exceptions.TelegramBadRequest(method=mock.Mock(), message='chat not found')
+
+    with pytest.raises(exceptions.TelegramBadRequest):
+        await _send_photo(delivery.DeliveryEngine(), fixture_bot, 1, 10, {'photo': 'https://photo.url'})
+
+    assert photos.get_file_id(10) == 'cached'
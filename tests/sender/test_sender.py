@@ -0,0 +1,65 @@
+from collections import Counter
+
+from aiogram import exceptions
+
+from publisher.components import delivery_queue, storage
+from publisher.components.delivery_jobs import DeliveryJob
+from publisher.sender import sender
+
+
+async def test_sender_smoke():
+    res = await sender(worker='test')
+
+    assert isinstance(res, Counter)
+    assert res['processed'] == 0
+
+
+async def test_sender_happy_path(fixture_estate_item):
+    storage.update_user_settings(1, enabled=True)
+    storage.update_user_settings(2, enabled=False)
+    delivery_queue.enqueue(
+        estates=[fixture_estate_item],
+        jobs=[
+            DeliveryJob(user_id=1, estate_ids=(fixture_estate_item.id,)),
+            DeliveryJob(user_id=2, estate_ids=(fixture_estate_item.id,)),
+            DeliveryJob(user_id=1, estate_ids=(100500,)),
+        ],
+    )
+
+    res = await sender(worker='test')
+
+    assert res['processed'] == 3
+    assert delivery_queue.get_pending_size() == 0
+    assert delivery_queue.recover('test') == 0
+
+
+async def test_sender_digest(fixture_estate_item, fixture_one_more_estate_item, mocker):
+    storage.update_user_settings(1, enabled=True, digest=True)
+    delivery_queue.enqueue(
+        estates=[fixture_estate_item, fixture_one_more_estate_item],
+        jobs=[DeliveryJob(user_id=1, estate_ids=(fixture_estate_item.id, fixture_one_more_estate_item.id, 100500))],
+    )
+    digest_mock = mocker.patch('publisher.components.user_notifications._send_digest_to_user')
+
+    res = await sender(worker='test')
+
+    assert res['processed'] == 1
+    assert digest_mock.call_count == 1
+    assert digest_mock.call_args.args[3] == [fixture_estate_item, fixture_one_more_estate_item]
+    assert delivery_queue.recover('test') == 0
+
+
+async def test_sender_not_user_error(fixture_estate_item, mocker):
+    storage.update_user_settings(1, enabled=True)
+    delivery_queue.enqueue(estates=[fixture_estate_item], jobs=[DeliveryJob(user_id=1, estate_ids=(fixture_estate_item.id,))])
+    mocker.patch(
+        'publisher.components.user_notifications._send_notify_to_user',
+        side_effect=exceptions.TelegramServerError(method=mocker.Mock(), message='Bad Gateway'),
+    )
+
+    res = await sender(worker='test')
+
+    assert res['processed'] == 1
+    assert delivery_queue.recover('test') == 0
+    assert delivery_queue.get_pending_size() == 0
+    assert storage.db_pool.lrange(delivery_queue.DELIVERY_DEAD_LETTERS_KEY, 0, -1) == ['1:1']
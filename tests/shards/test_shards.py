@@ -0,0 +1,56 @@
+import pytest
+
+from publisher.components import leadership, shards
+from publisher.components.storage import filter_not_posted
+from publisher.components.types import Shard
+
+
+def test_get_shard_index_stable():
+    response = [shards.get_shard_index(user_id, 4) for user_id in range(1000)]
+
+    assert response == [shards.get_shard_index(user_id, 4) for user_id in range(1000)]
+    assert set(response) == {0, 1, 2, 3}
+
+
+@pytest.mark.parametrize('shards_count', [1, 2, 5])
+def test_is_owned_by_one_shard(shards_count: int):
+    owners = [
+        shard_index
+        for shard_index in range(shards_count)
+        if shards.is_owned(Shard(index=shard_index, count=shards_count), 123456)
+    ]
+
+    assert len(owners) == 1
+
+
+def test_publish_to_all_shards():
+    leadership.acquire_leadership('first', ttl=10)
+    assert shards.publish('first', [1, 2, 3], shards_count=2) is True
+
+    assert shards.take(Shard(index=0, count=2), limit=2) == [1, 2]
+    assert shards.take(Shard(index=0, count=2), limit=2) == [3]
+    assert shards.take(Shard(index=0, count=2), limit=2) == []
+    assert shards.take(Shard(index=1, count=2), limit=10) == [1, 2, 3]
+
+
+def test_take_ack_and_recover():
+    shard = Shard(index=0, count=1)
+    leadership.acquire_leadership('first', ttl=10)
+    shards.publish('first', [1, 2, 3], shards_count=1)
+    shards.take(shard, limit=2)
+    shards.ack(shard, [1])
+
+    res = shards.recover(shard)
+
+    assert res == 1
+    assert shards.take(shard, limit=10) == [2, 3]
+
+
+def test_publish_lost_lease():
+    leadership.acquire_leadership('second', ttl=10)
+
+    res = shards.publish('first', [1, 2, 3], shards_count=1)
+
+    assert res is False
+    assert shards.take(Shard(index=0, count=1), limit=10) == []
+    assert filter_not_posted([1, 2, 3]) == [1, 2, 3]
@@ -0,0 +1,18 @@
+import random
+
+from publisher.components import storage
+from publisher.simulation.synthetic import FIRST_ESTATE_ID, fill_subscribers, get_estates
+
+
+def test_get_estates():
+    response = get_estates(3, random.Random(1))
+
+    assert [estate.id for estate in response] == [FIRST_ESTATE_ID + index for index in range(6)]
+    assert [estate.category for estate in response] == ['sale'] * 3 + ['lease'] * 3
+
+
+def test_fill_subscribers():
+    fill_subscribers(5, random.Random(1))
+
+    assert len(storage.get_active_subscriptions()) == 5
+    assert set(storage.get_users_settings(range(1, 6))) == set(range(1, 6))
@@ -0,0 +1,34 @@
+from redis.client import Pipeline
+
+from publisher.components.storage import db_pool, filter_not_posted, mark_as_posted
+
+
+def test_filter_not_posted_happy_path(fixture_prefilled_posted_ads_id: list[int]):
+    res = filter_not_posted([5, *fixture_prefilled_posted_ads_id, 4])
+
+    assert res == [5, 4]
+
+
+def test_filter_not_posted_empty():
+    assert filter_not_posted([]) == []
+
+
+def test_filter_not_posted_single_round_trip(mocker):
+    execute_spy = mocker.spy(Pipeline, 'execute')
+    command_spy = mocker.spy(db_pool, 'execute_command')
+
+    filter_not_posted(list(range(200)))
+
+    assert execute_spy.call_count == 1
+    assert command_spy.call_count == 0
+
+
+def test_mark_as_posted_single_round_trip(mocker):
+    execute_spy = mocker.spy(Pipeline, 'execute')
+    command_spy = mocker.spy(db_pool, 'execute_command')
+
+    res = mark_as_posted(list(range(200)))
+
+    assert res == 200
+    assert execute_spy.call_count == 1
+    assert command_spy.call_count == 0
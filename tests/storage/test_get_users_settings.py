@@ -0,0 +1,25 @@
+import pytest
+
+from publisher.components.storage import get_user_settings, get_users_settings, update_user_settings
+
+
+def test_get_users_settings_happy_path():
+    update_user_settings(1, category='sale', enabled=True)
+    update_user_settings(2, districts={1, 5}, lang='ru')
+
+    response = get_users_settings([1, 2, 3])
+
+    assert set(response) == {1, 2, 3}
+    for user_id, user_settings in response.items():
+        assert user_settings == get_user_settings(user_id)
+
+
+def test_get_users_settings_empty():
+    assert len(get_users_settings([])) == 0
+
+
+def test_get_users_settings_read_only():
+    response = get_users_settings([1])
+
+    with pytest.raises(TypeError):
+        response[2] = response[1]
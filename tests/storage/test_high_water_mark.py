@@ -0,0 +1,14 @@
+from publisher.components.storage import get_high_water_mark, update_high_water_mark
+
+
+def test_get_high_water_mark_not_found():
+    assert get_high_water_mark('sale') is None
+
+
+def test_update_high_water_mark():
+    update_high_water_mark('sale', [5, 10, 7])
+    update_high_water_mark('sale', [3])
+    update_high_water_mark('sale', [])
+
+    assert get_high_water_mark('sale') == 10
+    assert get_high_water_mark('lease') is None
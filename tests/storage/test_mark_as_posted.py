@@ -1,8 +1,7 @@
-from publisher.components.storage import is_not_posted_yet, mark_as_posted
+from publisher.components.storage import filter_not_posted, mark_as_posted
 
 
 def test_mark_as_posted():
     mark_as_posted([1])
 
-    assert is_not_posted_yet(1) is False
-    assert is_not_posted_yet(2) is True
+    assert filter_not_posted([1, 2]) == [2]
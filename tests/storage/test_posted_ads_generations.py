@@ -0,0 +1,42 @@
+from datetime import date
+
+from publisher.components import storage
+
+
+def test_get_posted_ads_generations():
+    res = storage._get_posted_ads_generations(date(2025, 2, 14))
+
+    assert res == [
+        f'{storage.POSTED_ADS_BITMAP_KEY}:2025-02',
+        f'{storage.POSTED_ADS_BITMAP_KEY}:2025-01',
+        f'{storage.POSTED_ADS_BITMAP_KEY}:2024-12',
+        f'{storage.POSTED_ADS_BITMAP_KEY}:2024-11',
+        f'{storage.POSTED_ADS_BITMAP_KEY}:2024-10',
+        f'{storage.POSTED_ADS_BITMAP_KEY}:2024-09',
+        f'{storage.POSTED_ADS_BITMAP_KEY}:2024-08',
+    ]
+
+
+def test_filter_not_posted_previous_generation():
+    previous_generation = storage._get_posted_ads_generations()[-1]
+    storage.db_pool.setbit(previous_generation, 7, 1)
+
+    assert storage.filter_not_posted([7, 8]) == [8]
+
+
+def test_filter_not_posted_outdated_generation():
+    outdated_generation = f'{storage.POSTED_ADS_BITMAP_KEY}:2000-01'
+    storage.db_pool.setbit(outdated_generation, 7, 1)
+
+    assert storage.filter_not_posted([7]) == [7]
+
+
+def test_migrate_posted_ads():
+    storage.db_pool.set(f'{storage.POSTED_ADS_KEY}:10', 1, ex=storage.TTL_POSTED_ADS)
+    storage.db_pool.set(f'{storage.POSTED_ADS_KEY}:11', 1, ex=60)
+
+    res = storage.migrate_posted_ads(batch_size=1)
+
+    assert res == 2
+    assert storage.filter_not_posted([10, 11, 12]) == [12]
+    assert not storage.db_pool.keys(f'{storage.POSTED_ADS_KEY}:*')
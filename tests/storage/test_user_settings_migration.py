@@ -0,0 +1,87 @@
+from publisher.components import user_settings_codec
+from publisher.components.storage import (
+    USER_SETTINGS_KEY,
+    USER_SETTINGS_PACKED_KEY,
+    db_pool,
+    get_user_settings,
+    get_users_settings,
+    update_user_settings,
+)
+from publisher.components.types import UserFilters
+
+LEGACY_SETTINGS = {
+    'lang': 'ru',
+    'enabled': '1',
+    'skip_duplicates': '0',
+    'category': 'sale',
+    'max_price': '10000000',
+    'layouts': 'one_kk:two_kk',
+    'districts': '1:7',
+}
+EXPECTED_SETTINGS = UserFilters(
+    user_id=1,
+    lang='ru',
+    enabled=True,
+    category='sale',
+    max_price=10000000,
+    layouts={'one_kk', 'two_kk'},
+    districts={1, 7},
+)
+
+
+def test_get_user_settings_migrates_legacy_hash():
+    db_pool.hset(f'{USER_SETTINGS_KEY}:1', mapping=LEGACY_SETTINGS)
+
+    response = get_user_settings(1)
+
+    assert response == EXPECTED_SETTINGS
+    assert not db_pool.exists(f'{USER_SETTINGS_KEY}:1')
+    assert user_settings_codec.decode(1, db_pool.get(f'{USER_SETTINGS_PACKED_KEY}:1')) == EXPECTED_SETTINGS
+    assert get_user_settings(1) == EXPECTED_SETTINGS
+
+
+def test_get_user_settings_default_not_saved():
+    response = get_user_settings(1)
+
+    assert response == UserFilters(user_id=1)
+    assert not db_pool.exists(f'{USER_SETTINGS_PACKED_KEY}:1')
+
+
+def test_get_users_settings_mixed_formats():
+    db_pool.hset(f'{USER_SETTINGS_KEY}:1', mapping=LEGACY_SETTINGS)
+    update_user_settings(2, category='lease')
+
+    response = get_users_settings([1, 2, 3])
+
+    assert response == {
+        1: EXPECTED_SETTINGS,
+        2: UserFilters(user_id=2, category='lease'),
+        3: UserFilters(user_id=3),
+    }
+    assert db_pool.exists(f'{USER_SETTINGS_PACKED_KEY}:1')
+    assert not db_pool.exists(f'{USER_SETTINGS_PACKED_KEY}:3')
+
+
+def test_update_user_settings_migrates_legacy_hash():
+    db_pool.hset(f'{USER_SETTINGS_KEY}:1', mapping=LEGACY_SETTINGS)
+
+    update_user_settings(1, category=None, min_usable_area=40)
+
+    assert not db_pool.exists(f'{USER_SETTINGS_KEY}:1')
+    assert get_user_settings(1) == UserFilters(
+        user_id=1,
+        lang='ru',
+        enabled=True,
+        max_price=10000000,
+        layouts={'one_kk', 'two_kk'},
+        districts={1, 7},
+        min_usable_area=40,
+    )
+
+
+def test_update_user_settings_resets_to_default():
+    update_user_settings(1, lang='ru', enabled=True, districts={1})
+
+    update_user_settings(1, lang=None, enabled=None, districts=None)
+
+    assert get_user_settings(1) == UserFilters(user_id=1)
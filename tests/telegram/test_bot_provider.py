@@ -0,0 +1,31 @@
+from publisher.components.telegram import BotProvider
+
+
+async def test_bot_provider_reuse_bot():
+    provider = BotProvider()
+
+    bot_instance = provider.get()
+
+    assert provider.get() is bot_instance
+    assert provider.get().session is bot_instance.session
+    await provider.close()
+
+
+async def test_bot_provider_recreate_closed_bot():
+    provider = BotProvider()
+    bot_instance = provider.get()
+    await provider.close()
+
+    new_bot_instance = provider.get()
+
+    assert new_bot_instance is not bot_instance
+    await provider.close()
+
+
+async def test_bot_provider_close_empty():
+    provider = BotProvider()
+
+    await provider.close()
+
+    assert provider.get() is not None
+    await provider.close()
@@ -0,0 +1,35 @@
+import json
+from dataclasses import asdict
+
+from publisher import trace_summary
+from publisher.components.spans import Span
+
+
+def _span(span_id, parent_id, started_at, duration, cycle_id='cycle:1'):
+    return Span(
+        cycle_id=cycle_id,
+        span_id=span_id,
+        parent_id=parent_id,
+        name='span {0}'.format(span_id),
+        started_at=started_at,
+        duration=duration,
+    )
+
+
+def test_summary(tmp_path):
+    spans = [
+        _span(2, 1, started_at=100, duration=1),
+        _span(3, 1, started_at=100, duration=5),
+        _span(4, 3, started_at=101, duration=3),
+        _span(1, None, started_at=100, duration=2),
+        _span(1, None, started_at=200, duration=1, cycle_id='cycle:2'),
+    ]
+    traces_file = tmp_path / 'traces.jsonl'
+    traces_file.write_text(''.join('{0}\n'.format(json.dumps(asdict(one_span))) for one_span in spans))
+
+    cycles = trace_summary.load_cycles(traces_file)
+
+    assert list(cycles) == ['cycle:1', 'cycle:2']
+    assert trace_summary.get_cycle_duration(cycles['cycle:1']) == 5
+    assert [one_span.span_id for one_span in trace_summary.get_slowest(cycles['cycle:1'], top=2)] == [3, 4]
+    assert [one_span.span_id for one_span in trace_summary.get_critical_path(cycles['cycle:1'])] == [1, 3, 4]
@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from publisher.components import tracing
+from publisher.components.pipeline import Pipeline
+from publisher.settings import app_settings
+
+
+@pytest.fixture()
+def fixture_traces_file(mocker, tmp_path):
+    mocker.patch.object(app_settings, 'TRACES_ENABLED', True)
+    mocker.patch.object(app_settings, 'TRACES_DIR', str(tmp_path))
+    tracing.setup('test')
+    yield tmp_path / 'traces-test.jsonl'
+    for file_handler in list(tracing.traces_logger.handlers):
+        file_handler.close()
+        tracing.traces_logger.removeHandler(file_handler)
+
+
+def _read_spans(traces_file):
+    return [json.loads(line) for line in traces_file.read_text().splitlines()]
+
+
+@tracing.traced
+def _get_answer():
+    return 42
+
+
+def test_span_out_of_cycle(fixture_traces_file):
+    with tracing.span('lost', user_id=1) as attributes:
+        attributes['sent'] = True
+
+    assert _get_answer() == 42
+    assert not fixture_traces_file.read_text()
+
+
+def test_cycle_disabled(tmp_path):
+    with tracing.cycle('test') as attributes:
+        attributes['jobs'] = 1
+        assert _get_answer() == 42
+
+    assert not list(tmp_path.iterdir())
+
+
+def test_nested_spans(fixture_traces_file):
+    with tracing.cycle('test', iteration=1):
+        with tracing.span('fetch', category='sale') as attributes:
+            attributes['estates'] = 2
+            _get_answer()
+
+    spans = {one_span['name']: one_span for one_span in _read_spans(fixture_traces_file)}
+    assert set(spans) == {'test', 'fetch', 'test_tracing._get_answer'}
+    assert spans['test']['parent_id'] is None
+    assert spans['test']['attributes'] == {'iteration': 1}
+    assert spans['fetch']['parent_id'] == spans['test']['span_id']
+    assert spans['fetch']['attributes'] == {'category': 'sale', 'estates': 2}
+    assert spans['test_tracing._get_answer']['parent_id'] == spans['fetch']['span_id']
+    assert len({one_span['cycle_id'] for one_span in spans.values()}) == 1
+
+
+def test_span_error(fixture_traces_file):
+    with pytest.raises(ValueError):
+        with tracing.cycle('test'):
+            with tracing.span('parse'):
+                int('not a number')
+
+    assert [one_span['error'] for one_span in _read_spans(fixture_traces_file)] == ['ValueError', 'ValueError']
+
+
+async def test_pipeline_stage_spans_after_cycle(fixture_traces_file):
+    async def stage_handler(stage_input):
+        with tracing.span('handle', stage_input=stage_input):
+            return None
+
+    pipeline = Pipeline(maxsize=1)
+    pipeline.add_stage('first', stage_handler)
+    pipeline.start()
+    with tracing.cycle('test'):
+        await pipeline.put(1)
+    await pipeline.stop()
+
+    spans = {one_span['name']: one_span for one_span in _read_spans(fixture_traces_file)}
+    assert set(spans) == {'test', 'first', 'handle'}
+    assert spans['first']['parent_id'] == spans['test']['span_id']
+    assert spans['handle']['parent_id'] == spans['first']['span_id']
+
+
+@tracing.traced
+def _get_answers():
+    return [_get_answer(), _get_answer()]
+
+
+def test_nested_module_calls(fixture_traces_file):
+    with tracing.cycle('test'):
+        _get_answers()
+
+    assert [one_span['name'] for one_span in _read_spans(fixture_traces_file)] == ['test_tracing._get_answers', 'test']
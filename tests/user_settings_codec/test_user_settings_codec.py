@@ -0,0 +1,34 @@
+import json
+
+import pytest
+
+from publisher.components import user_settings_codec
+from publisher.components.types import UserFilters
+
+
+@pytest.mark.parametrize('user_filters', [
+    UserFilters(user_id=1),
+    UserFilters(user_id=1, lang='ru', enabled=True, skip_duplicates=True, digest=True),
+    UserFilters(user_id=1, enabled=True, digest=True, category='lease', property_type='house'),
+    UserFilters(user_id=1, min_price=0, max_price=10000000, min_usable_area=40),
+    UserFilters(user_id=1, layouts={'one_kk', 'two_kk'}, districts={1, 5, 21}),
+    UserFilters(user_id=1, district_names={'Smíchov', 'Holešovice, "Letná"'}),
+    UserFilters(user_id=1, layouts=set(), districts=set(), district_names=set()),
+])
+def test_user_settings_round_trip(user_filters):
+    packed = user_settings_codec.encode(user_filters)
+
+    assert user_settings_codec.decode(1, packed) == user_filters
+
+
+def test_user_settings_encode_compact():
+    packed = user_settings_codec.encode(UserFilters(user_id=1, enabled=True, districts={7, 1}, district_names={'Žižkov'}))
+
+    assert packed == '[1,"en",1,null,null,null,null,null,null,[1,7],["Žižkov"]]'
+
+
+def test_user_settings_decode_unknown_version():
+    packed = json.dumps([user_settings_codec.VERSION + 1, 'en'])
+
+    with pytest.raises(ValueError, match='version'):
+        user_settings_codec.decode(1, packed)